@@ -1,5 +1,6 @@
 from django.urls import reverse_lazy
 from pathlib import Path
+import importlib.util
 import os
 import sys
 
@@ -29,6 +30,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "extended_accounts_api.helpers.ReplicaPinningMiddleware",
 ]
 
 ROOT_URLCONF = "django_extended_accounts_api.urls"
@@ -58,6 +60,18 @@ DATABASES = {
     }
 }
 
+if os.environ.get(
+    "POSTGRES_DB"
+):  ## The CI runs the tests against PostgreSQL as well, for the vendor specific code (search indexes, signup insert...)
+    DATABASES["default"] = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ["POSTGRES_DB"],
+        "USER": os.environ.get("POSTGRES_USER", ""),
+        "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
+        "HOST": os.environ.get("POSTGRES_HOST", ""),
+        "PORT": os.environ.get("POSTGRES_PORT", ""),
+    }
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -67,7 +81,7 @@ AUTH_PASSWORD_VALIDATORS = [
         "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
     },
     {
-        "NAME": "django.contrib.auth.password_validation.CommonPasswordValidator",
+        "NAME": "extended_accounts_api.helpers.BreachedPasswordValidator",
     },
     {
         "NAME": "django.contrib.auth.password_validation.NumericPasswordValidator",
@@ -108,16 +122,30 @@ INSTALLED_APPS += ["rest_framework", "corsheaders", "extended_accounts_api"]
 MIDDLEWARE += ["corsheaders.middleware.CorsMiddleware"]
 REST_FRAMEWORK = {
     "DEFAULT_PARSER_CLASSES": [
-        "rest_framework.parsers.JSONParser",
+        "extended_accounts_api.helpers.ORJSONParser",
     ],
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "extended_accounts_api.helpers.ORJSONRenderer",  ## Falls back to the stdlib json module if orjson isn't installed
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication",
+        "extended_accounts_api.helpers.AccessTokenAuthentication",
     ],
+    "DEFAULT_THROTTLE_RATES": {
+        "availability": "60/minute",  ## Per client IP, enough for a form checking as the user types while slowing down the enumeration of accounts. Behind a reverse proxy, set NUM_PROXIES so the client IP is taken from X-Forwarded-For
+    },
 }
 
+if importlib.util.find_spec(
+    "msgpack"
+):  ## Clients may send and request MessagePack (application/msgpack) instead of JSON
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] += [
+        "extended_accounts_api.helpers.MessagePackParser"
+    ]
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] += [
+        "extended_accounts_api.helpers.MessagePackRenderer"
+    ]
+
 if DEBUG:
     REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] += [
         "rest_framework.renderers.BrowsableAPIRenderer"
@@ -126,3 +154,122 @@ if DEBUG:
 CORS_ALLOWED_ORIGINS = []  ## Put here the allowed origins for CORS verification
 CORS_ALLOW_CREDENTIALS = True
 CSRF_TRUSTED_ORIGINS = []  ## Put here the allowed origins for CSRF verification
+
+## Sessions and a compact copy of the authenticated account are served from the cache, so authenticated requests don't query the ddbb to load them. The local memory cache is only suitable for development, use a cache shared by all the processes (such as Redis) in production, otherwise a change in an account isn't seen by the rest of processes until ACCOUNT_CACHE_TIMEOUT expires.
+## Remove these settings to use the Django's default ddbb sessions.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+SESSION_ENGINE = "extended_accounts_api.helpers.session_store"
+SESSION_WRITE_BEHIND_SECONDS = 60  ## Maximum time a session change may live only in the cache before being written to the ddbb
+AUTHENTICATION_BACKENDS = ["extended_accounts_api.helpers.CachedAccountBackend"]
+ACCOUNT_CACHE_TIMEOUT = 300
+
+## Token authentication, for clients that don't use cookies (mobile apps...). Access tokens are signed with SECRET_KEY and verified without querying the ddbb, so keep their lifetime short. Lifetimes are expressed in seconds.
+ACCESS_TOKEN_LIFETIME = 300
+REFRESH_TOKEN_LIFETIME = 1209600  ## 14 days
+TOKEN_REVOCATION_CACHE_SIZE = (
+    10000  ## Maximum number of revoked access tokens remembered by each process
+)
+
+BULK_ACCOUNTS_MAX = 1000  ## Maximum number of accounts processed by a request to the bulk administration endpoints
+ACCOUNTS_BATCH_MAX = (
+    100  ## Maximum number of accounts retrieved by a request to the batch endpoint
+)
+ACCOUNT_REPRESENTATION_CACHE_TIMEOUT = 300
+
+## Profile images. The sizes are expressed in bytes.
+PROFILE_IMAGE_UPLOAD_DIR = os.path.join(
+    BASE_DIR, "uploads/"
+)  ## Where the chunked uploads are assembled
+PROFILE_IMAGE_MAX_UPLOAD_SIZE = 20 * 1024 * 1024
+PROFILE_IMAGE_MAX_PIXELS = 25_000_000
+PROFILE_IMAGE_HEADER_SIZE = (
+    64 * 1024
+)  ## The image header must be within these first bytes of a chunked upload
+PROFILE_IMAGE_UPLOAD_MAX_AGE = (
+    24 * 3600
+)  ## Seconds after which unfinished chunked uploads are discarded by gc_profile_images
+
+## Profile images are read, written and deleted through the Django's storage API. Local disk storage only works with a single web node (or with a volume shared by all of them); to share the images among many nodes, store them in an S3 compatible service (AWS S3, MinIO...) with the bundled backend:
+## STORAGES["default"] = {
+##     "BACKEND": "extended_accounts_api.helpers.S3Storage",
+##     "OPTIONS": {"bucket": "profile-images", "endpoint_url": "https://s3.eu-west-1.amazonaws.com", "access_key": "...", "secret_key": "...", "region": "eu-west-1"},
+## }
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+## Profile images are served by ProfileImageView with headers letting browsers and proxies cache them forever. To let the reverse proxy send the images stored in the local disk instead of Django, set the header it understands: "X-Accel-Redirect" (nginx) or "X-Sendfile" (Apache, lighttpd)
+PROFILE_IMAGE_SENDFILE_HEADER = None
+PROFILE_IMAGE_SENDFILE_PREFIX = "/protected_media/"  ## Internal nginx location aliasing MEDIA_ROOT, used with X-Accel-Redirect
+## Scaled renditions of the profile images are generated when they're first requested and kept in a size bounded cache in the local disk of each node
+PROFILE_IMAGE_RENDITION_SIZES = [64, 128, 256, 512]
+PROFILE_IMAGE_RENDITION_FORMATS = ["webp", "jpeg", "png"]
+PROFILE_IMAGE_RENDITION_CACHE_DIR = os.path.join(BASE_DIR, "renditions/")
+PROFILE_IMAGE_RENDITION_CACHE_SIZE = 512 * 1024 * 1024
+PROFILE_IMAGE_RENDITION_SENDFILE_PREFIX = "/protected_renditions/"  ## Internal nginx location aliasing PROFILE_IMAGE_RENDITION_CACHE_DIR, used with X-Accel-Redirect
+## Profile images are processed by a pool of worker processes, bounding the CPU and memory taken by image processing regardless of the concurrency of the web server (each worker may decode an image of up to PROFILE_IMAGE_MAX_PIXELS)
+PROFILE_IMAGE_WORKERS = None  ## None means as many workers as cores, 0 processes the images in the calling thread
+PROFILE_IMAGE_QUEUE_SIZE = 8  ## Maximum number of images of each web process being processed or waiting for a worker
+PROFILE_IMAGE_QUEUE_TIMEOUT = (
+    10  ## Seconds a job waits for room in a full queue before answering 503
+)
+PROFILE_IMAGE_ASYNC_ENCODING = False  ## If True, the WebP rendition is encoded by a Celery task after the upload is committed
+if TESTING:
+    PROFILE_IMAGE_WORKERS = 0
+PROFILE_IMAGE_MAX_DIMENSION = (
+    2048  ## Stored images are downscaled to fit in a square of this side
+)
+PROFILE_IMAGE_WEBP_OPTIONS = {
+    "quality": 80,
+    "method": 4,
+}  ## Run python manage.py benchmark_webp_encoding to tune them
+
+## Account lifecycle events (created, confirmed, password_changed, deleted) are written to an outbox table in the same transaction as the change, and published afterwards by the relay_outbox command or the relay_outbox Celery task (scheduled with Celery beat)
+OUTBOX_SINK = "extended_accounts_api.helpers.celery_sink"  ## Or extended_accounts_api.helpers.webhook_sink, or the dotted path of any callable taking a list of events
+OUTBOX_CELERY_TASK = "account_events.handle"  ## Name of the task consuming the events published by celery_sink
+OUTBOX_WEBHOOK_URL = None  ## URL receiving the events published by webhook_sink
+OUTBOX_WEBHOOK_TIMEOUT = 10
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_RELAY_INTERVAL = (
+    1  ## Seconds the relay_outbox command waits when the outbox is empty
+)
+
+UNCONFIRMED_ACCOUNTS_BATCH_SIZE = 500  ## The deletion of unconfirmed accounts is scheduled with a single Celery message per request, or per this many accounts during bulk operations. Accounts created outside of requests (Celery tasks, shell...) are published one by one
+
+## Reads of accounts and profiles are sent to the read replicas listed here (aliases of DATABASES), unless they lag more than DATABASE_REPLICA_MAX_LAG seconds behind the primary or the client wrote in the last DATABASE_REPLICA_PIN_SECONDS. For local development, a second connection to the same SQLite file is a stand-in replica:
+## DATABASES["replica"] = {"ENGINE": "django.db.backends.sqlite3", "NAME": BASE_DIR / "db.sqlite3", "TEST": {"MIRROR": "default"}}
+## DATABASE_REPLICAS = ["replica"]
+DATABASE_ROUTERS = ["extended_accounts_api.helpers.ReplicaRouter"]
+DATABASE_REPLICAS = []
+DATABASE_REPLICA_MAX_LAG = 2
+DATABASE_REPLICA_CHECK_INTERVAL = 5
+DATABASE_REPLICA_PIN_SECONDS = 10
+DATABASE_REPLICA_PIN_COOKIE = "primary_pin"
+
+PASSWORD_FILTER_PATH = os.path.join(
+    BASE_DIR, "breached_passwords.bloom"
+)  ## Compiled with python manage.py compile_password_filter [lists]. Until then, BreachedPasswordValidator falls back to Django's common passwords list
+
+## Every login writes last_login to the account. Under login storms, these writes may be coalesced in the memory of each process and flushed in a single UPDATE per LAST_LOGIN_BATCH_SIZE accounts, or once the oldest of them has been pending LAST_LOGIN_MAX_STALENESS seconds (checked at the end of each request, idle processes write them when they exit)
+## Password reset tokens hash last_login: the process handling a reset request writes the pending login of the account before making the token, but a login still pending in another process invalidates the token when it's flushed, up to LAST_LOGIN_MAX_STALENESS seconds later (the user has to request another one)
+LAST_LOGIN_WRITE_BEHIND = False
+LAST_LOGIN_MAX_STALENESS = 60
+LAST_LOGIN_BATCH_SIZE = 500
+
+## The availability/ endpoint answers from a per process bloom filter of the usernames, emails and phone numbers in use
+AVAILABILITY_INDEX_ERROR_RATE = (
+    0.01  ## Fraction of the available values confirmed with a query anyway
+)
+AVAILABILITY_INDEX_REFRESH_INTERVAL = (
+    5  ## Seconds between scans of the accounts created by other processes
+)
+AVAILABILITY_INDEX_REBUILD_INTERVAL = (
+    3600  ## Seconds between full rebuilds, dropping the deleted and replaced values
+)
+AVAILABILITY_INDEX_CHUNK_SIZE = 2000
+
+ACCOUNT_SEARCH_PAGE_SIZE = 20  ## Accounts per page of the results of ?q= searches
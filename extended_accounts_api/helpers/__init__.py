@@ -5,4 +5,88 @@ from .password_serializers import (
     NewPasswordSerializer,
 )
 from .permissions import IsSelf
-from .tasks import delete_unconfirmed_accounts
+from .tasks import (
+    delete_unconfirmed_accounts,
+    delete_unconfirmed_accounts_batch,
+    encode_profile_image,
+    relay_outbox,
+)
+from .account_cache import (
+    CachedAccountBackend,
+    cache_account,
+    get_cached_account,
+    invalidate_cached_accounts,
+)
+from .token_serializer import RefreshTokenSerializer
+from .token_authentication import (
+    AccessTokenAuthentication,
+    csrf_protect_unless_token,
+    issue_tokens,
+    rotate_refresh_token,
+    revoke_refresh_token,
+    revoke_access_token,
+    revoke_account_refresh_tokens,
+    request_refresh_token_hash,
+)
+from .profile_images import (
+    profile_image_storage,
+    render_profile_image,
+    delete_profile_images,
+    delete_profile_image_files,
+    unreferenced_profile_images,
+    acquire_profile_image,
+    release_profile_image,
+    store_uploaded_profile_image,
+    defer_profile_image_deletion,
+)
+from .bulk_accounts import BulkAccountsSerializer, bulk_set_active, bulk_delete_accounts
+from .chunked_upload import (
+    ProfileImageUploadSerializer,
+    append_chunk,
+    validate_upload_header,
+    complete_upload,
+    discard_upload,
+    discard_expired_uploads,
+)
+from .s3_storage import S3Storage
+from .profile_image_urls import profile_image_url, check_profile_image_signature
+from .image_processing import (
+    ImageProcessingUnavailable,
+    image_processing_pool,
+    normalize_profile_image,
+    store_webp_rendition,
+)
+from .outbox import (
+    record_event,
+    relay_outbox_events,
+    celery_sink,
+    webhook_sink,
+)
+from .last_login import record_last_login, flush_last_logins, flush_account_last_login
+from .unconfirmed_accounts import (
+    schedule_unconfirmed_account_deletion,
+    flush_unconfirmed_account_deletions,
+    start_request_buffer,
+    end_request_buffer,
+)
+from .session_store import revoke_account_sessions
+from .db_router import ReplicaRouter, ReplicaPinningMiddleware, pin_to_primary
+from .password_validation import BreachedPasswordValidator
+from .availability import availability_index, AVAILABILITY_FIELDS
+from .account_row_serializer import AccountRowSerializer, requested_fields
+from .account_representations import (
+    AccountsBatchSerializer,
+    get_account_representations,
+    invalidate_account_representations,
+)
+from .renderers import (
+    ORJSONRenderer,
+    ORJSONParser,
+    MessagePackRenderer,
+    MessagePackParser,
+)
+from .account_search import (
+    index_profile,
+    unindex_profile,
+    search_page,
+)
@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from extended_accounts_api.models import AccountModel as Account
+
+## Compact copy of an account: just what's needed to authenticate a request and check its permissions
+CACHED_ACCOUNT_FIELDS = ["id", "username", "is_active", "is_staff", "is_superuser"]
+
+
+def account_cache_key(pk):
+    return f"extended_accounts_api.account.{pk}"
+
+
+def cache_account(account):
+    data = {field: getattr(account, field) for field in CACHED_ACCOUNT_FIELDS}
+    data["session_auth_hash"] = account.get_session_auth_hash()
+    cache.set(account_cache_key(account.pk), data, settings.ACCOUNT_CACHE_TIMEOUT)
+
+
+def compact_account(data):
+    """
+    Build an account from a compact copy of its fields without querying the ddbb. The fields that aren't present are deferred, so they're lazily loaded if accessed and saving the instance only writes the present fields, which protects the password from being overwritten.
+    """
+    ## Model.from_db expects the values sorted as the concrete fields of the model
+    field_names = [
+        field.attname
+        for field in Account._meta.concrete_fields
+        if field.attname in data
+    ]
+    return Account.from_db(
+        Account.objects.db, field_names, [data[name] for name in field_names]
+    )
+
+
+def get_cached_account(pk):
+    data = cache.get(account_cache_key(pk))
+    if data is None:
+        return None
+    account = compact_account(data)
+    account._cached_session_auth_hash = data["session_auth_hash"]
+    return account
+
+
+def invalidate_cached_accounts(pks):
+    cache.delete_many([account_cache_key(pk) for pk in pks])
+
+
+class CachedAccountBackend(ModelBackend):
+    """
+    ModelBackend serving the account of authenticated sessions from the cache. The cached copy is dropped whenever the account is saved or deleted (see extended_accounts_api.signals), so it's never stale when using a cache shared by all the processes.
+    """
+
+    def get_user(self, user_id):
+        account = get_cached_account(user_id)
+        if account is None:
+            try:
+                account = Account._default_manager.db_manager(DEFAULT_DB_ALIAS).get(
+                    pk=user_id
+                )  ## Never from a replica, which may still have the account as it was before the change that dropped its cached copy
+            except Account.DoesNotExist:
+                return None
+            if self.user_can_authenticate(account):
+                cache_account(account)
+        return account if self.user_can_authenticate(account) else None
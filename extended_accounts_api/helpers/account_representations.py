@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework import serializers
+from extended_accounts_api.models import AccountModel as Account
+from .account_row_serializer import AccountRowSerializer
+import hashlib
+
+
+class AccountsBatchSerializer(serializers.Serializer):
+    usernames = serializers.ListField(
+        child=serializers.CharField(
+            max_length=Account._meta.get_field("username").max_length,
+            validators=[Account.username_validator],
+        ),  ## Anything else can't be an account, so it's rejected before reaching the cache
+        allow_empty=False,
+    )
+
+    def validate_usernames(self, value):
+        value = list(dict.fromkeys(value))  ## Duplicates are fetched once
+        if len(value) > settings.ACCOUNTS_BATCH_MAX:
+            raise serializers.ValidationError(
+                f"At most {settings.ACCOUNTS_BATCH_MAX} accounts can be retrieved at once"
+            )
+        return value
+
+
+def representation_cache_key(username):
+    digest = hashlib.blake2b(username.encode(), digest_size=16).hexdigest()
+    return f"extended_accounts_api.representation.{digest}"  ## Hashed, so non ASCII usernames are valid (and short enough) memcached keys
+
+
+def invalidate_account_representations(usernames):
+    cache.delete_many([representation_cache_key(username) for username in usernames])
+
+
+def get_account_representations(usernames, request=None, fields=None):
+    """
+    Representations of the accounts with the given usernames, keyed by username (None for the unknown ones). They're read from the cache with a single get_many, and the missing ones are loaded along with their profiles in a single query and cached for ACCOUNT_REPRESENTATION_CACHE_TIMEOUT seconds. If only some fields are requested, the cached representations are pruned to them; the missing ones are still loaded whole, so they're cached for any later request. The account and profile signals drop the cached representations whenever they change.
+    """
+    keys = {representation_cache_key(username): username for username in usernames}
+    representations = {
+        keys[key]: representation
+        for key, representation in cache.get_many(keys).items()
+    }
+    missing = [username for username in usernames if username not in representations]
+    if missing:
+        serializer = (
+            AccountRowSerializer()
+        )  ## Without request, so the cached URLs are relative
+        loaded = {
+            representation["username"]: representation
+            for representation in serializer.to_representation_many(
+                serializer.rows(
+                    Account.objects.db_manager(DEFAULT_DB_ALIAS).filter(
+                        username__in=missing
+                    )
+                )  ## Cache fills read the primary, replicas may lag behind the change that dropped them
+            )
+        }
+        cache.set_many(
+            {
+                representation_cache_key(username): representation
+                for username, representation in loaded.items()
+            },
+            settings.ACCOUNT_REPRESENTATION_CACHE_TIMEOUT,
+        )
+        representations.update(loaded)
+    if fields is not None:
+        representations = {
+            username: {field: representation[field] for field in fields}
+            for username, representation in representations.items()
+        }
+    if request is not None:
+        for representation in representations.values():
+            if representation.get("profile_image_url"):
+                representation["profile_image_url"] = request.build_absolute_uri(
+                    representation["profile_image_url"]
+                )
+    return {username: representations.get(username) for username in usernames}
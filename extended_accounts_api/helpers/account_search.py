@@ -0,0 +1,132 @@
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+from django.db.models import Case, IntegerField, Q, When
+from django.db.models.expressions import RawSQL
+from rest_framework import serializers
+from extended_accounts_api.models import ProfileModel as Profile
+from extended_accounts_api.models.indexes import SEARCH_TABLE, PG_NAMES_VECTOR
+import re
+
+PROFILE_TABLE = (
+    Profile._meta.db_table
+)  ## The indexes backing the search are declared in the models, see extended_accounts_api.models.indexes
+
+
+_search_tables = set()  ## Aliases of the SQLite ddbbs whose FTS5 table has been created
+
+
+def has_search_table(using):
+    """
+    Whether the FTS5 table of the SQLite ddbb exists. Until the migration adding it is applied, profiles aren't indexed (the migration fills the table with them) and names are searched without it.
+    """
+    if using not in _search_tables:
+        connection = connections[using]
+        with connection.cursor() as cursor:
+            if SEARCH_TABLE in connection.introspection.table_names(cursor):
+                _search_tables.add(
+                    using
+                )  ## Only found tables are remembered, the migration may be applied while the process runs
+    return using in _search_tables
+
+
+def index_profile(profile, using):
+    if connections[using].vendor == "sqlite" and has_search_table(using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f'INSERT OR REPLACE INTO "{SEARCH_TABLE}" (rowid, first_name, last_name) VALUES (%s, %s, %s)',
+                [profile.account_id, profile.first_name, profile.last_name],
+            )
+
+
+def unindex_profile(profile, using):
+    if connections[using].vendor == "sqlite" and has_search_table(using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM "{SEARCH_TABLE}" WHERE rowid = %s', [profile.account_id]
+            )
+
+
+def names_match(tokens, using):
+    """
+    Condition matching the accounts whose first or last name has words starting with every token.
+    """
+    vendor = connections[using].vendor
+    if vendor == "postgresql":
+        return Q(
+            pk__in=RawSQL(
+                f'SELECT "account_id" FROM "{PROFILE_TABLE}" WHERE {PG_NAMES_VECTOR} @@ to_tsquery(\'simple\', %s)',
+                [" & ".join(f"{token}:*" for token in tokens)],
+            )
+        )
+    if vendor == "sqlite" and has_search_table(using):
+        return Q(
+            pk__in=RawSQL(
+                f'SELECT rowid FROM "{SEARCH_TABLE}" WHERE "{SEARCH_TABLE}" MATCH %s',
+                [" ".join(f'"{token}"*' for token in tokens)],
+            )
+        )
+    condition = Q()
+    for token in tokens:
+        condition &= Q(profile__first_name__istartswith=token) | Q(
+            profile__last_name__istartswith=token
+        )
+    return condition
+
+
+def search_accounts(queryset, query):
+    """
+    Accounts matching the query: the username or the email start with it, or the first and last names have words starting with each of its words. They're ranked by how they match (exact username, username prefix, email prefix, names) and then sorted by username, so they can be paginated by keyset.
+    Each kind of match is looked up on its own index and their union is joined to the accounts by primary key (a single OR condition would scan the accounts table). The rank isn't indexed though, so every page sorts the whole set of matches: pages take milliseconds as long as the query is selective, but a short prefix matching a large share of the accounts costs a sort of all of them.
+    """
+    candidates = queryset.order_by().values("pk")
+    matches = [
+        candidates.filter(username__istartswith=query),
+        candidates.filter(email__istartswith=query),
+    ]
+    tokens = re.findall(r"\w+", query)
+    if tokens:
+        matches.append(candidates.filter(names_match(tokens, queryset.db)))
+    return (
+        queryset.filter(pk__in=matches[0].union(*matches[1:]))
+        .annotate(
+            search_rank=Case(
+                When(username__iexact=query, then=0),
+                When(username__istartswith=query, then=1),
+                When(email__istartswith=query, then=2),
+                default=3,
+                output_field=IntegerField(),
+            )
+        )
+        .order_by("search_rank", "username")
+    )
+
+
+def search_page(serializer, queryset, query, cursor=None):
+    """
+    Page of ACCOUNT_SEARCH_PAGE_SIZE accounts matching the query, represented by the given AccountRowSerializer, starting after the account the cursor points to. The cursor of the next page is returned along with the results.
+    """
+    if not query.strip():
+        raise serializers.ValidationError({"q": ["This parameter may not be blank."]})
+    accounts = search_accounts(queryset, query)
+    if cursor:
+        try:
+            rank, username = signing.loads(cursor, salt="extended_accounts_api.search")
+        except (signing.BadSignature, TypeError, ValueError):
+            raise serializers.ValidationError({"cursor": ["Invalid cursor."]})
+        accounts = accounts.filter(
+            Q(search_rank__gt=rank) | Q(search_rank=rank, username__gt=username)
+        )
+    page_size = settings.ACCOUNT_SEARCH_PAGE_SIZE
+    rows = list(
+        accounts.values_list(*serializer.paths, "search_rank", "username")[
+            : page_size + 1
+        ]
+    )  ## The representation only reads the leading columns
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = signing.dumps(
+            [rows[-1][-2], rows[-1][-1]], salt="extended_accounts_api.search"
+        )
+    return {"results": serializer.to_representation_many(rows), "next": next_cursor}
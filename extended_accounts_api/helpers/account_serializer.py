@@ -2,6 +2,7 @@ from django.core.validators import RegexValidator
 from rest_framework import serializers
 from extended_accounts_api.models import AccountModel as Account
 from .password_serializers import NewPasswordSerializer
+from .profile_image_urls import profile_image_url
 
 
 class AccountSerializer(serializers.ModelSerializer):
@@ -42,10 +43,9 @@ class AccountSerializer(serializers.ModelSerializer):
         super().__init__(*args, **kwargs)
 
     def create(self, validated_data):
-        password = validated_data.pop("password")
-        password_serializer = NewPasswordSerializer(data=password)
-        password_serializer.is_valid(raise_exception=True)
-        validated_data["password"] = password_serializer.validated_data["password"]
+        validated_data["password"] = validated_data.pop("password")[
+            "password"
+        ]  ## Already validated as a nested serializer
         return Account.objects.create_user(**validated_data)
 
     def update(self, instance, validated_data):
@@ -62,6 +62,9 @@ class AccountSerializer(serializers.ModelSerializer):
             "email": instance.email,
             "phone_number": instance.profile.phone_number,
             "profile_image": instance.profile.profile_image.name,
+            "profile_image_url": profile_image_url(
+                instance.profile.profile_image.name, self.context.get("request")
+            ),
             "date_joined": instance.profile.date_joined.strftime("%Y-%m-%d"),
         }
 
@@ -0,0 +1,156 @@
+from django.conf import settings
+from django.db import connections
+from extended_accounts_api.models import AccountModel as Account
+from .bloom_filter import BloomFilter
+import logging, threading, time
+
+logger = logging.getLogger(__name__)
+
+AVAILABILITY_FIELDS = {
+    "username": "username",
+    "email": "email",
+    "phone_number": "profile__phone_number",
+}
+
+
+class AvailabilityIndex:
+    """
+    Per process bloom filter of the usernames, emails and phone numbers in use, answering whether a value is available without querying the ddbb: a value missing from the filter is available, and only the probable hits are confirmed with an indexed EXISTS query. The filter is fed by the account and profile signals of the process, every AVAILABILITY_INDEX_REFRESH_INTERVAL seconds with the accounts created by other processes (scanning the primary key index from the last seen account), and rebuilt from a streamed scan of the accounts every AVAILABILITY_INDEX_REBUILD_INTERVAL seconds, which drops the deleted and replaced values. Rebuilds run in a background thread while the current filter keeps answering (until the first one is ready, every value is checked against the ddbb). Values changed by other processes may be reported available until the next rebuild, so the answers are advisory: the account serializer keeps checking uniqueness on signup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._filter = None
+            self._capacity = 0
+            self._count = 0
+            self._last_pk = 0
+            self._built_at = self._refreshed_at = 0.0
+            self._rebuild_added = (
+                None  ## Values added while a rebuild runs, replayed on the new filter
+            )
+            self._generation += 1  ## Discards the rebuild running, if any
+
+    def add(self, field, value):
+        if value is None:
+            return
+        key = f"{field}:{value}"
+        with self._lock:
+            if self._filter is not None:
+                self._count += self._add(self._filter, key)
+            if self._rebuild_added is not None:
+                self._rebuild_added.append(key)
+
+    @staticmethod
+    def _add(bloom_filter, key):
+        """
+        Add the key to the filter, returning 1 if it's new: saving an account again, on every login, doesn't bring the next rebuild closer.
+        """
+        if key in bloom_filter:
+            return 0
+        bloom_filter.add(key)
+        return 1
+
+    def _rows(self, accounts):
+        for row in (
+            accounts.order_by("pk")
+            .values_list("pk", *AVAILABILITY_FIELDS.values())
+            .iterator(chunk_size=settings.AVAILABILITY_INDEX_CHUNK_SIZE)
+        ):
+            yield row[0], [
+                f"{field}:{value}"
+                for field, value in zip(AVAILABILITY_FIELDS, row[1:])
+                if value is not None
+            ]
+
+    def _sync(self):
+        """
+        Decide, under the lock, whether a rebuild has to start and whether this request refreshes the filter (returning the primary key to scan from), so the ddbb is queried once per interval and outside the lock.
+        """
+        now = time.monotonic()
+        rebuild = self._rebuild_added is None and (
+            self._filter is None
+            or now - self._built_at >= settings.AVAILABILITY_INDEX_REBUILD_INTERVAL
+            or self._count
+            > self._capacity  ## Past its capacity, the false positive rate grows quickly
+        )
+        if rebuild:
+            self._rebuild_added = []
+        refresh_from = None
+        if (
+            self._filter is not None
+            and now - self._refreshed_at >= settings.AVAILABILITY_INDEX_REFRESH_INTERVAL
+        ):
+            self._refreshed_at = now
+            refresh_from = self._last_pk
+        return rebuild, refresh_from
+
+    def _start_rebuild(self, generation):
+        def rebuild():
+            try:
+                self._rebuild(generation)
+            finally:
+                connections.close_all()  ## The connections of this thread
+
+        threading.Thread(
+            target=rebuild, name="availability-index-rebuild", daemon=True
+        ).start()
+
+    def _rebuild(self, generation):
+        try:
+            capacity = (
+                2 * len(AVAILABILITY_FIELDS) * max(Account.objects.count(), 1000)
+            )  ## Room for the accounts created until the next rebuild
+            bloom_filter = BloomFilter(capacity, settings.AVAILABILITY_INDEX_ERROR_RATE)
+            count = last_pk = 0
+            for last_pk, keys in self._rows(Account.objects.all()):
+                for key in keys:
+                    count += self._add(bloom_filter, key)
+        except Exception:
+            logger.exception("Couldn't rebuild the availability index")
+            with self._lock:
+                if generation == self._generation:
+                    self._rebuild_added = None  ## Retried on the next request
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            for key in self._rebuild_added:
+                count += self._add(bloom_filter, key)
+            self._filter, self._capacity, self._count = bloom_filter, capacity, count
+            self._last_pk = last_pk  ## Accounts created by other processes during the scan are caught by the next refresh
+            self._built_at = self._refreshed_at = time.monotonic()
+            self._rebuild_added = None
+
+    def _refresh(self, refresh_from):
+        rows = list(self._rows(Account.objects.filter(pk__gt=refresh_from)))
+        with self._lock:
+            if self._filter is None:
+                return
+            for pk, keys in rows:
+                for key in keys:
+                    self._count += self._add(self._filter, key)
+                self._last_pk = max(self._last_pk, pk)
+
+    def is_available(self, field, value):
+        key = f"{field}:{value}"
+        with self._lock:
+            rebuild, refresh_from = self._sync()
+            generation = self._generation
+        if rebuild:
+            self._start_rebuild(generation)
+        if refresh_from is not None:
+            self._refresh(refresh_from)
+        with self._lock:
+            if self._filter is not None and key not in self._filter:
+                return True
+        return not Account.objects.filter(
+            **{AVAILABILITY_FIELDS[field]: value}
+        ).exists()  ## Probable hit or no filter yet, confirmed with the unique index of the field
+
+
+availability_index = AvailabilityIndex()
@@ -0,0 +1,66 @@
+import hashlib, math, mmap, os, struct, tempfile
+
+HEADER = struct.Struct("<8sQQ")  ## Magic, number of bits and number of hashes
+MAGIC = b"BLOOMv1\0"
+
+
+class BloomFilter:
+    """
+    Set of strings taking a fixed amount of memory, sized for the given capacity and false positive rate. Membership tests may return false positives, but never false negatives. A filter may be saved to a file and loaded memory-mapped, so every process of the host shares a single copy through the page cache.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(capacity, 1)
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(round(self.size / capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8]), int.from_bytes(digest[8:]) | 1
+        return (
+            (first + index * second) % self.size for index in range(self.hash_count)
+        )  ## Double hashing: k positions out of a single hash
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def save(self, path):
+        """
+        Write the filter to the given path atomically, so processes that mapped a previous version keep reading it until they load the new one.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile(dir=directory, delete=False) as file:
+            file.write(HEADER.pack(MAGIC, self.size, self.hash_count))
+            file.write(self.bits)
+        os.chmod(
+            file.name, 0o644
+        )  ## Temporary files are private, but the web workers may run as another user
+        os.replace(file.name, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Map a filter saved with save. Its pages are loaded lazily by the OS and shared among all the processes mapping it.
+        """
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) < HEADER.size:
+            raise ValueError(f"{path} isn't a bloom filter")
+        magic, size, hash_count = HEADER.unpack_from(mapped)
+        if magic != MAGIC:
+            raise ValueError(f"{path} isn't a bloom filter")
+        if len(mapped) < HEADER.size + (size + 7) // 8:
+            raise ValueError(f"{path} is truncated")
+        bloom_filter = cls.__new__(cls)
+        bloom_filter.size = size
+        bloom_filter.hash_count = hash_count
+        bloom_filter.bits = memoryview(mapped)[HEADER.size :]
+        return bloom_filter
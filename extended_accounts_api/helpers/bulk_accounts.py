@@ -0,0 +1,66 @@
+from django.db import transaction
+from rest_framework import serializers
+from django.conf import settings
+from extended_accounts_api.models import AccountModel as Account
+from .account_cache import invalidate_cached_accounts
+from .profile_images import defer_profile_image_deletion
+
+
+class BulkAccountsSerializer(serializers.Serializer):
+    usernames = serializers.ListField(
+        child=serializers.CharField(), required=False, allow_empty=False
+    )
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False
+    )
+
+    def validate(self, attrs):
+        if len(attrs) != 1:
+            raise serializers.ValidationError(
+                "Provide either a list of usernames or a list of ids"
+            )
+        ((key, identifiers),) = attrs.items()
+        if len(identifiers) > settings.BULK_ACCOUNTS_MAX:
+            raise serializers.ValidationError(
+                f"At most {settings.BULK_ACCOUNTS_MAX} accounts can be processed at once"
+            )
+        ## Return the account field to filter by and the identifiers to look for
+        return {
+            "lookup": "username" if key == "usernames" else "pk",
+            "identifiers": identifiers,
+        }
+
+
+def find_accounts(lookup, identifiers):
+    return dict(
+        Account.objects.filter(**{f"{lookup}__in": identifiers}).values_list(
+            lookup, "pk"
+        )
+    )
+
+
+def summarize(identifiers, accounts, result):
+    return {
+        str(identifier): result if identifier in accounts else "not_found"
+        for identifier in identifiers
+    }
+
+
+def bulk_set_active(lookup, identifiers, is_active):
+    """
+    Activate or deactivate the accounts with a single UPDATE. As QuerySet.update doesn't send signals, the cached copies of the accounts are explicitly dropped.
+    """
+    accounts = find_accounts(lookup, identifiers)
+    Account.objects.filter(pk__in=accounts.values()).update(is_active=is_active)
+    invalidate_cached_accounts(accounts.values())
+    return summarize(identifiers, accounts, "activated" if is_active else "deactivated")
+
+
+def bulk_delete_accounts(lookup, identifiers):
+    """
+    Delete the accounts (and their profiles) with one DELETE per table. The profile images are removed in a single pass once the deletion is committed.
+    """
+    accounts = find_accounts(lookup, identifiers)
+    with transaction.atomic(), defer_profile_image_deletion():
+        Account.objects.filter(pk__in=accounts.values()).delete()
+    return summarize(identifiers, accounts, "deleted")
@@ -0,0 +1,178 @@
+from django.conf import settings
+from django.core.files import File
+from django.core.validators import get_available_image_extensions
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
+from extended_accounts_api.models import ProfileImageUploadModel as ProfileImageUpload
+from PIL import Image, UnidentifiedImageError
+import datetime, fcntl, os, time
+
+CHUNK_READ_SIZE = 64 * 1024
+IMAGE_SIGNATURE_SIZE = (
+    16  ## PIL identifies the format of an image from its first 16 bytes
+)
+
+
+class UploadOffsetConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The chunk offset doesn't match the upload offset"
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "The chunk exceeds the declared size of the upload"
+
+
+class ProfileImageUploadSerializer(serializers.Serializer):
+    file_name = serializers.CharField(required=True, max_length=255)
+    size = serializers.IntegerField(required=True, min_value=1)
+
+    def validate_file_name(self, value):
+        if (
+            os.path.splitext(value)[1][1:].lower()
+            not in get_available_image_extensions()
+        ):
+            raise serializers.ValidationError("The file isn't an image")
+        return value
+
+    def validate_size(self, value):
+        if value > settings.PROFILE_IMAGE_MAX_UPLOAD_SIZE:
+            raise serializers.ValidationError(
+                f"The image cannot be larger than {settings.PROFILE_IMAGE_MAX_UPLOAD_SIZE} bytes"
+            )
+        return value
+
+
+def append_chunk(upload, offset, stream):
+    """
+    Stream a chunk to the end of the partial file of the upload, without holding it in memory. Return the new offset of the upload. The partial file is locked while the chunk is received, so a chunk sent while another one of the same upload is being received (a client retrying too early...) is rejected instead of being interleaved with it.
+    """
+    os.makedirs(settings.PROFILE_IMAGE_UPLOAD_DIR, exist_ok=True)
+    with open(upload.path, "ab") as partial_file:
+        try:
+            fcntl.flock(partial_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadOffsetConflict("Another chunk of this upload is being received")
+        current_offset = os.fstat(
+            partial_file.fileno()
+        ).st_size  ## Read while holding the lock
+        if offset != current_offset:
+            raise UploadOffsetConflict()
+        remaining = upload.size - current_offset
+        signature = read_image_signature(stream, upload) if current_offset == 0 else b""
+        while True:
+            data = signature or stream.read(CHUNK_READ_SIZE)
+            signature = b""
+            if not data:
+                break
+            if len(data) > remaining:
+                partial_file.truncate(
+                    current_offset
+                )  ## Discard the whole chunk, the client may resend it properly
+                raise UploadTooLarge()
+            partial_file.write(data)
+            remaining -= len(data)
+    return upload.size - remaining
+
+
+def read_image_signature(stream, upload):
+    """
+    Read the first bytes of an upload and check they're the signature of a format PIL can open, so a file that isn't an image is rejected with its first bytes instead of once a whole chunk has been stored. Return the bytes read. Chunks too short to hold the signature and formats without one (TGA...) are left to validate_upload_header.
+    """
+    signature = b""
+    while len(signature) < IMAGE_SIGNATURE_SIZE:
+        data = stream.read(IMAGE_SIGNATURE_SIZE - len(signature))
+        if not data:
+            break
+        signature += data
+    if len(signature) < min(IMAGE_SIGNATURE_SIZE, upload.size):
+        return signature
+    Image.init()
+    declared_format = Image.registered_extensions().get(
+        os.path.splitext(upload.file_name)[1].lower()
+    )
+    if Image.OPEN.get(declared_format, (None, None))[1] is None:
+        return signature
+    if not any(
+        accept(signature) for _, accept in Image.OPEN.values() if accept is not None
+    ):  ## Any format is fine, the declared one is only taken as a hint
+        raise serializers.ValidationError("The uploaded file isn't a valid image")
+    return signature
+
+
+def validate_upload_header(upload):
+    """
+    Validate the image as soon as its header has been received, so uploads of invalid or too large images are rejected before the rest of the file is sent. PIL only reads the header when opening an image, which is enough to know its format and dimensions.
+    Return whether the header could be validated; raise ValidationError if the image is invalid.
+    """
+    try:
+        with Image.open(upload.path) as image:
+            width, height = image.size
+    except Image.DecompressionBombError:
+        raise serializers.ValidationError("The image has too many pixels")
+    except (UnidentifiedImageError, OSError, SyntaxError):
+        received = upload.offset
+        if received < upload.size and received < settings.PROFILE_IMAGE_HEADER_SIZE:
+            return False  ## The header may not be complete yet
+        raise serializers.ValidationError("The uploaded file isn't a valid image")
+    if width * height > settings.PROFILE_IMAGE_MAX_PIXELS:
+        raise serializers.ValidationError("The image has too many pixels")
+    return True
+
+
+def complete_upload(upload, account):
+    """
+    Verify the assembled image and save it through the usual profile update path, which converts it and replaces the previous image.
+    """
+    try:
+        with Image.open(upload.path) as image:
+            image.verify()
+    except Exception:
+        raise serializers.ValidationError("The uploaded file isn't a valid image")
+    with open(upload.path, "rb") as image_file:
+        account.update(profile_image=File(image_file, name=upload.file_name))
+    discard_upload(upload)
+
+
+def discard_upload(upload):
+    try:
+        os.remove(upload.path)
+    except FileNotFoundError:
+        pass
+    upload.delete()
+
+
+def discard_expired_uploads(max_age):
+    """
+    Discard the uploads started more than max_age seconds ago, and the partial files left without upload (interrupted deletions, deleted accounts...) for as long. Return how many uploads and files were discarded.
+    """
+    discarded = 0
+    for upload in ProfileImageUpload.objects.filter(
+        created_at__lt=timezone.now() - datetime.timedelta(seconds=max_age)
+    ).iterator():
+        discard_upload(upload)
+        discarded += 1
+    max_modified_time = time.time() - max_age
+    try:
+        with os.scandir(settings.PROFILE_IMAGE_UPLOAD_DIR) as scan:
+            partial_files = [
+                entry
+                for entry in scan
+                if entry.name.endswith(".part")
+                and entry.stat().st_mtime < max_modified_time
+            ]
+    except FileNotFoundError:
+        return discarded
+    uploads = {
+        upload_id.hex
+        for upload_id in ProfileImageUpload.objects.values_list("id", flat=True)
+    }
+    for entry in partial_files:
+        if entry.name[: -len(".part")] not in uploads:
+            try:
+                os.remove(entry.path)
+                discarded += 1
+            except FileNotFoundError:
+                pass
+    return discarded
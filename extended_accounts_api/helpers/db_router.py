@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.db import connections, DEFAULT_DB_ALIAS, DatabaseError
+from contextvars import ContextVar
+import random, threading, time
+
+_pinned = ContextVar("pinned_to_primary", default=False)
+_replica_status = {}  ## alias -> (checked at, usable)
+_replica_status_lock = threading.Lock()
+ROUTED_MODELS = {settings.AUTH_USER_MODEL, "extended_accounts_api.ProfileModel"}
+
+
+def pin_to_primary():
+    """
+    Send the rest of reads of the ongoing request (or thread, outside of requests) to the primary database, so they see the writes made.
+    """
+    _pinned.set(True)
+
+
+def replica_lag(alias):
+    """
+    Seconds the replica is behind the primary. Stand-in replicas (such as a second SQLite connection to the same file) don't lag.
+    """
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "  ## Everything received has been replayed, even if the primary has been idle for a while
+            "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+        )
+        return float(cursor.fetchone()[0])
+
+
+def replica_usable(alias):
+    """
+    Whether the replica is reachable and its lag is within DATABASE_REPLICA_MAX_LAG. It's checked at most once every DATABASE_REPLICA_CHECK_INTERVAL seconds per process.
+    """
+    now = time.monotonic()
+    with _replica_status_lock:
+        checked_at, usable = _replica_status.get(alias, (None, False))
+    if (
+        checked_at is not None
+        and now - checked_at < settings.DATABASE_REPLICA_CHECK_INTERVAL
+    ):
+        return usable
+    try:
+        usable = replica_lag(alias) <= settings.DATABASE_REPLICA_MAX_LAG
+    except DatabaseError:  ## Unreachable replica, reads fall back to the primary
+        usable = False
+    with _replica_status_lock:
+        _replica_status[alias] = (now, usable)
+    return usable
+
+
+class ReplicaRouter:
+    """
+    Send the reads of accounts and profiles to a random replica of DATABASE_REPLICAS among those usable, and everything else to the primary. Once a request writes, its reads go to the primary, and the ReplicaPinningMiddleware keeps the following requests of the client on the primary for DATABASE_REPLICA_PIN_SECONDS, so clients read their own writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        if (
+            model._meta.label not in ROUTED_MODELS
+            or not settings.DATABASE_REPLICAS
+            or _pinned.get()
+            or connections[
+                DEFAULT_DB_ALIAS
+            ].in_atomic_block  ## Reads inside a transaction must see its writes
+        ):
+            return DEFAULT_DB_ALIAS
+        replicas = [
+            alias for alias in settings.DATABASE_REPLICAS if replica_usable(alias)
+        ]
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if model._meta.label in ROUTED_MODELS:
+            pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if (
+            db in settings.DATABASE_REPLICAS
+        ):  ## Replicas are migrated through the primary
+            return False
+        return None
+
+
+class ReplicaPinningMiddleware:
+    """
+    Pin to the primary the requests of clients that wrote in the last DATABASE_REPLICA_PIN_SECONDS, marking them with a cookie.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _pinned.set(
+            settings.DATABASE_REPLICA_PIN_COOKIE in request.COOKIES
+        )  ## Each request starts unpinned unless the client wrote recently
+        try:
+            response = self.get_response(request)
+            if _pinned.get() and settings.DATABASE_REPLICAS:
+                response.set_cookie(
+                    settings.DATABASE_REPLICA_PIN_COOKIE,
+                    "1",
+                    max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                    httponly=True,
+                    samesite="Lax",
+                )
+            return response
+        finally:
+            _pinned.reset(token)
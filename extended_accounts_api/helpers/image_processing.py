@@ -0,0 +1,258 @@
+from django.conf import settings
+from django.core.files import File
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from PIL import Image, ImageCms, ImageOps
+from io import BytesIO
+import django, os, tempfile, threading, time
+
+SRGB_PROFILE = ImageCms.createProfile("sRGB")
+ORIGINAL_SAVE_OPTIONS = {
+    "JPEG": {"quality": 90, "optimize": True},
+    "PNG": {"optimize": True},
+}
+
+
+class ImageProcessingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many images are being processed, try again later"
+
+
+## Image processing jobs. They run in the worker processes, so they take paths instead of file objects.
+
+
+def open_image(path, max_pixels):
+    """
+    Open an image refusing it before decoding its pixels if it exceeds the pixel budget.
+    """
+    image = Image.open(path)
+    if image.width * image.height > max_pixels:
+        image.close()
+        raise Image.DecompressionBombError(
+            f"The image has {image.width * image.height} pixels, exceeding the budget of {max_pixels}"
+        )
+    return image
+
+
+def prepare_image(image, max_dimension):
+    """
+    Apply the EXIF orientation to the pixels, convert them to sRGB if the image has a color profile and downscale the image to fit in max_dimension x max_dimension pixels. Return the prepared image along with the color profile it must be saved with, if any. EXIF and the rest of metadata aren't saved, as the image is saved without passing them.
+    """
+    image = ImageOps.exif_transpose(image)
+    icc_profile = image.info.get("icc_profile")
+    if icc_profile and image.mode in ["RGB", "RGBA"]:
+        try:
+            image = ImageCms.profileToProfile(
+                image, BytesIO(icc_profile), SRGB_PROFILE, outputMode=image.mode
+            )
+            icc_profile = None  ## Images without color profile are displayed as sRGB
+            image.info.pop(
+                "icc_profile", None
+            )  ## Otherwise, some encoders would still save it
+        except ImageCms.PyCMSError:  ## Unusable profile, it's kept as is
+            pass
+    image.thumbnail((max_dimension, max_dimension))
+    return image, icc_profile
+
+
+def save_image(image, destination_path, image_format, icc_profile, **options):
+    if icc_profile:
+        options["icc_profile"] = icc_profile
+    image.save(destination_path, format=image_format, **options)
+
+
+def normalize_image(source_path, destination_path, max_dimension, max_pixels):
+    with open_image(source_path, max_pixels) as image:
+        image_format = (
+            "JPEG" if image.format == "MPO" else image.format
+        )  ## Phone cameras may produce MPO files, JPEG images with extra frames
+        image, icc_profile = prepare_image(image, max_dimension)
+        save_image(
+            image,
+            destination_path,
+            image_format,
+            icc_profile,
+            **ORIGINAL_SAVE_OPTIONS.get(image_format, {}),
+        )
+
+
+def encode_webp(source_path, destination_path, max_pixels, max_dimension, options):
+    with open_image(source_path, max_pixels) as image:
+        image, icc_profile = prepare_image(image, max_dimension)
+        save_image(image, destination_path, "WEBP", icc_profile, **options)
+
+
+def render_rendition(source_path, destination_path, size, image_format, max_pixels):
+    with open_image(source_path, max_pixels) as image:
+        image, icc_profile = prepare_image(image, size)
+        if image_format == "jpeg" and image.mode not in ["RGB", "L"]:
+            image = image.convert("RGB")
+        save_image(image, destination_path, image_format.upper(), icc_profile)
+
+
+def _timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+class ImageProcessingPool:
+    """
+    Process pool running the image processing jobs, so the CPU and memory they take are bounded by the number of workers (PROFILE_IMAGE_WORKERS, the number of cores by default) instead of by the concurrency of the web server. At most PROFILE_IMAGE_QUEUE_SIZE jobs of each web process are running or waiting for a worker; further jobs wait up to PROFILE_IMAGE_QUEUE_TIMEOUT seconds for room and are then rejected. With PROFILE_IMAGE_WORKERS = 0, jobs run in the calling thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+        self._queue_depth = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._encode_time = 0.0
+        self._max_encode_time = 0.0
+
+    def _get_slots(self):
+        with self._lock:
+            if self._slots is None:
+                self._slots = threading.BoundedSemaphore(
+                    settings.PROFILE_IMAGE_QUEUE_SIZE
+                )
+            return self._slots
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    settings.PROFILE_IMAGE_WORKERS or os.cpu_count(),
+                    initializer=django.setup,  ## Jobs are imported from extended_accounts_api, which requires Django to be set up
+                )
+            return self._executor
+
+    def run(self, function, *args):
+        """
+        Run the job, waiting for its result.
+        """
+        slots = self._get_slots()
+        if not slots.acquire(timeout=settings.PROFILE_IMAGE_QUEUE_TIMEOUT):
+            with self._lock:
+                self._rejected += 1
+            raise ImageProcessingUnavailable
+        with self._lock:
+            self._queue_depth += 1
+        try:
+            if settings.PROFILE_IMAGE_WORKERS == 0:
+                result, encode_time = _timed(function, *args)
+            else:
+                executor = self._get_executor()
+                try:
+                    result, encode_time = executor.submit(
+                        _timed, function, *args
+                    ).result()
+                except (
+                    BrokenProcessPool
+                ):  ## A worker died (killed by the OOM killer...), the pool is replaced for the next jobs
+                    with self._lock:
+                        if self._executor is executor:
+                            self._executor = None
+                    raise
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        else:
+            with self._lock:
+                self._completed += 1
+                self._encode_time += encode_time
+                self._max_encode_time = max(self._max_encode_time, encode_time)
+            return result
+        finally:
+            with self._lock:
+                self._queue_depth -= 1
+            slots.release()
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "queue_depth": self._queue_depth,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "average_encode_time": (
+                    self._encode_time / self._completed if self._completed else 0.0
+                ),
+                "max_encode_time": self._max_encode_time,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor, self._slots = self._executor, None, None
+        if executor is not None:
+            executor.shutdown()
+
+
+image_processing_pool = ImageProcessingPool()
+
+
+@contextmanager
+def local_path(file):
+    """
+    Path of the given file in the local disk, copying it into a temporary file if it isn't there, so worker processes can read it without passing its content around.
+    """
+    if hasattr(file, "temporary_file_path"):
+        yield file.temporary_file_path()
+        return
+    with tempfile.NamedTemporaryFile() as copy:
+        for chunk in file.chunks():
+            copy.write(chunk)
+        copy.flush()
+        yield copy.name
+
+
+def run_profile_image_job(function, *args):
+    try:
+        return image_processing_pool.run(function, *args)
+    except Image.DecompressionBombError:
+        raise serializers.ValidationError(
+            {"profile_image": ["The image has too many pixels"]}
+        )
+
+
+def normalize_profile_image(content):
+    """
+    Return a temporary file with the given image normalized through the image processing pool: oriented, downscaled to PROFILE_IMAGE_MAX_DIMENSION and without metadata.
+    """
+    normalized = tempfile.NamedTemporaryFile()
+    try:
+        with local_path(content) as source_path:
+            run_profile_image_job(
+                normalize_image,
+                source_path,
+                normalized.name,
+                settings.PROFILE_IMAGE_MAX_DIMENSION,
+                settings.PROFILE_IMAGE_MAX_PIXELS,
+            )
+    except BaseException:
+        normalized.close()
+        raise
+    return File(normalized, name=content.name)
+
+
+def store_webp_rendition(storage, source, webp_name):
+    """
+    Encode the WebP rendition of the given image through the image processing pool and save it into the storage.
+    """
+    with local_path(source) as source_path:
+        with tempfile.NamedTemporaryFile(suffix=".webp") as webp_image:
+            run_profile_image_job(
+                encode_webp,
+                source_path,
+                webp_image.name,
+                settings.PROFILE_IMAGE_MAX_PIXELS,
+                settings.PROFILE_IMAGE_MAX_DIMENSION,
+                settings.PROFILE_IMAGE_WEBP_OPTIONS,
+            )
+            storage.save(webp_name, File(webp_image, name=webp_name))
@@ -0,0 +1,105 @@
+from django.conf import settings
+from django.contrib.auth.models import update_last_login
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+from extended_accounts_api.models import AccountModel as Account
+import atexit, logging, threading, time
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_pending_logins = (
+    {}
+)  ## Account pk: last login, so repeated logins of an account are written once
+_oldest_pending = None
+
+
+def record_last_login(sender, user, **kwargs):
+    """
+    Receiver of user_logged_in replacing Django's update_last_login. If LAST_LOGIN_WRITE_BEHIND is set, the login is kept in memory and written along with the rest of logins of the process in a single UPDATE, at the end of the first request happening LAST_LOGIN_MAX_STALENESS seconds after the oldest pending login, as soon as LAST_LOGIN_BATCH_SIZE accounts are pending or when the process exits. A failed write doesn't fail the login: it's logged and the logins are kept for the next flush. The saved account isn't dropped from the account cache either, as last_login isn't cached.
+    """
+    if not settings.LAST_LOGIN_WRITE_BEHIND:
+        return update_last_login(sender, user, **kwargs)
+    global _oldest_pending
+    user.last_login = timezone.now()
+    with _lock:
+        _pending_logins[user.pk] = user.last_login
+        if _oldest_pending is None:
+            _oldest_pending = time.monotonic()
+        full = len(_pending_logins) >= settings.LAST_LOGIN_BATCH_SIZE
+    if full:
+        try:
+            with transaction.atomic():  ## A savepoint if the login is part of a transaction, so a failed write doesn't break it
+                flush_last_logins()
+        except Exception:
+            logger.exception("Couldn't write the pending logins")
+
+
+def flush_last_logins(stale_only=False):
+    """
+    Write the pending logins in a single UPDATE. With stale_only, only if the oldest of them has been pending for LAST_LOGIN_MAX_STALENESS seconds.
+    """
+    global _oldest_pending
+    with _lock:
+        if _oldest_pending is None or (
+            stale_only
+            and time.monotonic() - _oldest_pending < settings.LAST_LOGIN_MAX_STALENESS
+        ):
+            return
+        logins = dict(_pending_logins)
+        _pending_logins.clear()
+        _oldest_pending = None
+    try:
+        Account.objects.filter(pk__in=logins).update(
+            last_login=Case(
+                *(
+                    When(
+                        Q(pk=pk)
+                        & (
+                            Q(last_login__isnull=True) | Q(last_login__lt=last_login)
+                        ),  ## Another process may have written a later login
+                        then=Value(last_login),
+                    )
+                    for pk, last_login in logins.items()
+                ),
+                default=F("last_login"),
+            )
+        )
+    except (
+        Exception
+    ):  ## The ddbb is unavailable, the logins are written by the next flush
+        with _lock:
+            for pk, last_login in logins.items():
+                _pending_logins.setdefault(pk, last_login)
+            if _oldest_pending is None:
+                _oldest_pending = time.monotonic()
+        raise
+
+
+def flush_account_last_login(account):
+    """
+    Write the pending login of the account, if any, and update the given instance. PasswordResetTokenGenerator hashes last_login, so a reset token made before the login is written would be invalidated by the flush.
+    """
+    global _oldest_pending
+    with _lock:
+        last_login = _pending_logins.pop(account.pk, None)
+        if not _pending_logins:
+            _oldest_pending = None
+    if last_login is None:
+        return
+    try:
+        Account.objects.filter(
+            Q(pk=account.pk)
+            & (Q(last_login__isnull=True) | Q(last_login__lt=last_login))
+        ).update(last_login=last_login)
+    except Exception:  ## Written by the next flush
+        with _lock:
+            _pending_logins.setdefault(account.pk, last_login)
+            if _oldest_pending is None:
+                _oldest_pending = time.monotonic()
+        raise
+    account.refresh_from_db(fields=["last_login"])
+
+
+atexit.register(flush_last_logins)
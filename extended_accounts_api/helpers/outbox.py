@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+from extended_accounts_api.models import OutboxEventModel as OutboxEvent
+from celery import current_app
+import json, urllib.request
+
+
+def record_event(event, account):
+    """
+    Write an account lifecycle event to the outbox. It must be called inside the transaction changing the account, so the event is only published if the change is committed.
+    """
+    OutboxEvent.objects.create(
+        event=event, account_id=account.pk, username=account.username
+    )
+
+
+def serialize_event(outbox_event):
+    return {
+        "id": outbox_event.id,  ## Events are delivered at least once, consumers may use the id to discard duplicates
+        "event": outbox_event.event,
+        "account_id": outbox_event.account_id,
+        "username": outbox_event.username,
+        "created_at": outbox_event.created_at.isoformat(),
+    }
+
+
+def celery_sink(events):
+    """
+    Publish each event as a message for the OUTBOX_CELERY_TASK task, which may be defined by any Celery worker consuming the broker.
+    """
+    with current_app.producer_or_acquire() as producer:  ## A single broker connection for the whole batch
+        for event in events:
+            current_app.send_task(
+                settings.OUTBOX_CELERY_TASK, args=[event], producer=producer
+            )
+
+
+def webhook_sink(events):
+    """
+    POST the events as a JSON list to OUTBOX_WEBHOOK_URL, a single request per batch.
+    """
+    request = urllib.request.Request(
+        settings.OUTBOX_WEBHOOK_URL,
+        data=json.dumps(events).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=settings.OUTBOX_WEBHOOK_TIMEOUT):
+        pass  ## Any status other than 2xx raises an error, so the batch is published again
+
+
+def relay_outbox_events(batch_size=None):
+    """
+    Publish the pending events to OUTBOX_SINK in batches, in the order they were written. A batch is removed from the outbox only once the sink has accepted it, so if publishing fails it will be published again by the next run. Concurrent relays skip the events locked by each other in the databases supporting it. Return the number of published events.
+    """
+    sink = import_string(settings.OUTBOX_SINK)
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    published = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                OutboxEvent.objects.select_for_update(skip_locked=True).order_by("id")[
+                    :batch_size
+                ]
+            )
+            if not batch:
+                return published
+            sink([serialize_event(outbox_event) for outbox_event in batch])
+            OutboxEvent.objects.filter(
+                id__in=[outbox_event.id for outbox_event in batch]
+            ).delete()
+        published += len(batch)
+        if len(batch) < batch_size:
+            return published
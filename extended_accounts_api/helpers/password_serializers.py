@@ -1,6 +1,11 @@
 from django.contrib.auth.password_validation import validate_password
+from django.db import transaction
 from rest_framework import serializers
-from extended_accounts_api.models import AccountModel as Account
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    OutboxEventModel as OutboxEvent,
+)
+from .outbox import record_event
 
 
 class ResetPasswordRequestSerializer(serializers.Serializer):
@@ -32,7 +37,9 @@ class NewPasswordSerializer(serializers.ModelSerializer):
 
     def update(self, instance, validated_data):
         instance.set_password(validated_data["password"])
-        instance.save()
+        with transaction.atomic():
+            instance.save()
+            record_event(OutboxEvent.PASSWORD_CHANGED, instance)
         return instance
 
     def validate(self, attrs):
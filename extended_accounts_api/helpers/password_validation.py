@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.contrib.auth.password_validation import CommonPasswordValidator
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext as _
+from .bloom_filter import BloomFilter
+import hashlib, logging, os, threading
+
+logger = logging.getLogger(__name__)
+
+_filters = {}  ## Path: ((inode, modification time), filter)
+_filters_lock = threading.Lock()
+_common_validator = None  ## Fallback until the filter is compiled
+
+
+def password_key(password):
+    """
+    Key of a password in the filter: its uppercase SHA-1 hex digest, the format of the Have I Been Pwned password dumps.
+    """
+    return hashlib.sha1(password.encode()).hexdigest().upper()
+
+
+def load_password_filter(path):
+    """
+    The memory-mapped filter at the given path, or None if it hasn't been compiled or can't be loaded (unreadable, truncated...), which is logged. It's mapped once per process, and again whenever the file's inode or modification time change, so a filter compiled or replaced while the process runs is picked up by its next validation.
+    """
+    try:
+        stat = os.stat(path)
+        version = (stat.st_ino, stat.st_mtime_ns)
+    except FileNotFoundError:
+        version = None
+    with _filters_lock:
+        if path not in _filters or _filters[path][0] != version:
+            try:
+                _filters[path] = (version, BloomFilter.load(path) if version else None)
+            except (
+                FileNotFoundError
+            ):  ## Replaced since the stat, mapped on the next call
+                _filters[path] = (None, None)
+            except (
+                Exception
+            ):  ## Validations fall back to the common passwords list instead of failing, until the file is replaced
+                logger.warning(
+                    "Couldn't load the breached passwords filter %s",
+                    path,
+                    exc_info=True,
+                )
+                _filters[path] = (version, None)
+        return _filters[path][1]
+
+
+def common_password_validator():
+    """
+    Django's CommonPasswordValidator, created once per process: creating it decompresses and parses its list of 20k passwords.
+    """
+    global _common_validator
+    with _filters_lock:
+        if _common_validator is None:
+            _common_validator = CommonPasswordValidator()
+        return _common_validator
+
+
+class BreachedPasswordValidator:
+    """
+    Reject the passwords found in the breached passwords filter compiled by the compile_password_filter command (PASSWORD_FILTER_PATH by default). The filter is memory-mapped, so all the worker processes share a single copy, and a lookup takes a few hash computations. Until the filter is compiled, it falls back to Django's CommonPasswordValidator.
+    """
+
+    def __init__(self, filter_path=None):
+        self.filter_path = str(filter_path or settings.PASSWORD_FILTER_PATH)
+
+    def validate(self, password, user=None):
+        password_filter = load_password_filter(self.filter_path)
+        if password_filter is None:
+            return common_password_validator().validate(password, user)
+        if (
+            password_key(password) in password_filter
+            or password_key(password.lower().strip()) in password_filter
+        ):  ## Plain lists are compiled lowercase, as Django's common passwords list
+            raise ValidationError(
+                _("This password has appeared in a data breach."),
+                code="password_breached",
+            )
+
+    def get_help_text(self):
+        return _(
+            "Your password can’t be a password that has appeared in a data breach."
+        )
@@ -0,0 +1,51 @@
+from django.core import signing
+from django.urls import reverse
+from django.utils.crypto import constant_time_compare
+
+signer = signing.Signer(salt="extended_accounts_api.profile_image")
+
+
+def profile_image_url(image_name, request=None, size=None, image_format="webp"):
+    """
+    URL of the WebP rendition of a profile image, or of a rendition scaled to the given size (one of PROFILE_IMAGE_RENDITION_SIZES) if any. Images are named after the digest of their content, so the URL changes whenever the image does and it can be cached forever. The URL is signed, so only the images issued by the API are served; the signature is the same for every rendition of an image. If a request is given, the URL is fully qualified.
+    """
+    if not image_name:
+        return None
+    if size is None:
+        url = reverse(
+            "extended_accounts_api:profile_image", kwargs={"image_name": image_name}
+        )
+    else:
+        url = reverse(
+            "extended_accounts_api:profile_image_rendition",
+            kwargs={
+                "image_name": image_name,
+                "size": size,
+                "image_format": image_format,
+            },
+        )
+    url += f"?signature={signer.signature(image_name)}"
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def profile_image_url_builder(request=None):
+    """
+    Function building the same URLs as profile_image_url for the WebP renditions, resolving the URL prefix only once. For representing many accounts, as resolving the URL takes most of the time of representing an account.
+    """
+    placeholder = "0.webp"
+    prefix = reverse(
+        "extended_accounts_api:profile_image", kwargs={"image_name": "0"}
+    ).removesuffix(placeholder)
+    if request is not None:
+        prefix = request.build_absolute_uri(prefix)
+
+    def build(image_name):
+        if not image_name:
+            return None
+        return f"{prefix}{image_name}.webp?signature={signer.signature(image_name)}"
+
+    return build
+
+
+def check_profile_image_signature(image_name, signature):
+    return constant_time_compare(signer.signature(image_name), signature or "")
@@ -0,0 +1,219 @@
+from django.conf import settings
+from django.db import transaction, IntegrityError
+from django.db.models import F
+from extended_accounts_api.models import (
+    ProfileModel as Profile,
+    ProfileImageBlobModel as ProfileImageBlob,
+)
+from .rendition_cache import RenditionCache
+from .image_processing import (
+    image_processing_pool,
+    local_path,
+    render_rendition,
+    store_webp_rendition,
+)
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_deferred_deletions = ContextVar("deferred_profile_image_deletions", default=None)
+
+
+def profile_image_storage():
+    return Profile._meta.get_field("profile_image").storage
+
+
+def profile_image_files(digest, extension):
+    """
+    Names of the stored files of a profile image: the original image and its WebP rendition.
+    """
+    return {f"{digest}.{extension}", f"{digest}.webp"}
+
+
+def delete_profile_images(file_names):
+    """
+    Delete the given files through the profile images storage, unless their image is referenced again.
+    """
+    delete_profile_image_files(unreferenced_profile_images(file_names))
+
+
+def unreferenced_profile_images(file_names):
+    file_names = {name for name in file_names if name}
+    referenced = set(
+        ProfileImageBlob.objects.filter(
+            digest__in={name.split(".")[0] for name in file_names}
+        ).values_list("digest", flat=True)
+    )  ## An image may be referenced again before a deferred deletion runs
+    return sorted(name for name in file_names if name.split(".")[0] not in referenced)
+
+
+def delete_profile_image_files(file_names):
+    """
+    Delete the given files through the profile images storage, along with their cached renditions. Storages able to delete many files per request (such as extended_accounts_api.helpers.S3Storage) delete them all at once. It doesn't touch the database, so it may run in any thread.
+    """
+    if not file_names:
+        return
+    _ignore_errors(
+        profile_image_rendition_cache().delete,
+        [
+            rendition_name(digest, size, image_format)
+            for digest in {name.split(".")[0] for name in file_names}
+            for size in settings.PROFILE_IMAGE_RENDITION_SIZES
+            for image_format in settings.PROFILE_IMAGE_RENDITION_FORMATS
+        ],
+    )  ## Renditions cached by other nodes are evicted as they're no longer requested
+    storage = profile_image_storage()
+    if hasattr(storage, "delete_many"):
+        _ignore_errors(storage.delete_many, file_names)
+    else:
+        for file_name in file_names:
+            _ignore_errors(storage.delete, file_name)
+
+
+def _ignore_errors(function, *args):
+    try:
+        function(*args)
+    except (
+        Exception
+    ):  ## Failing to remove a file mustn't block the operation that released the image
+        pass
+
+
+def profile_image_rendition_cache():
+    return RenditionCache(
+        settings.PROFILE_IMAGE_RENDITION_CACHE_DIR,
+        settings.PROFILE_IMAGE_RENDITION_CACHE_SIZE,
+    )
+
+
+def rendition_name(image_name, size, image_format):
+    return f"{image_name}_{size}.{image_format}"
+
+
+def render_profile_image(image_name, size, image_format):
+    """
+    Return the path of a rendition of a profile image scaled to fit in size x size pixels. Renditions are generated from the original image by the image processing pool when they're first requested, and kept in the rendition cache of the node.
+    """
+
+    def render(path):
+        extension = (
+            ProfileImageBlob.objects.filter(digest=image_name)
+            .values_list("extension", flat=True)
+            .first()
+            or "webp"  ## The original of images stored before they were content addressed is unknown
+        )
+        with profile_image_storage().open(f"{image_name}.{extension}") as source:
+            with local_path(source) as source_path:
+                image_processing_pool.run(
+                    render_rendition,
+                    source_path,
+                    path,
+                    size,
+                    image_format,
+                    settings.PROFILE_IMAGE_MAX_PIXELS,
+                )
+
+    return profile_image_rendition_cache().get_or_create(
+        rendition_name(image_name, size, image_format), render
+    )
+
+
+def acquire_profile_image(image_name):
+    """
+    Add a reference to a stored profile image. Return whether the image was already referenced, in which case its renditions are already stored as well.
+    """
+    digest, extension = image_name.split(".", 1)
+    if ProfileImageBlob.objects.filter(digest=digest).update(
+        references=F("references") + 1
+    ):
+        return True
+    try:
+        with transaction.atomic():
+            ProfileImageBlob.objects.create(
+                digest=digest, extension=extension, references=1
+            )
+    except IntegrityError:  ## The same image has been concurrently uploaded
+        ProfileImageBlob.objects.filter(digest=digest).update(
+            references=F("references") + 1
+        )
+        return True
+    return False
+
+
+def store_uploaded_profile_image(profile):
+    """
+    Store the image uploaded to the profile, if any, along with its WebP rendition, leaving the profile with the name of the image without extension as it's saved in the ddbb. Return whether there was an uploaded image, in which case the profile has to be saved.
+    """
+    from .tasks import (
+        encode_profile_image,
+    )  ## Imported here because the tasks import this module
+
+    profile_image = profile.profile_image
+    if not profile_image:
+        return False
+    if not profile_image._committed:  ## The profile hasn't been saved yet
+        profile_image.save(profile_image.name, profile_image.file, save=False)
+        profile.profile_image = profile_image  ## Saving the file replaces the field file of the profile by its name, the field file is kept as it holds the stored image
+    if (
+        "." not in profile_image.name
+    ):  ## If '.' in profile_image.name, it means the image has been updated since in the database the name is stored without extension
+        return False
+    ## We save the image in webp format through the storage, unless an identical image was already stored (images are named after the digest of their content)
+    acquire_profile_image(profile_image.name)
+    storage = profile_image.storage
+    image_name = profile_image.name.split(".")[0]
+    webp_name = f"{image_name}.webp"
+    if not storage.exists(webp_name):
+        if settings.PROFILE_IMAGE_ASYNC_ENCODING:
+            transaction.on_commit(lambda: encode_profile_image.delay(image_name))
+        else:
+            store_webp_rendition(storage, profile_image.file, webp_name)
+    profile_image.name = image_name
+    return True
+
+
+def release_profile_image(image_name):
+    """
+    Remove a reference to a stored profile image, deleting its files if it's no longer referenced. Images without reference count (stored before images were content addressed) are deleted straight away, looking their files up in the storage.
+    """
+    digest = image_name.split(".")[0]
+    extension = (
+        ProfileImageBlob.objects.filter(digest=digest)
+        .values_list("extension", flat=True)
+        .first()
+    )
+    if extension is None:
+        try:
+            file_names = [
+                file_name
+                for file_name in profile_image_storage().listdir("")[1]
+                if file_name.split(".")[0] == digest
+            ]
+        except FileNotFoundError:
+            return
+    else:
+        ProfileImageBlob.objects.filter(digest=digest).update(
+            references=F("references") - 1
+        )
+        if not ProfileImageBlob.objects.filter(digest=digest, references=0).delete()[0]:
+            return
+        file_names = profile_image_files(digest, extension)
+    deferred_deletions = _deferred_deletions.get()
+    if deferred_deletions is None:
+        delete_profile_images(file_names)
+    else:
+        deferred_deletions.update(file_names)
+
+
+@contextmanager
+def defer_profile_image_deletion():
+    """
+    Collect the files of the profile images released inside the block and delete all of them at once when the ongoing transaction is committed. Useful when many profiles are deleted at once.
+    """
+    deferred_deletions = set()
+    token = _deferred_deletions.set(deferred_deletions)
+    try:
+        yield deferred_deletions
+    finally:
+        _deferred_deletions.reset(token)
+    if deferred_deletions:
+        transaction.on_commit(lambda: delete_profile_images(deferred_deletions))
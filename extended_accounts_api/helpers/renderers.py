@@ -0,0 +1,76 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  ## Optional dependency, the stdlib json module is used without it
+    orjson = None
+try:
+    import msgpack
+except ImportError:  ## Optional dependency, MessagePack isn't offered without it
+    msgpack = None
+
+## Fallback for the types the encoders don't know (lazy translations, decimals, UUIDs...), encoded as DRF's JSONRenderer does
+encode_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer producing the same documents with orjson, which encodes them several times faster. Indented responses (requested with "Accept: application/json; indent=4") and processes without orjson fall back to JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(
+            data,
+            default=encode_default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+
+
+class ORJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as error:
+            raise ParseError(f"JSON parse error - {error}")
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Render responses as MessagePack for the clients sending "Accept: application/msgpack". Values without a MessagePack type (dates, decimals...) are encoded as they're in JSON.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(
+                stream.read(),
+                raw=False,
+                max_buffer_size=settings.DATA_UPLOAD_MAX_MEMORY_SIZE or 0,
+            )
+        except (ValueError, msgpack.UnpackException) as error:
+            raise ParseError(f"MessagePack parse error - {error}")
@@ -0,0 +1,102 @@
+from contextlib import contextmanager
+import fcntl, os, tempfile, zlib
+
+LOCK_STRIPES = (
+    256  ## Files are locked by stripes, so the number of lock files is bounded
+)
+EVICTION_TARGET = (
+    0.9  ## Eviction frees space until the cache is below this fraction of its size
+)
+
+
+class RenditionCache:
+    """
+    Size bounded disk cache of generated files. Files are evicted in least recently used order, as every hit refreshes their modification time. Concurrent misses of the same file, even from different processes, are serialized with file locks, so the file is generated only once and the rest of requests are served the generated file.
+    """
+
+    def __init__(self, directory, max_size):
+        self.directory = directory
+        self.max_size = max_size
+
+    def path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def get_or_create(self, key, create):
+        """
+        Return the path of the cached file, calling create with the path where it must be written to generate it if it's not cached yet.
+        """
+        path = self.get(key)
+        if path is not None:
+            return path
+        with self.lock(f"{zlib.crc32(key.encode()) % LOCK_STRIPES}.lock"):
+            path = self.get(key)
+            if path is not None:  ## Generated while waiting for the lock
+                return path
+            descriptor, temporary_path = tempfile.mkstemp(
+                dir=self.directory, prefix=".", suffix=".tmp"
+            )
+            os.close(descriptor)
+            try:
+                create(temporary_path)
+                os.replace(
+                    temporary_path, self.path(key)
+                )  ## Atomic, so a partially written file is never served
+            except BaseException:
+                os.remove(temporary_path)
+                raise
+        self.evict()
+        return self.path(key)
+
+    def delete(self, keys):
+        for key in keys:
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                pass
+
+    def evict(self):
+        with self.lock("evict.lock", blocking=False) as locked:
+            if not locked:  ## Another process is already evicting
+                return
+            entries = []
+            with os.scandir(self.directory) as scan:
+                for entry in scan:
+                    if entry.is_file() and not entry.name.startswith("."):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+            size = sum(entry[1] for entry in entries)
+            if size <= self.max_size:
+                return
+            for _, file_size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                size -= file_size
+                if size <= self.max_size * EVICTION_TARGET:
+                    return
+
+    @contextmanager
+    def lock(self, name, blocking=True):
+        lock_directory = os.path.join(self.directory, "locks")
+        os.makedirs(lock_directory, exist_ok=True)
+        with open(os.path.join(lock_directory, name), "a") as lock_file:
+            try:
+                fcntl.flock(
+                    lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB)
+                )
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,303 @@
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import Storage
+from django.utils.deconstruct import deconstructible
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http.client import HTTPConnection, HTTPSConnection
+from urllib.parse import urlsplit, quote
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+import base64, hashlib, hmac, mimetypes, tempfile
+
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+SIGNED_HEADERS = ["host", "x-amz-content-sha256", "x-amz-date"]
+DELETE_BATCH_SIZE = 1000  ## Maximum number of keys accepted by a DeleteObjects request
+
+
+class S3StorageError(Exception):
+    def __init__(self, status, body=b""):
+        super().__init__(f"S3 request failed with status {status}: {body[:200]!r}")
+        self.status = status
+
+
+def _findall(element, tag):
+    ## S3 responses are namespaced, but not every S3 compatible service uses the same namespace
+    return [child for child in element.iter() if child.tag.rsplit("}", 1)[-1] == tag]
+
+
+def _findtext(element, tag):
+    found = _findall(element, tag)
+    return found[0].text if found else None
+
+
+@deconstructible(path="extended_accounts_api.helpers.S3Storage")
+class S3Storage(Storage):
+    """
+    Storage for S3 compatible services (AWS S3, MinIO...) using their REST API with requests signed with AWS Signature Version 4, so it doesn't require any additional dependency. Objects are addressed path style (<endpoint_url>/<bucket>/<key>) and streamed from and to the service; files bigger than multipart_threshold are uploaded in parts of multipart_chunk_size bytes, max_workers parts at a time.
+    """
+
+    def __init__(
+        self,
+        bucket,
+        endpoint_url,
+        access_key,
+        secret_key,
+        region="us-east-1",
+        location="",
+        base_url=None,
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunk_size=8 * 1024 * 1024,  ## AWS S3 requires at least 5 MB
+        max_workers=4,
+        timeout=30,
+    ):
+        endpoint = urlsplit(endpoint_url)
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.location = location.strip("/")
+        self.base_url = (base_url or f"{endpoint_url.rstrip('/')}/{bucket}").rstrip("/")
+        self.multipart_threshold = multipart_threshold
+        self.multipart_chunk_size = multipart_chunk_size
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._connection_class = (
+            HTTPSConnection if endpoint.scheme == "https" else HTTPConnection
+        )
+        self._host = endpoint.netloc
+        self._bucket_path = f"{endpoint.path.rstrip('/')}/{quote(bucket)}"
+
+    def _key(self, name):
+        return "/".join(
+            part
+            for part in [self.location, name.replace("\\", "/").lstrip("/")]
+            if part
+        )
+
+    def _authorization(self, method, path, query_string, headers):
+        date = headers["x-amz-date"]
+        scope = f"{date[:8]}/{self.region}/s3/aws4_request"
+        canonical_request = "\n".join(
+            [
+                method,
+                path,
+                query_string,
+                "".join(f"{header}:{headers[header]}\n" for header in SIGNED_HEADERS),
+                ";".join(SIGNED_HEADERS),
+                UNSIGNED_PAYLOAD,
+            ]
+        )
+        string_to_sign = "\n".join(
+            [
+                "AWS4-HMAC-SHA256",
+                date,
+                scope,
+                hashlib.sha256(canonical_request.encode()).hexdigest(),
+            ]
+        )
+        signing_key = ("AWS4" + self.secret_key).encode()
+        for part in scope.split("/"):
+            signing_key = hmac.new(signing_key, part.encode(), hashlib.sha256).digest()
+        signature = hmac.new(
+            signing_key, string_to_sign.encode(), hashlib.sha256
+        ).hexdigest()
+        return f"AWS4-HMAC-SHA256 Credential={self.access_key}/{scope}, SignedHeaders={';'.join(SIGNED_HEADERS)}, Signature={signature}"
+
+    def _request(
+        self, method, name=None, query=None, body=None, headers=None, stream=None
+    ):
+        """
+        Send a signed request for the given object (or for the bucket if name is None) and return the response along with its body. If stream is given, the body is written into it by chunks instead of being returned.
+        """
+        path = self._bucket_path + (
+            "/" + quote(self._key(name)) if name is not None else ""
+        )
+        query_string = "&".join(
+            f"{quote(key, safe='')}={quote(str(value), safe='')}"
+            for key, value in sorted((query or {}).items())
+        )
+        headers = {
+            **(headers or {}),
+            "host": self._host,
+            "x-amz-content-sha256": UNSIGNED_PAYLOAD,
+            "x-amz-date": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+        }
+        headers["Authorization"] = self._authorization(
+            method, path, query_string, headers
+        )
+        connection = self._connection_class(self._host, timeout=self.timeout)
+        try:
+            connection.request(
+                method,
+                path + ("?" + query_string if query_string else ""),
+                body=body,
+                headers=headers,
+            )
+            response = connection.getresponse()
+            if response.status == 404:
+                response.read()
+                raise FileNotFoundError(name)
+            if response.status >= 300:
+                raise S3StorageError(response.status, response.read())
+            if stream is None:
+                return response, response.read()
+            while chunk := response.read(64 * 1024):
+                stream.write(chunk)
+            return response, b""
+        finally:
+            connection.close()
+
+    def _open(self, name, mode="rb"):
+        file = tempfile.SpooledTemporaryFile(
+            max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+        )  ## Big files are spooled to disk instead of being kept in memory
+        try:
+            self._request("GET", name, stream=file)
+        except Exception:
+            file.close()
+            raise
+        file.seek(0)
+        return File(file, name=name)
+
+    def _save(self, name, content):
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        content.seek(0)
+        size = content.size
+        if size is not None and size <= self.multipart_threshold:
+            self._request(
+                "PUT",
+                name,
+                body=content,  ## Streamed by http.client
+                headers={"Content-Type": content_type, "Content-Length": str(size)},
+            )
+        else:
+            self._multipart_upload(name, content, content_type)
+        return name
+
+    def _multipart_upload(self, name, content, content_type):
+        _, body = self._request(
+            "POST", name, query={"uploads": ""}, headers={"Content-Type": content_type}
+        )
+        upload_id = _findtext(ElementTree.fromstring(body), "UploadId")
+        etags = {}
+        try:
+            with ThreadPoolExecutor(self.max_workers) as executor:
+                pending = set()
+                part_number = 0
+                while chunk := content.read(self.multipart_chunk_size):
+                    if (
+                        len(pending) >= self.max_workers
+                    ):  ## Only max_workers parts are kept in memory at a time
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        etags.update(future.result() for future in done)
+                    part_number += 1
+                    pending.add(
+                        executor.submit(
+                            self._upload_part, name, upload_id, part_number, chunk
+                        )
+                    )
+                if not part_number:
+                    pending.add(
+                        executor.submit(self._upload_part, name, upload_id, 1, b"")
+                    )
+                etags.update(future.result() for future in pending)
+            parts = "".join(
+                f"<Part><PartNumber>{number}</PartNumber><ETag>{escape(etag)}</ETag></Part>"
+                for number, etag in sorted(etags.items())
+            )
+            _, body = self._request(
+                "POST",
+                name,
+                query={"uploadId": upload_id},
+                body=f"<CompleteMultipartUpload>{parts}</CompleteMultipartUpload>".encode(),
+            )
+            if _findall(
+                ElementTree.fromstring(body), "Code"
+            ):  ## S3 may report an error completing the upload after answering 200
+                raise S3StorageError(200, body)
+        except BaseException:
+            try:
+                self._request("DELETE", name, query={"uploadId": upload_id})
+            except Exception:
+                pass
+            raise
+
+    def _upload_part(self, name, upload_id, part_number, chunk):
+        response, _ = self._request(
+            "PUT",
+            name,
+            query={"partNumber": part_number, "uploadId": upload_id},
+            body=chunk,
+        )
+        return part_number, response.getheader("ETag")
+
+    def delete(self, name):
+        try:
+            self._request("DELETE", name)
+        except FileNotFoundError:
+            pass
+
+    def delete_many(self, names):
+        """
+        Delete the given files with DeleteObjects requests, up to DELETE_BATCH_SIZE files per request.
+        """
+        names = list(names)
+        for start in range(0, len(names), DELETE_BATCH_SIZE):
+            objects = "".join(
+                f"<Object><Key>{escape(self._key(name))}</Key></Object>"
+                for name in names[start : start + DELETE_BATCH_SIZE]
+            )
+            body = f"<Delete><Quiet>true</Quiet>{objects}</Delete>".encode()
+            _, response_body = self._request(
+                "POST",
+                query={"delete": ""},
+                body=body,
+                headers={
+                    "Content-Type": "application/xml",
+                    "Content-MD5": base64.b64encode(
+                        hashlib.md5(body).digest()
+                    ).decode(),
+                },
+            )
+            if _findall(ElementTree.fromstring(response_body), "Error"):
+                raise S3StorageError(200, response_body)
+
+    def exists(self, name):
+        try:
+            self._request("HEAD", name)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def size(self, name):
+        response, _ = self._request("HEAD", name)
+        return int(response.getheader("Content-Length"))
+
+    def get_modified_time(self, name):
+        response, _ = self._request("HEAD", name)
+        return parsedate_to_datetime(response.getheader("Last-Modified"))
+
+    def url(self, name):
+        return f"{self.base_url}/{quote(self._key(name))}"
+
+    def listdir(self, path):
+        prefix = self._key(path)
+        prefix = prefix + "/" if prefix else ""
+        query = {"list-type": "2", "prefix": prefix, "delimiter": "/"}
+        directories, files = [], []
+        while True:
+            _, body = self._request("GET", query=query)
+            root = ElementTree.fromstring(body)
+            directories += [
+                _findtext(common_prefix, "Prefix")[len(prefix) :].rstrip("/")
+                for common_prefix in _findall(root, "CommonPrefixes")
+            ]
+            files += [
+                _findtext(content, "Key")[len(prefix) :]
+                for content in _findall(root, "Contents")
+            ]
+            if _findtext(root, "IsTruncated") != "true":
+                return directories, files
+            query["continuation-token"] = _findtext(root, "NextContinuationToken")
@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY, HASH_SESSION_KEY
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.utils import timezone
+from extended_accounts_api.models import AccountSessionModel as AccountSession
+import time
+
+
+class SessionStore(CachedDBStore):
+    """
+    Cached sessions with write-behind to the ddbb. Sessions are always read from and written to the cache, while the ddbb copy is only refreshed when the session is created, when the authenticated account changes (login, password update...) or when the last write is older than SESSION_WRITE_BEHIND_SECONDS. If the cache loses a session, at most the changes made in that window are lost.
+    The sessions of each account are indexed in AccountSessionModel when the account logs in or out, and the expiry date of the index entry follows the ddbb copy of the session, so they can be listed and revoked without scanning the sessions table.
+    To use it, set SESSION_ENGINE = "extended_accounts_api.helpers.session_store".
+    """
+
+    cache_key_prefix = "extended_accounts_api.session."
+
+    @property
+    def synced_cache_key(self):
+        return self.cache_key + ".synced"
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            super().save(
+                must_create
+            )  ## Creates the session, which calls save again with must_create
+        elif must_create or self.__db_write_due():
+            synced = self._cache.get(self.synced_cache_key)
+            super().save(must_create)
+            self.__index(synced[1][0] if synced else None)
+            self._cache.set(
+                self.synced_cache_key,
+                (time.time(), self.__auth_fingerprint()),
+                self.get_expiry_age(),
+            )
+        else:
+            self._cache.set(self.cache_key, self._session, self.get_expiry_age())
+
+    def delete(self, session_key=None):
+        super().delete(session_key)
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+        self._cache.delete(self.cache_key_prefix + session_key + ".synced")
+        AccountSession.objects.filter(session_key=session_key).delete()
+
+    @classmethod
+    def clear_expired(cls):
+        super().clear_expired()
+        AccountSession.objects.filter(expire_date__lt=timezone.now()).delete()
+
+    def __index(self, synced_account_id):
+        account_id = self._session.get(SESSION_KEY)
+        if account_id is not None:
+            if account_id != synced_account_id:  ## Login
+                AccountSession.objects.update_or_create(
+                    session_key=self.session_key,
+                    defaults={
+                        "account_id": account_id,
+                        "expire_date": self.get_expiry_date(),
+                    },
+                )
+            else:  ## Keeps the index entry alive as long as the session, for clear_expired
+                AccountSession.objects.filter(session_key=self.session_key).update(
+                    expire_date=self.get_expiry_date()
+                )
+        elif synced_account_id is not None:  ## Logout
+            AccountSession.objects.filter(session_key=self.session_key).delete()
+
+    def __auth_fingerprint(self):
+        return (self._session.get(SESSION_KEY), self._session.get(HASH_SESSION_KEY))
+
+    def __db_write_due(self):
+        synced = self._cache.get(self.synced_cache_key)
+        if synced is None:
+            return True
+        synced_at, auth_fingerprint = synced
+        return (
+            auth_fingerprint != self.__auth_fingerprint()
+            or time.time() - synced_at >= settings.SESSION_WRITE_BEHIND_SECONDS
+        )
+
+
+def revoke_account_sessions(account_id, keep_session_key=None):
+    """
+    Log the account out of all its sessions, except the one with keep_session_key if given. The sessions are found in the index of the account, so it takes a single indexed query regardless of the size of the sessions table. Return the number of revoked sessions.
+    """
+    account_sessions = AccountSession.objects.filter(account_id=account_id).exclude(
+        session_key=keep_session_key
+    )
+    session_keys = list(account_sessions.values_list("session_key", flat=True))
+    if not session_keys:
+        return 0
+    caches[settings.SESSION_CACHE_ALIAS].delete_many(
+        [
+            SessionStore.cache_key_prefix + session_key + suffix
+            for session_key in session_keys
+            for suffix in ["", ".synced"]
+        ]
+    )
+    Session.objects.filter(session_key__in=session_keys).delete()
+    AccountSession.objects.filter(session_key__in=session_keys).delete()
+    return len(session_keys)
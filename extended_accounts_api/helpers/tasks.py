@@ -1,4 +1,11 @@
-from extended_accounts_api.models import AccountModel as Account
+from django.db import transaction
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    ProfileImageBlobModel as ProfileImageBlob,
+)
+from .profile_images import profile_image_storage, defer_profile_image_deletion
+from .image_processing import store_webp_rendition
+from .outbox import relay_outbox_events
 from celery import shared_task
 
 
@@ -11,3 +18,36 @@ def delete_unconfirmed_accounts(username):
             account.delete()
     except Account.DoesNotExist:  # If it doesn't exist, there's nothing to do.
         pass
+
+
+# This task is called with the accounts created in a request (or a batch of them) 15 minutes after their creation, deleting those not confirmed. See extended_accounts_api.helpers.unconfirmed_accounts.
+@shared_task
+def delete_unconfirmed_accounts_batch(usernames):
+    accounts = Account.objects.filter(username__in=usernames, is_active=False)
+    with transaction.atomic(), defer_profile_image_deletion():
+        for account in accounts:
+            account.delete()
+
+
+# This task is called by the post_save signal of Profile when PROFILE_IMAGE_ASYNC_ENCODING is enabled, so the WebP rendition of an uploaded image is encoded by the image processing pool of the Celery worker instead of the web server's one.
+@shared_task
+def encode_profile_image(image_name):
+    extension = (
+        ProfileImageBlob.objects.filter(digest=image_name)
+        .values_list("extension", flat=True)
+        .first()
+    )
+    storage = profile_image_storage()
+    webp_name = f"{image_name}.webp"
+    if extension is None or storage.exists(
+        webp_name
+    ):  # The image has been deleted or already encoded in the meantime
+        return
+    with storage.open(f"{image_name}.{extension}") as source:
+        store_webp_rendition(storage, source, webp_name)
+
+
+# This task may be scheduled with Celery beat to publish the account lifecycle events written to the outbox. Alternatively, they may be published by the relay_outbox command.
+@shared_task
+def relay_outbox():
+    return relay_outbox_events()
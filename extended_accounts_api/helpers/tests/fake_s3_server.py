@@ -0,0 +1,229 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from email.utils import formatdate
+from urllib.parse import urlsplit, unquote, parse_qsl
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+import base64, hashlib, hmac, threading, uuid
+
+NAMESPACE = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+
+class FakeS3Server:
+    """
+    Minimal S3 compatible server (a stand-in for MinIO) keeping the objects of a single bucket in memory. It checks the AWS Signature Version 4 of every request, and it supports the requests used by extended_accounts_api.helpers.S3Storage.
+    """
+
+    def __init__(self, bucket="bucket", access_key="access", secret_key="secret"):
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.objects = {}
+        self.uploads = {}
+        self.requests = []  ## (method, key, query) of every request received
+        self.fail_part = None  ## Part number whose upload fails
+        self.max_keys = 1000
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self.endpoint_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def storage_options(self, **options):
+        return {
+            "bucket": self.bucket,
+            "endpoint_url": self.endpoint_url,
+            "access_key": self.access_key,
+            "secret_key": self.secret_key,
+            **options,
+        }
+
+    def signature(self, method, raw_path, raw_query, headers):
+        authorization = headers.get("Authorization", "")
+        credential = authorization.split("Credential=")[-1].split(",")[0]
+        access_key, scope = credential.split("/", 1)
+        signed_headers = authorization.split("SignedHeaders=")[-1].split(",")[0]
+        canonical_request = "\n".join(
+            [
+                method,
+                raw_path,
+                "&".join(sorted(raw_query.split("&"))) if raw_query else "",
+                "".join(
+                    f"{header}:{headers[header].strip()}\n"
+                    for header in signed_headers.split(";")
+                ),
+                signed_headers,
+                headers["x-amz-content-sha256"],
+            ]
+        )
+        string_to_sign = "\n".join(
+            [
+                "AWS4-HMAC-SHA256",
+                headers["x-amz-date"],
+                scope,
+                hashlib.sha256(canonical_request.encode()).hexdigest(),
+            ]
+        )
+        key = ("AWS4" + self.secret_key).encode()
+        for part in scope.split("/"):
+            key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+        return (
+            access_key,
+            hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest(),
+        )
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def respond(self, status, body=b"", headers=None):
+                self.send_response(status)
+                for header, value in (headers or {}).items():
+                    self.send_header(header, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def xml(self, body):
+                self.respond(200, body.encode(), {"Content-Type": "application/xml"})
+
+            def handle_request(self):
+                url = urlsplit(self.path)
+                access_key, signature = fake.signature(
+                    self.command, url.path, url.query, self.headers
+                )
+                if access_key != fake.access_key or not self.headers.get(
+                    "Authorization", ""
+                ).endswith("Signature=" + signature):
+                    return self.respond(
+                        403, b"<Error><Code>SignatureDoesNotMatch</Code></Error>"
+                    )
+                bucket, _, key = unquote(url.path).lstrip("/").partition("/")
+                if bucket != fake.bucket:
+                    return self.respond(404)
+                query = dict(parse_qsl(url.query, keep_blank_values=True))
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                with fake.lock:
+                    fake.requests.append((self.command, key, query))
+                getattr(self, "do_" + self.command.lower() + "_s3")(key, query, body)
+
+            do_GET = do_PUT = do_POST = do_DELETE = do_HEAD = handle_request
+
+            def do_get_s3(self, key, query, body):
+                if key:
+                    if key not in fake.objects:
+                        return self.respond(404)
+                    return self.respond(200, fake.objects[key])
+                prefix, delimiter = query.get("prefix", ""), query.get("delimiter")
+                keys, common_prefixes = [], set()
+                for object_key in sorted(fake.objects):
+                    if not object_key.startswith(prefix):
+                        continue
+                    rest = object_key[len(prefix) :]
+                    if delimiter and delimiter in rest:
+                        common_prefixes.add(
+                            prefix + rest.split(delimiter)[0] + delimiter
+                        )
+                    else:
+                        keys.append(object_key)
+                start = int(query.get("continuation-token", 0))
+                page = keys[start : start + fake.max_keys]
+                truncated = start + fake.max_keys < len(keys)
+                self.xml(
+                    f'<ListBucketResult xmlns="{NAMESPACE}"><Prefix>{escape(prefix)}</Prefix>'
+                    + "".join(
+                        f"<Contents><Key>{escape(key)}</Key></Contents>" for key in page
+                    )
+                    + "".join(
+                        f"<CommonPrefixes><Prefix>{escape(common_prefix)}</Prefix></CommonPrefixes>"
+                        for common_prefix in sorted(common_prefixes)
+                        if not start
+                    )
+                    + f"<IsTruncated>{str(truncated).lower()}</IsTruncated>"
+                    + (
+                        f"<NextContinuationToken>{start + fake.max_keys}</NextContinuationToken>"
+                        if truncated
+                        else ""
+                    )
+                    + "</ListBucketResult>"
+                )
+
+            def do_head_s3(self, key, query, body):
+                if key not in fake.objects:
+                    return self.respond(404)
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(fake.objects[key])))
+                self.send_header("Last-Modified", formatdate(usegmt=True))
+                self.end_headers()
+
+            def do_put_s3(self, key, query, body):
+                if "uploadId" in query:
+                    if query["uploadId"] not in fake.uploads:
+                        return self.respond(404)
+                    if int(query["partNumber"]) == fake.fail_part:
+                        return self.respond(500)
+                    etag = f'"{hashlib.md5(body).hexdigest()}"'
+                    fake.uploads[query["uploadId"]][int(query["partNumber"])] = (
+                        etag,
+                        body,
+                    )
+                    return self.respond(200, headers={"ETag": etag})
+                fake.objects[key] = body
+                self.respond(
+                    200, headers={"ETag": f'"{hashlib.md5(body).hexdigest()}"'}
+                )
+
+            def do_post_s3(self, key, query, body):
+                if "uploads" in query:
+                    upload_id = uuid.uuid4().hex
+                    fake.uploads[upload_id] = {}
+                    return self.xml(
+                        f'<InitiateMultipartUploadResult xmlns="{NAMESPACE}"><UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>'
+                    )
+                if "uploadId" in query:
+                    parts = fake.uploads.pop(query["uploadId"])
+                    requested = [
+                        (
+                            int(part.find("PartNumber").text),
+                            part.find("ETag").text,
+                        )
+                        for part in ElementTree.fromstring(body).iter("Part")
+                    ]
+                    if any(parts[number][0] != etag for number, etag in requested):
+                        return self.respond(400)
+                    fake.objects[key] = b"".join(
+                        parts[number][1] for number, _ in requested
+                    )
+                    return self.xml(
+                        f'<CompleteMultipartUploadResult xmlns="{NAMESPACE}"><Key>{escape(key)}</Key></CompleteMultipartUploadResult>'
+                    )
+                if "delete" in query:
+                    if (
+                        self.headers.get("Content-MD5")
+                        != base64.b64encode(hashlib.md5(body).digest()).decode()
+                    ):
+                        return self.respond(400)
+                    for element in ElementTree.fromstring(body).iter("Key"):
+                        fake.objects.pop(element.text, None)
+                    return self.xml(
+                        f'<DeleteResult xmlns="{NAMESPACE}"></DeleteResult>'
+                    )
+                self.respond(400)
+
+            def do_delete_s3(self, key, query, body):
+                if "uploadId" in query:
+                    fake.uploads.pop(query["uploadId"], None)
+                else:
+                    fake.objects.pop(key, None)
+                self.respond(204)
+
+        return Handler
@@ -0,0 +1,95 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from extended_accounts_api.helpers import (
+    CachedAccountBackend,
+    ReplicaRouter,
+    cache_account,
+    get_account_representations,
+    get_cached_account,
+)
+from extended_accounts_api.models import AccountModel as Account
+from unittest.mock import patch
+
+
+class AccountCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.account = Account.objects.create_user(
+            username="johndoe",
+            password="testpassword",
+            email="johndoe@mail.com",
+            phone_number=123456789,
+            is_active=True,
+        )
+        self.backend = CachedAccountBackend()
+
+    def test_get_cached_account(self):
+        self.assertIsNone(get_cached_account(self.account.pk))
+        cache_account(self.account)
+        with self.assertNumQueries(0):
+            account = get_cached_account(self.account.pk)
+            self.assertEqual(account, self.account)
+            self.assertEqual(account.username, self.account.username)
+            self.assertTrue(account.is_active)
+            self.assertEqual(
+                account.get_session_auth_hash(), self.account.get_session_auth_hash()
+            )
+        self.assertEqual(
+            account.get_deferred_fields(), {"password", "last_login", "email"}
+        )
+
+    def test_saving_cached_account_does_not_overwrite_password(self):
+        cache_account(self.account)
+        account = get_cached_account(self.account.pk)
+        account.username = "jdoe"
+        account.save()
+        account = Account.objects.get(pk=self.account.pk)
+        self.assertEqual(account.username, "jdoe")
+        self.assertTrue(account.check_password("testpassword"))
+
+    def test_backend_get_user_uses_cache(self):
+        with self.assertNumQueries(
+            1
+        ):  ## Cache miss, the account is loaded from the ddbb and cached
+            self.assertEqual(self.backend.get_user(self.account.pk), self.account)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                self.backend.get_user(str(self.account.pk)), self.account
+            )  ## The session stores the pk as a string
+
+    def test_backend_get_user_inactive_account(self):
+        cache_account(self.account)
+        Account.objects.filter(pk=self.account.pk).update(is_active=False)
+        cache_account(Account.objects.get(pk=self.account.pk))
+        self.assertIsNone(self.backend.get_user(self.account.pk))
+
+    def test_cached_account_invalidated_when_account_changes(self):
+        cache_account(self.account)
+        self.account.update(is_active=False)
+        self.assertIsNone(get_cached_account(self.account.pk))
+        self.assertIsNone(self.backend.get_user(self.account.pk))
+
+        cache_account(self.account)
+        self.account.delete()
+        self.assertIsNone(get_cached_account(self.account.pk))
+
+    @override_settings(DATABASE_REPLICAS=["replica"])
+    def test_cache_filled_from_primary(self):
+        ## A lagging replica would still have the account as it was before the change that dropped it from the caches. The alias isn't configured, so any read routed to it fails
+        cache_account(self.account)
+        get_account_representations(["johndoe"])
+        self.account.set_password("newpassword")
+        self.account.save()
+        self.account.profile.first_name = "John"
+        self.account.profile.save()
+        with patch.object(ReplicaRouter, "db_for_read", return_value="replica"):
+            account = self.backend.get_user(self.account.pk)
+            representation = get_account_representations(["johndoe"])["johndoe"]
+        self.assertEqual(
+            account.get_session_auth_hash(), self.account.get_session_auth_hash()
+        )
+        self.assertEqual(representation["first_name"], "John")
+        self.assertEqual(
+            get_cached_account(self.account.pk).get_session_auth_hash(),
+            self.account.get_session_auth_hash(),
+        )
@@ -0,0 +1,73 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase, APIRequestFactory
+from extended_accounts_api.helpers import AccountSerializer, AccountRowSerializer
+from extended_accounts_api.models import AccountModel as Account
+from PIL import Image
+from io import BytesIO
+import tempfile
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class AccountRowSerializerTestCase(APITestCase):
+    def setUp(self):
+        image_buffer = BytesIO()
+        Image.new("RGB", (1, 1), (10, 20, 30)).save(image_buffer, "png")
+        Account.objects.create_user(
+            username="johndoe",
+            email="johndoe@mail.com",
+            phone_number=123456789,
+            first_name="John",
+            last_name="Doe",
+            profile_image=SimpleUploadedFile("image.png", image_buffer.getvalue()),
+        )
+        Account.objects.create_user(
+            username="janedoe", email="janedoe@mail.com", phone_number=987654321
+        )
+
+    def test_same_representation_as_account_serializer(self):
+        for request in [None, APIRequestFactory().get("/")]:
+            serializer = AccountRowSerializer(request)
+            accounts = Account.objects.order_by("pk")
+            self.assertEqual(
+                serializer.to_representation_many(serializer.rows(accounts)),
+                [
+                    AccountSerializer(context={"request": request}).to_representation(
+                        account
+                    )
+                    for account in accounts
+                ],
+            )
+
+    def test_rows_single_query(self):
+        serializer = AccountRowSerializer()
+        with self.assertNumQueries(1):
+            serializer.to_representation_many(serializer.rows(Account.objects.all()))
+
+    def test_sparse_fields(self):
+        serializer = AccountRowSerializer(fields=["username", "email"])
+        with CaptureQueriesContext(connection) as queries:
+            representations = serializer.to_representation_many(
+                serializer.rows(Account.objects.order_by("pk"))
+            )
+        self.assertEqual(
+            representations,
+            [
+                {"username": "johndoe", "email": "johndoe@mail.com"},
+                {"username": "janedoe", "email": "janedoe@mail.com"},
+            ],
+        )
+        self.assertNotIn("JOIN", queries[0]["sql"])  ## No profile field requested
+
+    def test_sparse_profile_fields(self):
+        serializer = AccountRowSerializer(fields=["username", "profile_image_url"])
+        representation = serializer.to_representation(
+            serializer.rows(Account.objects.filter(username="janedoe")).get()
+        )
+        self.assertEqual(
+            representation, {"username": "janedoe", "profile_image_url": None}
+        )
@@ -0,0 +1,98 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from extended_accounts_api.helpers import (
+    AccountRowSerializer,
+    search_page,
+)
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    ProfileModel as Profile,
+)
+from extended_accounts_api.models.indexes import SEARCH_TABLE
+from rest_framework import serializers
+
+
+class AccountSearchTestCase(TestCase):
+    def setUp(self):
+        for number, (username, first_name, last_name) in enumerate(
+            [
+                ("jdoe", "John", "Doe"),
+                ("jdoe2", "Jane", "Doe"),
+                ("maryjane", "Mary Jane", "Watson"),
+                ("peter", "Peter", "Parker"),
+            ]
+        ):
+            Account.objects.create_user(
+                username=username,
+                email=f"{username}@mail.com",
+                phone_number=100000000 + number,
+                first_name=first_name,
+                last_name=last_name,
+            )
+        self.serializer = AccountRowSerializer(fields=["username"])
+
+    def search(self, query, cursor=None):
+        return search_page(self.serializer, Account.objects.all(), query, cursor)
+
+    def usernames(self, page):
+        return [account["username"] for account in page["results"]]
+
+    def test_username_prefix_ranked_first(self):
+        self.assertEqual(self.usernames(self.search("jdoe")), ["jdoe", "jdoe2"])
+
+    def test_email_prefix(self):
+        self.assertEqual(self.usernames(self.search("pete")), ["peter"])
+
+    def test_name_tokens(self):
+        self.assertEqual(self.usernames(self.search("jane")), ["jdoe2", "maryjane"])
+        self.assertEqual(self.usernames(self.search("ja wat")), ["maryjane"])
+        self.assertEqual(self.usernames(self.search("doe")), ["jdoe", "jdoe2"])
+
+    def test_profile_changes_are_indexed(self):
+        account = Account.objects.get(username="peter")
+        account.update(first_name="Miles", last_name="Morales")
+        self.assertEqual(self.usernames(self.search("parker")), [])
+        self.assertEqual(self.usernames(self.search("morales")), ["peter"])
+        account.delete()
+        self.assertEqual(self.usernames(self.search("miles")), [])
+
+    @override_settings(ACCOUNT_SEARCH_PAGE_SIZE=1)
+    def test_keyset_pagination(self):
+        usernames, cursor = [], None
+        while True:
+            page = self.search("j", cursor)
+            usernames += self.usernames(page)
+            cursor = page["next"]
+            if cursor is None:
+                break
+        self.assertEqual(usernames, ["jdoe", "jdoe2", "maryjane"])
+
+    def test_invalid_cursor_KO(self):
+        with self.assertRaises(serializers.ValidationError):
+            self.search("j", "garbage")
+
+    def test_blank_query_KO(self):
+        with self.assertRaises(serializers.ValidationError):
+            self.search(" ")
+
+    def test_search_indexes_created_by_migrations(self):
+        with connection.cursor() as cursor:
+            self.assertTrue(
+                {"account_username_prefix", "account_email_prefix"}
+                <= set(
+                    connection.introspection.get_constraints(
+                        cursor, Account._meta.db_table
+                    )
+                )
+            )
+            if connection.vendor == "sqlite":
+                self.assertIn(
+                    SEARCH_TABLE, connection.introspection.table_names(cursor)
+                )
+            else:
+                self.assertIn(
+                    "profile_names_search",
+                    connection.introspection.get_constraints(
+                        cursor, Profile._meta.db_table
+                    ),
+                )
@@ -0,0 +1,59 @@
+from django.test import SimpleTestCase
+from extended_accounts_api.helpers.bloom_filter import BloomFilter
+import os, tempfile
+
+
+class BloomFilterTestCase(SimpleTestCase):
+    def test_bloom_filter(self):
+        bloom_filter = BloomFilter(1000, error_rate=0.01)
+        for number in range(1000):
+            bloom_filter.add(str(number))
+        self.assertTrue(all(str(number) in bloom_filter for number in range(1000)))
+        false_positives = sum(
+            str(number) in bloom_filter for number in range(1000, 11000)
+        )
+        self.assertLess(false_positives, 200)  ## About 1%, with some margin
+
+    def test_empty_bloom_filter(self):
+        self.assertNotIn("a", BloomFilter(0))
+
+    def test_saved_bloom_filter(self):
+        bloom_filter = BloomFilter(100)
+        for number in range(100):
+            bloom_filter.add(str(number))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "filter.bloom")
+            bloom_filter.save(path)
+            loaded = BloomFilter.load(path)
+            self.assertEqual(loaded.size, bloom_filter.size)
+            self.assertEqual(loaded.hash_count, bloom_filter.hash_count)
+            self.assertTrue(all(str(number) in loaded for number in range(100)))
+            self.assertEqual(
+                os.stat(path).st_mode & 0o777, 0o644
+            )  ## Readable by the web workers, whatever user compiled it
+            self.assertEqual(
+                [str(number) in loaded for number in range(100, 1100)],
+                [str(number) in bloom_filter for number in range(100, 1100)],
+            )
+
+    def test_load_invalid_file(self):
+        with tempfile.NamedTemporaryFile() as file:
+            file.write(b"not a bloom filter at all")
+            file.flush()
+            with self.assertRaises(ValueError):
+                BloomFilter.load(file.name)
+
+    def test_load_truncated_file(self):
+        bloom_filter = BloomFilter(100)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "filter.bloom")
+            bloom_filter.save(path)
+            os.truncate(path, os.path.getsize(path) - 1)
+            with self.assertRaises(ValueError):
+                BloomFilter.load(path)
+            os.truncate(path, 4)
+            with self.assertRaises(ValueError):
+                BloomFilter.load(path)
+            os.truncate(path, 0)
+            with self.assertRaises(ValueError):
+                BloomFilter.load(path)
@@ -0,0 +1,134 @@
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from extended_accounts_api.helpers import (
+    BulkAccountsSerializer,
+    bulk_set_active,
+    bulk_delete_accounts,
+    cache_account,
+    get_cached_account,
+    delete_profile_images,
+)
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    ProfileModel as Profile,
+)
+from PIL import Image
+from io import BytesIO
+from unittest.mock import patch
+import tempfile, shutil, os, itertools
+
+MEDIA_ROOT = tempfile.mkdtemp()
+image_colors = itertools.count()
+
+
+def create_test_image():
+    ## Images are stored under the digest of their content, so each test image gets a different color to be a different image
+    image_buffer = BytesIO()
+    color = next(image_colors)
+    image_object = Image.new("RGB", (1, 1), (color % 256, color // 256, 0))
+    image_object.save(image_buffer, "png")
+    image_buffer.seek(0)
+    image = SimpleUploadedFile(
+        "test_image.png",
+        image_buffer.read(),
+    )
+    return image
+
+
+class BulkAccountsSerializerTestCase(TestCase):
+    def test_usernames(self):
+        serializer = BulkAccountsSerializer(data={"usernames": ["johndoe", "jdoe"]})
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(
+            serializer.validated_data,
+            {"lookup": "username", "identifiers": ["johndoe", "jdoe"]},
+        )
+
+    def test_ids(self):
+        serializer = BulkAccountsSerializer(data={"ids": [1, 2]})
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(
+            serializer.validated_data, {"lookup": "pk", "identifiers": [1, 2]}
+        )
+
+    def test_invalid_data(self):
+        self.assertFalse(BulkAccountsSerializer(data={}).is_valid())
+        self.assertFalse(BulkAccountsSerializer(data={"usernames": []}).is_valid())
+        self.assertFalse(
+            BulkAccountsSerializer(
+                data={"usernames": ["johndoe"], "ids": [1]}
+            ).is_valid()
+        )
+
+    @override_settings(BULK_ACCOUNTS_MAX=1)
+    def test_too_many_accounts(self):
+        self.assertFalse(
+            BulkAccountsSerializer(data={"usernames": ["johndoe", "jdoe"]}).is_valid()
+        )
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class BulkAccountsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.accounts = [
+            Account.objects.create_user(
+                username=f"user_{i}",
+                email=f"user{i}@mail.com",
+                phone_number=100000000 + i,
+                profile_image=create_test_image(),
+            )
+            for i in range(3)
+        ]
+
+    @classmethod
+    def tearDownClass(cls, *args, **kwargs):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass(*args, **kwargs)
+
+    def test_bulk_set_active(self):
+        cache_account(self.accounts[0])
+        with self.assertNumQueries(2):  ## Lookup + UPDATE
+            result = bulk_set_active("username", ["user_0", "user_1", "ghost"], True)
+        self.assertEqual(
+            result, {"user_0": "activated", "user_1": "activated", "ghost": "not_found"}
+        )
+        self.assertEqual(
+            list(Account.objects.order_by("pk").values_list("is_active", flat=True)),
+            [True, True, False],
+        )
+        self.assertIsNone(get_cached_account(self.accounts[0].pk))
+
+        result = bulk_set_active("pk", [self.accounts[0].pk], False)
+        self.assertEqual(result, {str(self.accounts[0].pk): "deactivated"})
+        self.assertFalse(Account.objects.get(pk=self.accounts[0].pk).is_active)
+
+    def test_bulk_delete_accounts(self):
+        image_names = [account.profile.profile_image.name for account in self.accounts]
+        with patch(
+            "extended_accounts_api.helpers.profile_images.delete_profile_images",
+            wraps=delete_profile_images,
+        ) as mock_delete_profile_images:
+            with self.captureOnCommitCallbacks(execute=True):
+                result = bulk_delete_accounts("username", ["user_0", "user_1", "ghost"])
+        self.assertEqual(
+            result, {"user_0": "deleted", "user_1": "deleted", "ghost": "not_found"}
+        )
+        self.assertEqual(
+            list(Account.objects.values_list("username", flat=True)), ["user_2"]
+        )
+        self.assertEqual(Profile.objects.count(), 1)
+        mock_delete_profile_images.assert_called_once_with(
+            {
+                f"{image_name}.{extension}"
+                for image_name in image_names[:2]
+                for extension in ["png", "webp"]
+            }
+        )  ## All the images are removed at once
+        media = os.listdir(MEDIA_ROOT)
+        for image_name in image_names[:2]:
+            self.assertNotIn(image_name + ".png", media)
+            self.assertNotIn(image_name + ".webp", media)
+        self.assertIn(image_names[2] + ".png", media)
+        self.assertIn(image_names[2] + ".webp", media)
@@ -0,0 +1,214 @@
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import serializers
+from extended_accounts_api.helpers import (
+    ProfileImageUploadSerializer,
+    append_chunk,
+    validate_upload_header,
+    complete_upload,
+    discard_expired_uploads,
+)
+from extended_accounts_api.helpers.chunked_upload import (
+    UploadOffsetConflict,
+    UploadTooLarge,
+)
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    ProfileImageUploadModel as ProfileImageUpload,
+)
+from PIL import Image
+from io import BytesIO
+import tempfile, shutil, os, datetime, time
+
+MEDIA_ROOT = tempfile.mkdtemp()
+UPLOAD_DIR = tempfile.mkdtemp()
+
+
+def create_test_image_bytes(size=(64, 64)):
+    image_buffer = BytesIO()
+    image_object = Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3))
+    image_object.save(image_buffer, "png")
+    return image_buffer.getvalue()
+
+
+class ProfileImageUploadSerializerTestCase(TestCase):
+    def test_valid(self):
+        serializer = ProfileImageUploadSerializer(
+            data={"file_name": "avatar.png", "size": 1000}
+        )
+        self.assertTrue(serializer.is_valid())
+
+    def test_invalid_extension(self):
+        serializer = ProfileImageUploadSerializer(
+            data={"file_name": "avatar.exe", "size": 1000}
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("file_name", serializer.errors)
+
+    @override_settings(PROFILE_IMAGE_MAX_UPLOAD_SIZE=999)
+    def test_too_large(self):
+        serializer = ProfileImageUploadSerializer(
+            data={"file_name": "avatar.png", "size": 1000}
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("size", serializer.errors)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, PROFILE_IMAGE_UPLOAD_DIR=UPLOAD_DIR)
+class ChunkedUploadTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls, *args, **kwargs):
+        super().setUpClass(*args, **kwargs)
+        cls.account = Account.objects.create_user(
+            username="johndoe", email="johndoe@mail.com", phone_number=123456789
+        )
+
+    @classmethod
+    def tearDownClass(cls, *args, **kwargs):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        shutil.rmtree(UPLOAD_DIR, ignore_errors=True)
+        super().tearDownClass(*args, **kwargs)
+
+    def __create_upload(self, image):
+        return ProfileImageUpload.objects.create(
+            account=self.account, file_name="avatar.png", size=len(image)
+        )
+
+    def test_append_chunks(self):
+        image = create_test_image_bytes()
+        upload = self.__create_upload(image)
+        self.assertEqual(upload.offset, 0)
+        self.assertEqual(append_chunk(upload, 0, BytesIO(image[:100])), 100)
+        self.assertEqual(upload.offset, 100)
+        self.assertEqual(append_chunk(upload, 100, BytesIO(image[100:])), len(image))
+        with open(upload.path, "rb") as partial_file:
+            self.assertEqual(partial_file.read(), image)
+
+    def test_append_chunk_wrong_offset(self):
+        image = create_test_image_bytes()
+        upload = self.__create_upload(image)
+        append_chunk(upload, 0, BytesIO(image[:100]))
+        with self.assertRaises(UploadOffsetConflict):
+            append_chunk(upload, 0, BytesIO(image[:100]))
+        self.assertEqual(upload.offset, 100)
+
+    def test_overlapping_append_chunks(self):
+        image = create_test_image_bytes()
+        upload = self.__create_upload(image)
+        conflicts = []
+
+        class RetriedStream(BytesIO):
+            def read(stream, size=-1):
+                if (
+                    not conflicts
+                ):  ## The client retries while the chunk is being received
+                    with self.assertRaises(UploadOffsetConflict) as context:
+                        append_chunk(upload, 0, BytesIO(image[:100]))
+                    conflicts.append(context.exception)
+                return super().read(size)
+
+        self.assertEqual(append_chunk(upload, 0, RetriedStream(image[:100])), 100)
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual(conflicts[0].status_code, 409)
+        with open(upload.path, "rb") as partial_file:
+            self.assertEqual(partial_file.read(), image[:100])
+
+    def test_append_chunk_too_large(self):
+        image = create_test_image_bytes()
+        upload = self.__create_upload(image)
+        append_chunk(upload, 0, BytesIO(image[:100]))
+        with self.assertRaises(UploadTooLarge):
+            append_chunk(upload, 100, BytesIO(image[100:] + b"extra"))
+        self.assertEqual(upload.offset, 100)  ## The whole chunk is discarded
+
+    def test_validate_upload_header(self):
+        image = create_test_image_bytes()
+        upload = self.__create_upload(image)
+        append_chunk(upload, 0, BytesIO(image[:10]))
+        self.assertFalse(validate_upload_header(upload))  ## Incomplete header
+        append_chunk(upload, 10, BytesIO(image[10:100]))
+        self.assertTrue(validate_upload_header(upload))
+
+    @override_settings(PROFILE_IMAGE_MAX_PIXELS=100)
+    def test_validate_upload_header_too_many_pixels(self):
+        image = create_test_image_bytes()
+        upload = self.__create_upload(image)
+        append_chunk(
+            upload, 0, BytesIO(image[:100])
+        )  ## Rejected as soon as the header is received
+        with self.assertRaises(serializers.ValidationError):
+            validate_upload_header(upload)
+
+    def test_append_chunk_not_an_image(self):
+        upload = ProfileImageUpload.objects.create(
+            account=self.account, file_name="avatar.png", size=1000
+        )
+        stream = BytesIO(b"a" * 100)
+        with self.assertRaises(serializers.ValidationError):
+            append_chunk(upload, 0, stream)
+        self.assertEqual(stream.tell(), 16)  ## Rejected with its first bytes
+        self.assertEqual(upload.offset, 0)
+
+    def test_append_chunk_other_image_format(self):
+        image = create_test_image_bytes()
+        upload = ProfileImageUpload.objects.create(
+            account=self.account, file_name="avatar.jpg", size=len(image)
+        )  ## Misnamed PNG, PIL opens it anyway
+        self.assertEqual(append_chunk(upload, 0, BytesIO(image)), len(image))
+
+    @override_settings(PROFILE_IMAGE_HEADER_SIZE=100)
+    def test_validate_upload_header_not_an_image(self):
+        upload = ProfileImageUpload.objects.create(
+            account=self.account, file_name="avatar.tga", size=1000
+        )  ## TGA files have no signature, so they're only checked by PIL
+        append_chunk(upload, 0, BytesIO(b"a" * 50))
+        self.assertFalse(validate_upload_header(upload))
+        append_chunk(upload, 50, BytesIO(b"a" * 50))
+        with self.assertRaises(serializers.ValidationError):
+            validate_upload_header(upload)
+
+    def test_complete_upload(self):
+        image = create_test_image_bytes()
+        upload = self.__create_upload(image)
+        append_chunk(upload, 0, BytesIO(image))
+        upload_pk, upload_path = upload.pk, upload.path
+        complete_upload(upload, self.account)
+        account = Account.objects.get(pk=self.account.pk)
+        self.assertIn(
+            account.profile.profile_image.name + ".png", os.listdir(MEDIA_ROOT)
+        )
+        self.assertIn(
+            account.profile.profile_image.name + ".webp", os.listdir(MEDIA_ROOT)
+        )
+        self.assertFalse(os.path.exists(upload_path))
+        self.assertFalse(ProfileImageUpload.objects.filter(pk=upload_pk).exists())
+
+    def test_complete_upload_corrupted_image(self):
+        image = create_test_image_bytes()
+        image = image[:200] + b"\0" * 100 + image[300:]
+        upload = self.__create_upload(image)
+        append_chunk(upload, 0, BytesIO(image))
+        with self.assertRaises(serializers.ValidationError):
+            complete_upload(upload, self.account)
+        self.assertFalse(Account.objects.get(pk=self.account.pk).profile.profile_image)
+
+    def test_discard_expired_uploads(self):
+        image = create_test_image_bytes()
+        expired, recent = self.__create_upload(image), self.__create_upload(image)
+        ProfileImageUpload.objects.filter(pk=expired.pk).update(
+            created_at=timezone.now() - datetime.timedelta(hours=2)
+        )
+        for upload in [expired, recent]:
+            append_chunk(upload, 0, BytesIO(image[:100]))
+        orphan_path = os.path.join(UPLOAD_DIR, "0123abcd.part")
+        open(orphan_path, "w").close()
+        two_hours_ago = time.time() - 7200
+        os.utime(orphan_path, (two_hours_ago, two_hours_ago))
+        self.assertEqual(discard_expired_uploads(3600), 2)
+        self.assertEqual(
+            list(ProfileImageUpload.objects.filter(pk__in=[expired.pk, recent.pk])),
+            [recent],
+        )
+        self.assertFalse(os.path.exists(expired.path))
+        self.assertFalse(os.path.exists(orphan_path))
+        self.assertTrue(os.path.exists(recent.path))
@@ -0,0 +1,99 @@
+from django.test import TestCase, override_settings
+from django.db import DatabaseError
+from django.http import HttpResponse
+from django.test.client import RequestFactory
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    ProfileModel as Profile,
+    RefreshTokenModel as RefreshToken,
+)
+from extended_accounts_api.helpers import ReplicaRouter, ReplicaPinningMiddleware
+from extended_accounts_api.helpers import db_router
+from unittest.mock import patch
+
+
+@override_settings(DATABASE_REPLICAS=["replica"], DATABASE_REPLICA_CHECK_INTERVAL=60)
+class ReplicaRouterTestCase(TestCase):
+    def setUp(self):
+        db_router._replica_status.clear()
+        self.router = ReplicaRouter()
+        patcher = patch.object(db_router, "replica_lag", return_value=0.5)
+        self.mock_replica_lag = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.request_factory = RequestFactory()
+
+    def db_for_read(self, model, cookies=None):
+        ## Outside of TestCase's transaction and of any pin, as a request would be
+        databases = []
+
+        def view(request):
+            with patch.object(
+                db_router.connections["default"], "in_atomic_block", False
+            ):
+                databases.append(self.router.db_for_read(model))
+            return HttpResponse()
+
+        request = self.request_factory.get("/")
+        request.COOKIES.update(cookies or {})
+        ReplicaPinningMiddleware(view)(request)
+        return databases[0]
+
+    def test_reads_sent_to_replicas(self):
+        self.assertEqual(self.db_for_read(Account), "replica")
+        self.assertEqual(self.db_for_read(Profile), "replica")
+        self.assertEqual(self.db_for_read(RefreshToken), "default")
+        self.assertEqual(self.router.db_for_write(Account), "default")
+
+    def test_reads_inside_transaction(self):
+        self.assertEqual(self.router.db_for_read(Account), "default")
+
+    @override_settings(DATABASE_REPLICA_MAX_LAG=0.1)
+    def test_lagging_replica(self):
+        self.assertEqual(self.db_for_read(Account), "default")
+
+    def test_unreachable_replica(self):
+        self.mock_replica_lag.side_effect = DatabaseError
+        self.assertEqual(self.db_for_read(Account), "default")
+
+    def test_replica_checked_periodically(self):
+        self.db_for_read(Account)
+        self.db_for_read(Account)
+        self.mock_replica_lag.assert_called_once_with("replica")
+
+    def test_read_your_writes(self):
+        def view(request):
+            with patch.object(
+                db_router.connections["default"], "in_atomic_block", False
+            ):
+                self.router.db_for_write(Account)
+                self.database_read = self.router.db_for_read(Account)
+            return HttpResponse()
+
+        response = ReplicaPinningMiddleware(view)(self.request_factory.post("/"))
+        self.assertEqual(self.database_read, "default")
+        cookie = response.cookies["primary_pin"]
+        self.assertEqual(cookie["max-age"], 10)
+        ## The following requests of the client are pinned too, the rest aren't
+        self.assertEqual(self.db_for_read(Account, {"primary_pin": "1"}), "default")
+        self.assertEqual(self.db_for_read(Account), "replica")
+
+    def test_writes_of_other_models_dont_pin(self):
+        def view(request):
+            self.router.db_for_write(RefreshToken)
+            return HttpResponse()
+
+        response = ReplicaPinningMiddleware(view)(self.request_factory.post("/"))
+        self.assertNotIn("primary_pin", response.cookies)
+
+    def test_allow_migrate(self):
+        self.assertFalse(self.router.allow_migrate("replica", "extended_accounts_api"))
+        self.assertIsNone(self.router.allow_migrate("default", "extended_accounts_api"))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        self.assertEqual(self.db_for_read(Account), "default")
+
+
+class ReplicaLagTestCase(TestCase):
+    def test_stand_in_replica_lag(self):
+        self.assertEqual(db_router.replica_lag("default"), 0.0)
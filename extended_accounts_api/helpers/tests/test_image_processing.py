@@ -0,0 +1,135 @@
+from django.test import SimpleTestCase, override_settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from extended_accounts_api.helpers.image_processing import (
+    ImageProcessingPool,
+    ImageProcessingUnavailable,
+    encode_webp,
+    normalize_image,
+    render_rendition,
+    local_path,
+)
+from PIL import Image, ImageCms
+from io import BytesIO
+import tempfile, shutil, threading, time, os
+
+
+@override_settings(
+    PROFILE_IMAGE_WORKERS=0, PROFILE_IMAGE_QUEUE_SIZE=2, PROFILE_IMAGE_QUEUE_TIMEOUT=0.1
+)
+class ImageProcessingTestCase(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source_path = os.path.join(self.directory, "image.png")
+        Image.new("RGB", (40, 20)).save(self.source_path)
+        self.pool = ImageProcessingPool()
+
+    def tearDown(self):
+        self.pool.shutdown()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_encode_webp(self):
+        destination_path = os.path.join(self.directory, "image.webp")
+        self.pool.run(encode_webp, self.source_path, destination_path, 800, 2048, {})
+        with Image.open(destination_path) as image:
+            self.assertEqual(image.format, "WEBP")
+        metrics = self.pool.metrics()
+        self.assertEqual(metrics["completed"], 1)
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertGreater(metrics["max_encode_time"], 0)
+
+    def test_render_rendition(self):
+        destination_path = os.path.join(self.directory, "image.jpeg")
+        self.pool.run(
+            render_rendition, self.source_path, destination_path, 10, "jpeg", 800
+        )
+        with Image.open(destination_path) as image:
+            self.assertEqual((image.format, image.size), ("JPEG", (10, 5)))
+
+    def test_pixel_budget(self):
+        with self.assertRaises(Image.DecompressionBombError):
+            self.pool.run(
+                encode_webp,
+                self.source_path,
+                os.path.join(self.directory, "image.webp"),
+                799,
+                2048,
+                {},
+            )
+        self.assertEqual(self.pool.metrics()["failed"], 1)
+
+    def test_backpressure(self):
+        threads = [
+            threading.Thread(target=self.pool.run, args=(time.sleep, 0.5))
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        self.assertEqual(self.pool.metrics()["queue_depth"], 2)
+        with self.assertRaises(ImageProcessingUnavailable):
+            self.pool.run(time.sleep, 0)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.pool.metrics()["rejected"], 1)
+        self.pool.run(time.sleep, 0)  ## There's room again
+
+    @override_settings(PROFILE_IMAGE_WORKERS=1)
+    def test_process_pool(self):
+        destination_path = os.path.join(self.directory, "image.webp")
+        self.pool.run(encode_webp, self.source_path, destination_path, 800, 2048, {})
+        self.assertTrue(os.path.exists(destination_path))
+        self.assertEqual(self.pool.metrics()["completed"], 1)
+
+    def test_local_path(self):
+        image = SimpleUploadedFile("image.png", b"content")
+        with local_path(image) as path:
+            with open(path, "rb") as file:
+                self.assertEqual(file.read(), b"content")
+        self.assertFalse(os.path.exists(path))
+
+
+class NormalizeImageTestCase(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source_path = os.path.join(self.directory, "image.jpeg")
+        exif = Image.Exif()
+        exif[0x0112] = 6  ## Orientation: rotated 90 degrees clockwise
+        exif[0x010F] = "Camera maker"
+        Image.new("RGB", (400, 200), "red").save(self.source_path, exif=exif)
+        self.destination_path = os.path.join(self.directory, "normalized.jpeg")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_normalize_image(self):
+        normalize_image(self.source_path, self.destination_path, 2048, 10**6)
+        with Image.open(self.destination_path) as image:
+            self.assertEqual(image.format, "JPEG")
+            self.assertEqual(image.size, (200, 400))  ## Orientation applied
+            self.assertNotIn("exif", image.info)
+
+    def test_normalize_image_downscales(self):
+        normalize_image(self.source_path, self.destination_path, 100, 10**6)
+        with Image.open(self.destination_path) as image:
+            self.assertEqual(image.size, (50, 100))
+
+    def test_encode_webp_strips_metadata(self):
+        destination_path = os.path.join(self.directory, "image.webp")
+        encode_webp(self.source_path, destination_path, 10**6, 100, {"quality": 50})
+        with Image.open(destination_path) as image:
+            self.assertEqual(image.size, (50, 100))
+            self.assertFalse(image.getexif())
+
+    def test_color_profile_converted_to_srgb(self):
+        source_path = os.path.join(self.directory, "image.png")
+        Image.new("RGB", (10, 10), "blue").save(
+            source_path,
+            icc_profile=ImageCms.ImageCmsProfile(
+                ImageCms.createProfile("sRGB")
+            ).tobytes(),
+        )
+        destination_path = os.path.join(self.directory, "normalized.png")
+        normalize_image(source_path, destination_path, 2048, 10**6)
+        with Image.open(destination_path) as image:
+            self.assertEqual(image.format, "PNG")
+            self.assertNotIn("icc_profile", image.info)
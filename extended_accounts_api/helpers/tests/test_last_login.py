@@ -0,0 +1,96 @@
+from django.contrib.auth import user_logged_in
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from extended_accounts_api.models import AccountModel as Account
+from extended_accounts_api.helpers import flush_last_logins
+from extended_accounts_api.signals import flush_deferred_tasks
+from unittest.mock import patch
+import datetime
+
+
+class LastLoginTestCase(TestCase):
+    def setUp(self):
+        self.accounts = [
+            Account.objects.create_user(
+                username=f"user_{number}",
+                email=f"user_{number}@mail.com",
+                phone_number=123456780 + number,
+                is_active=True,
+            )
+            for number in range(5)
+        ]
+
+    def tearDown(self):
+        flush_last_logins()
+
+    def login_storm(self):
+        """
+        50 logins of 5 accounts, returning the number of UPDATE statements they issued.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(10):
+                for account in self.accounts:
+                    user_logged_in.send(sender=Account, request=None, user=account)
+            flush_deferred_tasks(
+                sender=self.__class__
+            )  ## Sending request_finished would close the test's connection
+        return sum(query["sql"].startswith("UPDATE") for query in queries)
+
+    def test_write_through(self):
+        self.assertEqual(self.login_storm(), 50)
+        self.assertTrue(all(account.last_login for account in Account.objects.all()))
+
+    @override_settings(LAST_LOGIN_WRITE_BEHIND=True, LAST_LOGIN_MAX_STALENESS=0)
+    def test_write_behind_coalesces_logins(self):
+        self.assertEqual(self.login_storm(), 1)
+        for account in self.accounts:
+            self.assertEqual(
+                Account.objects.get(pk=account.pk).last_login, account.last_login
+            )
+
+    @override_settings(LAST_LOGIN_WRITE_BEHIND=True, LAST_LOGIN_MAX_STALENESS=60)
+    def test_write_behind_waits_max_staleness(self):
+        self.assertEqual(self.login_storm(), 0)
+        self.assertFalse(Account.objects.filter(last_login__isnull=False).exists())
+        flush_last_logins()
+        self.assertEqual(Account.objects.filter(last_login__isnull=False).count(), 5)
+
+    @override_settings(LAST_LOGIN_WRITE_BEHIND=True, LAST_LOGIN_BATCH_SIZE=2)
+    def test_write_behind_batch_size(self):
+        for account in self.accounts[:3]:
+            user_logged_in.send(sender=Account, request=None, user=account)
+        self.assertEqual(Account.objects.filter(last_login__isnull=False).count(), 2)
+
+    @override_settings(LAST_LOGIN_WRITE_BEHIND=True, LAST_LOGIN_BATCH_SIZE=2)
+    def test_write_behind_batch_failure(self):
+        def failed_update(*args, **kwargs):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT * FROM missing_table"
+                )  ## Aborts the transaction on PostgreSQL
+
+        with patch(
+            "django.db.models.query.QuerySet.update", side_effect=failed_update
+        ), self.assertLogs("extended_accounts_api.helpers.last_login", "ERROR"):
+            for account in self.accounts[:2]:
+                user_logged_in.send(sender=Account, request=None, user=account)
+        self.assertTrue(
+            Account.objects.filter(pk=self.accounts[0].pk).exists()
+        )  ## The transaction can still be used
+        flush_last_logins()
+        self.assertEqual(
+            Account.objects.filter(last_login__isnull=False).count(), 2
+        )  ## Kept for the next flush
+
+    @override_settings(LAST_LOGIN_WRITE_BEHIND=True)
+    def test_write_behind_keeps_later_login(self):
+        account = self.accounts[0]
+        user_logged_in.send(sender=Account, request=None, user=account)
+        later = timezone.now() + datetime.timedelta(minutes=1)
+        Account.objects.filter(pk=account.pk).update(
+            last_login=later
+        )  ## Written by another process
+        flush_last_logins()
+        self.assertEqual(Account.objects.get(pk=account.pk).last_login, later)
@@ -0,0 +1,117 @@
+from django.test import TestCase, override_settings
+from django.db import transaction
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    OutboxEventModel as OutboxEvent,
+)
+from extended_accounts_api.helpers import (
+    NewPasswordSerializer,
+    relay_outbox_events,
+    celery_sink,
+    webhook_sink,
+)
+from unittest.mock import patch
+import json
+
+published = []
+
+
+def list_sink(events):
+    published.append(events)
+
+
+def failing_sink(events):
+    raise ConnectionError
+
+
+@override_settings(
+    OUTBOX_SINK="extended_accounts_api.helpers.tests.test_outbox.list_sink"
+)
+class OutboxTestCase(TestCase):
+    def setUp(self):
+        published.clear()
+        self.account = Account.objects.create_user(
+            username="johndoe", email="johndoe@mail.com", phone_number=123456789
+        )
+
+    def events(self):
+        return list(OutboxEvent.objects.order_by("id").values_list("event", flat=True))
+
+    def test_lifecycle_events(self):
+        serializer = NewPasswordSerializer(
+            self.account,
+            data={"password": "Str0ngP4ssw0rd!", "password_confirm": "Str0ngP4ssw0rd!"},
+        )
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+        account_id = self.account.pk
+        self.account.delete()
+        self.assertEqual(
+            self.events(),
+            [OutboxEvent.CREATED, OutboxEvent.PASSWORD_CHANGED, OutboxEvent.DELETED],
+        )
+        self.assertEqual(
+            set(OutboxEvent.objects.values_list("account_id", "username")),
+            {(account_id, "johndoe")},
+        )
+
+    def test_rolled_back_change_without_event(self):
+        try:
+            with transaction.atomic():
+                Account.objects.create_user(
+                    username="jdoe", email="jdoe@mail.com", phone_number=987654321
+                )
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(self.events(), [OutboxEvent.CREATED])
+
+    def test_relay_outbox_events(self):
+        Account.objects.create_user(
+            username="jdoe", email="jdoe@mail.com", phone_number=987654321
+        )
+        self.account.delete()
+        self.assertEqual(relay_outbox_events(batch_size=2), 3)
+        self.assertEqual([len(batch) for batch in published], [2, 1])
+        events = [event for batch in published for event in batch]
+        self.assertEqual(
+            [(event["event"], event["username"]) for event in events],
+            [
+                (OutboxEvent.CREATED, "johndoe"),
+                (OutboxEvent.CREATED, "jdoe"),
+                (OutboxEvent.DELETED, "johndoe"),
+            ],
+        )
+        self.assertEqual(
+            sorted(event["id"] for event in events), [event["id"] for event in events]
+        )
+        self.assertFalse(OutboxEvent.objects.exists())
+        self.assertEqual(relay_outbox_events(), 0)
+
+    @override_settings(
+        OUTBOX_SINK="extended_accounts_api.helpers.tests.test_outbox.failing_sink"
+    )
+    def test_events_kept_if_publishing_fails(self):
+        with self.assertRaises(ConnectionError):
+            relay_outbox_events()
+        self.assertEqual(self.events(), [OutboxEvent.CREATED])
+
+    @override_settings(OUTBOX_CELERY_TASK="account_events.handle")
+    def test_celery_sink(self):
+        with patch("extended_accounts_api.helpers.outbox.current_app") as mock_app:
+            producer = mock_app.producer_or_acquire.return_value.__enter__.return_value
+            celery_sink([{"id": 1}, {"id": 2}])
+        mock_app.send_task.assert_any_call(
+            "account_events.handle", args=[{"id": 2}], producer=producer
+        )
+        self.assertEqual(mock_app.send_task.call_count, 2)
+
+    @override_settings(OUTBOX_WEBHOOK_URL="https://example.com/events")
+    def test_webhook_sink(self):
+        with patch(
+            "extended_accounts_api.helpers.outbox.urllib.request.urlopen"
+        ) as mock_urlopen:
+            webhook_sink([{"id": 1}])
+        request = mock_urlopen.call_args.args[0]
+        self.assertEqual(request.full_url, "https://example.com/events")
+        self.assertEqual(json.loads(request.data), [{"id": 1}])
@@ -0,0 +1,96 @@
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+from extended_accounts_api.helpers import (
+    BreachedPasswordValidator,
+    NewPasswordSerializer,
+)
+from extended_accounts_api.helpers.bloom_filter import BloomFilter
+from extended_accounts_api.helpers import password_validation
+from extended_accounts_api.helpers.password_validation import password_key
+from unittest.mock import patch
+import os, tempfile
+
+
+class BreachedPasswordValidatorTestCase(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filter_path = os.path.join(self.directory.name, "passwords.bloom")
+        bloom_filter = BloomFilter(10)
+        for password in ["hunter2", "correcthorse"]:
+            bloom_filter.add(password_key(password))
+        bloom_filter.save(self.filter_path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_breached_password_KO(self):
+        validator = BreachedPasswordValidator(self.filter_path)
+        for password in ["hunter2", "HUNTER2", "correcthorse"]:
+            with self.assertRaises(ValidationError) as context:
+                validator.validate(password)
+            self.assertEqual(context.exception.code, "password_breached")
+
+    def test_password_OK(self):
+        BreachedPasswordValidator(self.filter_path).validate("g7#kQ!v9zPw2")
+
+    def test_missing_filter_falls_back_to_common_passwords(self):
+        validator = BreachedPasswordValidator(
+            os.path.join(self.directory.name, "missing.bloom")
+        )
+        with self.assertRaises(ValidationError):
+            validator.validate("password123")
+        validator.validate("g7#kQ!v9zPw2")
+
+    def test_filter_reloaded_when_replaced(self):
+        validator = BreachedPasswordValidator(self.filter_path)
+        validator.validate("g7#kQ!v9zPw2")
+        bloom_filter = BloomFilter(10)
+        bloom_filter.add(password_key("g7#kQ!v9zPw2"))
+        bloom_filter.save(
+            self.filter_path
+        )  ## A new file, as compile_password_filter writes
+        with self.assertRaises(ValidationError):
+            validator.validate("g7#kQ!v9zPw2")
+        validator.validate("hunter2")
+
+    def test_filter_loaded_once_compiled(self):
+        path = os.path.join(self.directory.name, "missing.bloom")
+        validator = BreachedPasswordValidator(path)
+        validator.validate("g7#kQ!v9zPw2")
+        bloom_filter = BloomFilter(10)
+        bloom_filter.add(password_key("g7#kQ!v9zPw2"))
+        bloom_filter.save(path)
+        with self.assertRaises(ValidationError):
+            validator.validate("g7#kQ!v9zPw2")
+
+    def test_fallback_validator_created_once(self):
+        validator = BreachedPasswordValidator(
+            os.path.join(self.directory.name, "missing.bloom")
+        )
+        validator.validate("g7#kQ!v9zPw2")
+        with patch.object(
+            password_validation, "CommonPasswordValidator"
+        ) as mock_common_password_validator:
+            validator.validate("g7#kQ!v9zPw2")
+            BreachedPasswordValidator(
+                os.path.join(self.directory.name, "missing.bloom")
+            ).validate("g7#kQ!v9zPw2")
+        mock_common_password_validator.assert_not_called()
+
+    def test_unloadable_filter_falls_back_to_common_passwords(self):
+        path = os.path.join(self.directory.name, "empty.bloom")
+        open(path, "wb").close()  ## As left by an interrupted copy
+        validator = BreachedPasswordValidator(path)
+        with self.assertLogs(
+            "extended_accounts_api.helpers.password_validation", "WARNING"
+        ):
+            with self.assertRaises(ValidationError):
+                validator.validate("password123")
+        validator.validate("g7#kQ!v9zPw2")
+
+    def test_new_password_serializer(self):
+        serializer = NewPasswordSerializer(
+            data={"password": "password123", "password_confirm": "password123"}
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("password", serializer.errors)
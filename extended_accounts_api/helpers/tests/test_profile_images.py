@@ -0,0 +1,97 @@
+from django.test import TestCase, override_settings
+from extended_accounts_api.helpers import (
+    delete_profile_images,
+    acquire_profile_image,
+    release_profile_image,
+    defer_profile_image_deletion,
+)
+from extended_accounts_api.models import ProfileImageBlobModel as ProfileImageBlob
+from unittest.mock import patch, Mock
+import tempfile, shutil, os
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ProfileImagesTestCase(TestCase):
+    def setUp(self):
+        for file_name in ["a.png", "a.webp", "b.jpg", "b.webp", "ab.png"]:
+            open(os.path.join(MEDIA_ROOT, file_name), "w").close()
+
+    @classmethod
+    def tearDownClass(cls, *args, **kwargs):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass(*args, **kwargs)
+
+    def test_delete_profile_images(self):
+        delete_profile_images(["a.png", "a.webp", "b.jpg", ""])
+        self.assertEqual(sorted(os.listdir(MEDIA_ROOT)), ["ab.png", "b.webp"])
+
+    def test_delete_profile_images_at_once(self):
+        storage = Mock()
+        with patch(
+            "extended_accounts_api.helpers.profile_images.profile_image_storage",
+            return_value=storage,
+        ):
+            delete_profile_images(["b.jpg", "a.png"])
+        storage.delete_many.assert_called_once_with(["a.png", "b.jpg"])
+        storage.delete.assert_not_called()
+
+    def test_release_profile_image(
+        self,
+    ):  ## Images without reference count are looked up in the storage
+        release_profile_image("a")
+        self.assertEqual(sorted(os.listdir(MEDIA_ROOT)), ["ab.png", "b.jpg", "b.webp"])
+
+    def test_defer_profile_image_deletion(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with defer_profile_image_deletion() as deferred_deletions:
+                release_profile_image("a")
+                release_profile_image("b")
+                self.assertEqual(
+                    deferred_deletions, {"a.png", "a.webp", "b.jpg", "b.webp"}
+                )
+                self.assertEqual(len(os.listdir(MEDIA_ROOT)), 5)
+            self.assertEqual(
+                len(os.listdir(MEDIA_ROOT)), 5
+            )  ## Nothing is deleted until the transaction is committed
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(os.listdir(MEDIA_ROOT), ["ab.png"])
+
+    def test_acquire_and_release_profile_image(self):
+        self.assertFalse(acquire_profile_image("a.png"))
+        self.assertTrue(acquire_profile_image("a.png"))
+        self.assertEqual(ProfileImageBlob.objects.get(digest="a").references, 2)
+        self.assertEqual(ProfileImageBlob.objects.get(digest="a").extension, "png")
+        release_profile_image("a")
+        self.assertEqual(ProfileImageBlob.objects.get(digest="a").references, 1)
+        self.assertIn("a.png", os.listdir(MEDIA_ROOT))
+        release_profile_image("a")
+        self.assertFalse(ProfileImageBlob.objects.exists())
+        self.assertNotIn("a.png", os.listdir(MEDIA_ROOT))
+        self.assertNotIn("a.webp", os.listdir(MEDIA_ROOT))
+        self.assertIn("ab.png", os.listdir(MEDIA_ROOT))
+
+    def test_deferred_deletion_of_image_referenced_again(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with defer_profile_image_deletion():
+                release_profile_image("a")
+            acquire_profile_image("a.png")
+        self.assertIn("a.png", os.listdir(MEDIA_ROOT))
+
+    @patch("os.remove")
+    def test_non_blocking_execution_if_remove_fails(self, mock_os_remove):
+        mock_os_remove.side_effect = Exception("Simulated exception")
+        delete_profile_images(["a.png"])
+        storage = Mock()
+        storage.delete_many.side_effect = Exception("Simulated exception")
+        with patch(
+            "extended_accounts_api.helpers.profile_images.profile_image_storage",
+            return_value=storage,
+        ):
+            delete_profile_images(["a.png"])
+
+    @override_settings(MEDIA_ROOT=os.path.join(MEDIA_ROOT, "nonexistent"))
+    def test_nonexistent_media_root(self):
+        delete_profile_images(["a.png"])
+        release_profile_image("a")
@@ -0,0 +1,69 @@
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from extended_accounts_api.helpers import (
+    ORJSONRenderer,
+    ORJSONParser,
+    MessagePackRenderer,
+    MessagePackParser,
+)
+from extended_accounts_api.helpers.renderers import msgpack
+from rest_framework.exceptions import ParseError
+from io import BytesIO
+from unittest import skipIf
+import datetime, decimal, json, uuid
+
+DATA = {
+    "username": "johndoe",
+    "phone_number": 123456789,
+    "created_at": datetime.datetime(
+        2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc
+    ),
+    "date_joined": datetime.date(2024, 5, 1),
+    "balance": decimal.Decimal("1.5"),
+    "id": uuid.UUID(int=1),
+    "detail": gettext_lazy("Not found."),
+    "sessions": [{"current": True}, {"current": False}],
+    "empty": None,
+}
+
+
+class ORJSONRendererTestCase(SimpleTestCase):
+    def test_same_document_as_json_renderer(self):
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render(DATA)),
+            json.loads(JSONRenderer().render(DATA)),
+        )
+
+    def test_indent_falls_back_to_json_renderer(self):
+        self.assertEqual(
+            ORJSONRenderer().render(DATA, "application/json; indent=4"),
+            JSONRenderer().render(DATA, "application/json; indent=4"),
+        )
+
+    def test_render_none(self):
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_parse(self):
+        self.assertEqual(
+            ORJSONParser().parse(BytesIO(b'{"usernames": ["a", "b"]}')),
+            {"usernames": ["a", "b"]},
+        )
+
+    def test_parse_invalid_KO(self):
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(BytesIO(b'{"usernames": '))
+
+
+@skipIf(msgpack is None, "msgpack isn't installed")
+class MessagePackRendererTestCase(SimpleTestCase):
+    def test_round_trip(self):
+        self.assertEqual(
+            MessagePackParser().parse(BytesIO(MessagePackRenderer().render(DATA))),
+            json.loads(JSONRenderer().render(DATA)),
+        )
+
+    def test_parse_invalid_KO(self):
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(BytesIO(b"\xc1"))
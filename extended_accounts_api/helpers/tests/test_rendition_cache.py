@@ -0,0 +1,78 @@
+from django.test import SimpleTestCase
+from extended_accounts_api.helpers.rendition_cache import RenditionCache
+from concurrent.futures import ThreadPoolExecutor
+import tempfile, shutil, os, time
+
+
+def write(path, content):
+    with open(path, "wb") as file:
+        file.write(content)
+
+
+class RenditionCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = RenditionCache(self.directory, max_size=100)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_get_or_create(self):
+        calls = []
+
+        def create(path):
+            calls.append(1)
+            write(path, b"content")
+
+        path = self.cache.get_or_create("a", create)
+        self.assertEqual(path, os.path.join(self.directory, "a"))
+        self.assertEqual(self.cache.get_or_create("a", create), path)
+        self.assertEqual(len(calls), 1)
+        with open(path, "rb") as file:
+            self.assertEqual(file.read(), b"content")
+        self.assertIsNone(self.cache.get("b"))
+
+    def test_single_flight(self):
+        calls = []
+
+        def create(path):
+            calls.append(1)
+            time.sleep(0.1)
+            write(path, b"content")
+
+        with ThreadPoolExecutor(8) as executor:
+            paths = set(
+                executor.map(lambda _: self.cache.get_or_create("a", create), range(8))
+            )
+        self.assertEqual(len(calls), 1)  ## A single request generates the file
+        self.assertEqual(paths, {os.path.join(self.directory, "a")})
+
+    def test_failed_creation_leaves_nothing(self):
+        def create(path):
+            write(path, b"partial")
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            self.cache.get_or_create("a", create)
+        self.assertEqual(os.listdir(self.directory), ["locks"])
+
+    def test_lru_eviction(self):
+        for key in ["a", "b", "c"]:
+            self.cache.get_or_create(key, lambda path: write(path, bytes(40)))
+            os.utime(self.cache.path(key), (0, {"a": 1, "b": 3, "c": 2}[key]))
+        ## Adding c exceeds the size, so the least recently used file (a) is evicted
+        self.assertEqual(
+            sorted(name for name in os.listdir(self.directory) if name != "locks"),
+            ["b", "c"],
+        )
+        self.cache.get("c")  ## Now b is the least recently used file
+        self.cache.get_or_create("d", lambda path: write(path, bytes(40)))
+        self.assertEqual(
+            sorted(name for name in os.listdir(self.directory) if name != "locks"),
+            ["c", "d"],
+        )
+
+    def test_delete(self):
+        self.cache.get_or_create("a", lambda path: write(path, b"a"))
+        self.cache.delete(["a", "b"])
+        self.assertIsNone(self.cache.get("a"))
@@ -0,0 +1,143 @@
+from django.test import TestCase, SimpleTestCase
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from extended_accounts_api.helpers import S3Storage
+from extended_accounts_api.helpers.s3_storage import S3StorageError
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    ProfileModel as Profile,
+)
+from .fake_s3_server import FakeS3Server
+from PIL import Image
+from io import BytesIO
+from unittest.mock import patch
+
+
+class S3StorageTestCase(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls, *args, **kwargs):
+        super().setUpClass(*args, **kwargs)
+        cls.server = FakeS3Server().start()
+
+    @classmethod
+    def tearDownClass(cls, *args, **kwargs):
+        cls.server.stop()
+        super().tearDownClass(*args, **kwargs)
+
+    def setUp(self):
+        self.server.objects.clear()
+        self.server.requests.clear()
+        self.server.fail_part = None
+        self.storage = S3Storage(
+            **self.server.storage_options(
+                location="media", multipart_threshold=10, multipart_chunk_size=4
+            )
+        )
+
+    def test_save_and_open(self):
+        name = self.storage.save("image.png", ContentFile(b"content"))
+        self.assertEqual(name, "image.png")
+        self.assertEqual(self.server.objects, {"media/image.png": b"content"})
+        self.assertTrue(self.storage.exists("image.png"))
+        self.assertFalse(self.storage.exists("other.png"))
+        self.assertEqual(self.storage.size("image.png"), 7)
+        self.assertIsNotNone(self.storage.get_modified_time("image.png"))
+        with self.storage.open("image.png") as file:
+            self.assertEqual(file.read(), b"content")
+        self.assertEqual(
+            self.storage.url("image.png"),
+            f"{self.server.endpoint_url}/bucket/media/image.png",
+        )
+        with self.assertRaises(FileNotFoundError):
+            self.storage.open("other.png")
+
+    def test_multipart_upload(self):
+        content = bytes(range(23))
+        self.storage.save("image.png", ContentFile(content))
+        self.assertEqual(self.server.objects["media/image.png"], content)
+        uploaded_parts = [
+            query["partNumber"]
+            for method, _, query in self.server.requests
+            if method == "PUT"
+        ]
+        self.assertEqual(
+            sorted(uploaded_parts, key=int), ["1", "2", "3", "4", "5", "6"]
+        )
+        self.assertEqual(self.server.uploads, {})
+
+    def test_failed_multipart_upload_is_aborted(self):
+        self.server.fail_part = 2
+        with self.assertRaises(S3StorageError):
+            self.storage.save("image.png", ContentFile(bytes(23)))
+        self.assertEqual(self.server.objects, {})
+        self.assertEqual(self.server.uploads, {})
+
+    def test_delete(self):
+        self.storage.save("a.png", ContentFile(b"a"))
+        self.storage.delete("a.png")
+        self.storage.delete("a.png")  ## Deleting a missing file isn't an error
+        self.assertEqual(self.server.objects, {})
+
+    def test_delete_many(self):
+        for name in ["a.png", "a.webp", "b.png"]:
+            self.storage.save(name, ContentFile(b"content"))
+        self.server.requests.clear()
+        self.storage.delete_many(["a.png", "a.webp"])
+        self.assertEqual(list(self.server.objects), ["media/b.png"])
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_listdir(self):
+        self.server.max_keys = 2
+        for name in ["a.png", "b.png", "c.png", "uploads/d.png"]:
+            self.storage.save(name, ContentFile(b"content"))
+        self.assertEqual(
+            self.storage.listdir(""), (["uploads"], ["a.png", "b.png", "c.png"])
+        )
+        self.assertEqual(self.storage.listdir("uploads"), ([], ["d.png"]))
+        self.server.max_keys = 1000
+
+    def test_invalid_credentials(self):
+        storage = S3Storage(**self.server.storage_options(secret_key="wrong"))
+        with self.assertRaises(S3StorageError) as context:
+            storage.exists("image.png")
+        self.assertEqual(context.exception.status, 403)
+
+
+def create_test_image():
+    image_buffer = BytesIO()
+    Image.new("RGB", (1, 1)).save(image_buffer, "png")
+    return SimpleUploadedFile("test_image.png", image_buffer.getvalue())
+
+
+class S3ProfileImagesTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls, *args, **kwargs):
+        cls.server = FakeS3Server().start()
+        ## override_settings(STORAGES=...) doesn't keep the OPTIONS of the default storage in Django 5.0, so the storage of the field is replaced instead
+        cls.storage = patch.object(
+            Profile._meta.get_field("profile_image"),
+            "storage",
+            S3Storage(**cls.server.storage_options()),
+        )
+        cls.storage.start()
+        super().setUpClass(*args, **kwargs)
+
+    @classmethod
+    def tearDownClass(cls, *args, **kwargs):
+        super().tearDownClass(*args, **kwargs)
+        cls.storage.stop()
+        cls.server.stop()
+
+    def test_profile_image_lifecycle(self):
+        account = Account.objects.create_user(
+            username="johndoe",
+            email="johndoe@mail.com",
+            phone_number=123456789,
+            profile_image=create_test_image(),
+        )
+        image_name = account.profile.profile_image.name
+        self.assertEqual(
+            sorted(self.server.objects), [image_name + ".png", image_name + ".webp"]
+        )
+        account.delete()
+        self.assertEqual(self.server.objects, {})
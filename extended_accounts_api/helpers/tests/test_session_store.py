@@ -0,0 +1,167 @@
+from django.contrib.auth import SESSION_KEY, HASH_SESSION_KEY
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from extended_accounts_api.helpers.session_store import (
+    SessionStore,
+    revoke_account_sessions,
+)
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    AccountSessionModel as AccountSession,
+)
+from datetime import timedelta
+
+
+class SessionStoreTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.session = SessionStore()
+        self.session["foo"] = "bar"
+        self.session.save()
+
+    def test_create_writes_ddbb(self):
+        session = Session.objects.get(session_key=self.session.session_key)
+        self.assertEqual(session.get_decoded(), {"foo": "bar"})
+
+    def test_load_from_cache(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(SessionStore(self.session.session_key)["foo"], "bar")
+
+    def test_write_behind(self):
+        self.session["foo"] = "baz"
+        with self.assertNumQueries(0):  ## The change is only written to the cache
+            self.session.save()
+        self.assertEqual(SessionStore(self.session.session_key)["foo"], "baz")
+        self.assertEqual(
+            Session.objects.get(session_key=self.session.session_key).get_decoded(),
+            {"foo": "bar"},
+        )
+
+    @override_settings(SESSION_WRITE_BEHIND_SECONDS=0)
+    def test_write_behind_window_expired(self):
+        self.session["foo"] = "baz"
+        self.session.save()
+        self.assertEqual(
+            Session.objects.get(session_key=self.session.session_key).get_decoded(),
+            {"foo": "baz"},
+        )
+
+    def test_authentication_changes_written_to_ddbb(self):
+        account = Account.objects.create_user(
+            username="johndoe", email="johndoe@mail.com", phone_number=123456789
+        )
+        self.session[SESSION_KEY] = str(account.pk)
+        self.session[HASH_SESSION_KEY] = "hash"
+        self.session.save()
+        self.assertEqual(
+            Session.objects.get(session_key=self.session.session_key).get_decoded()[
+                SESSION_KEY
+            ],
+            str(account.pk),
+        )
+
+    def test_lost_cache_falls_back_to_ddbb(self):
+        cache.clear()
+        self.assertEqual(SessionStore(self.session.session_key)["foo"], "bar")
+        self.session["foo"] = "baz"
+        self.session.save()  ## The sync marker was lost with the cache, so the session is written to the ddbb
+        self.assertEqual(
+            Session.objects.get(session_key=self.session.session_key).get_decoded(),
+            {"foo": "baz"},
+        )
+
+    def test_delete(self):
+        session_key = self.session.session_key
+        self.session.flush()
+        self.assertFalse(Session.objects.filter(session_key=session_key).exists())
+        self.assertEqual(SessionStore(session_key).load(), {})
+
+
+class AccountSessionIndexTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.account = Account.objects.create_user(
+            username="johndoe", email="johndoe@mail.com", phone_number=123456789
+        )
+        self.sessions = [self.login() for _ in range(3)]
+
+    def login(self, account=None):
+        session = SessionStore()
+        session[SESSION_KEY] = str((account or self.account).pk)
+        session[HASH_SESSION_KEY] = "hash"
+        session.save()
+        return session
+
+    def test_sessions_indexed(self):
+        self.assertEqual(
+            set(
+                AccountSession.objects.filter(account=self.account).values_list(
+                    "session_key", flat=True
+                )
+            ),
+            {session.session_key for session in self.sessions},
+        )
+
+    def test_write_behind_not_indexed_again(self):
+        self.sessions[0]["foo"] = "bar"
+        with self.assertNumQueries(0):
+            self.sessions[0].save()
+
+    @override_settings(SESSION_WRITE_BEHIND_SECONDS=0)
+    def test_expiry_refreshed_with_ddbb_writes(self):
+        AccountSession.objects.update(
+            expire_date=timezone.now() - timedelta(days=1)
+        )  ## As if the accounts logged in long ago
+        self.sessions[0]["foo"] = "bar"
+        self.sessions[0].save()
+        SessionStore.clear_expired()
+        self.assertEqual(
+            list(AccountSession.objects.values_list("session_key", flat=True)),
+            [self.sessions[0].session_key],
+        )
+        self.assertAlmostEqual(
+            AccountSession.objects.get().expire_date,
+            Session.objects.get(session_key=self.sessions[0].session_key).expire_date,
+            delta=timedelta(seconds=1),
+        )
+
+    def test_logout_and_flush(self):
+        del self.sessions[0][SESSION_KEY]
+        self.sessions[0].save()
+        self.sessions[1].flush()
+        self.assertEqual(
+            list(AccountSession.objects.values_list("session_key", flat=True)),
+            [self.sessions[2].session_key],
+        )
+
+    def test_anonymous_session_not_indexed(self):
+        session = SessionStore()
+        session["foo"] = "bar"
+        with CaptureQueriesContext(connection) as queries:
+            session.save()
+        self.assertFalse(
+            any(
+                AccountSession._meta.db_table in query["sql"]
+                for query in queries.captured_queries
+            )
+        )
+
+    def test_revoke_account_sessions(self):
+        other_account = Account.objects.create_user(
+            username="jdoe", email="jdoe@mail.com", phone_number=987654321
+        )
+        other_session = self.login(other_account)
+        with self.assertNumQueries(3):  ## Index lookup, sessions and index deletion
+            revoked = revoke_account_sessions(
+                self.account.pk, keep_session_key=self.sessions[0].session_key
+            )
+        self.assertEqual(revoked, 2)
+        for session in self.sessions[1:]:
+            self.assertEqual(SessionStore(session.session_key).load(), {})
+        self.assertIn(SESSION_KEY, SessionStore(self.sessions[0].session_key).load())
+        self.assertIn(SESSION_KEY, SessionStore(other_session.session_key).load())
+        self.assertEqual(AccountSession.objects.filter(account=self.account).count(), 1)
@@ -1,6 +1,16 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.core.files.uploadedfile import SimpleUploadedFile
 from extended_accounts_api.models import AccountModel as Account
-from extended_accounts_api.helpers import delete_unconfirmed_accounts
+from extended_accounts_api.helpers import (
+    delete_unconfirmed_accounts,
+    delete_unconfirmed_accounts_batch,
+    encode_profile_image,
+)
+from PIL import Image
+from io import BytesIO
+import tempfile, shutil, os
+
+MEDIA_ROOT = tempfile.mkdtemp()
 
 
 class TasksTestCase(TestCase):
@@ -28,3 +38,44 @@ class TasksTestCase(TestCase):
     ## If the task is launched on a non-existent user (for example because the user deletes it before the task completes), no exception is raised
     def test_non_existent_user_non_blocking(self):
         delete_unconfirmed_accounts.s(username="user_1").apply()
+
+    def test_delete_unconfirmed_accounts_batch(self):
+        for index, is_active in enumerate([False, True, False]):
+            Account.objects.create_user(
+                username=f"user_{index}",
+                phone_number=index,
+                email=f"user{index}@mail.com",
+                is_active=is_active,
+            )
+        delete_unconfirmed_accounts_batch.s(["user_0", "user_1", "user_3"]).apply()
+        self.assertEqual(
+            list(
+                Account.objects.order_by("username").values_list("username", flat=True)
+            ),
+            ["user_1", "user_2"],
+        )
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, PROFILE_IMAGE_ASYNC_ENCODING=True)
+class EncodeProfileImageTaskTestCase(TestCase):
+    @classmethod
+    def tearDownClass(cls, *args, **kwargs):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass(*args, **kwargs)
+
+    def test_encode_profile_image(self):
+        image_buffer = BytesIO()
+        Image.new("RGB", (1, 1)).save(image_buffer, "png")
+        account = Account.objects.create_user(
+            username="johndoe",
+            email="johndoe@mail.com",
+            phone_number=123456789,
+            profile_image=SimpleUploadedFile("image.png", image_buffer.getvalue()),
+        )  ## TestCase doesn't run on_commit callbacks, so the task isn't called
+        image_name = account.profile.profile_image.name
+        self.assertNotIn(image_name + ".webp", os.listdir(MEDIA_ROOT))
+        encode_profile_image.s(image_name).apply()
+        self.assertIn(image_name + ".webp", os.listdir(MEDIA_ROOT))
+
+    def test_deleted_image_non_blocking(self):
+        encode_profile_image.s("0" * 64).apply()
@@ -0,0 +1,122 @@
+from django.core import signing
+from django.test import TestCase, override_settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from extended_accounts_api.helpers import (
+    AccessTokenAuthentication,
+    issue_tokens,
+    rotate_refresh_token,
+    revoke_refresh_token,
+    revoke_access_token,
+)
+from extended_accounts_api.helpers.token_authentication import (
+    RevokedAccessTokens,
+    revoked_access_tokens,
+)
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    RefreshTokenModel as RefreshToken,
+)
+import time
+
+
+class TokenAuthenticationTestCase(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.authentication = AccessTokenAuthentication()
+        self.account = Account.objects.create_user(
+            username="johndoe",
+            email="johndoe@mail.com",
+            phone_number=123456789,
+            is_active=True,
+        )
+        self.tokens = issue_tokens(self.account)
+        revoked_access_tokens.clear()
+
+    def __authenticate(self, token):
+        request = self.factory.get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return self.authentication.authenticate(request)
+
+    def test_issue_tokens(self):
+        self.assertEqual(RefreshToken.objects.filter(account=self.account).count(), 1)
+        self.assertFalse(
+            RefreshToken.objects.filter(token_hash=self.tokens["refresh"]).exists()
+        )  ## Only the hash of the token is stored
+
+    def test_authenticate_OK(self):
+        with self.assertNumQueries(0):
+            account, payload = self.__authenticate(self.tokens["access"])
+            self.assertEqual(account, self.account)
+            self.assertEqual(account.username, self.account.username)
+            self.assertFalse(account.is_staff)
+        self.assertEqual(payload["id"], self.account.pk)
+
+    def test_no_token(self):
+        self.assertIsNone(self.authentication.authenticate(self.factory.get("/")))
+        request = self.factory.get("/", HTTP_AUTHORIZATION="Basic whatever")
+        self.assertIsNone(self.authentication.authenticate(request))
+
+    def test_invalid_token(self):
+        with self.assertRaises(AuthenticationFailed):
+            self.__authenticate(self.tokens["access"] + "tampered")
+        with self.assertRaises(AuthenticationFailed):
+            self.__authenticate(
+                signing.dumps({"id": self.account.pk}, salt="other_salt")
+            )
+
+    @override_settings(ACCESS_TOKEN_LIFETIME=-1)
+    def test_expired_token(self):
+        with self.assertRaises(AuthenticationFailed):
+            self.__authenticate(self.tokens["access"])
+
+    def test_revoked_token(self):
+        _, payload = self.__authenticate(self.tokens["access"])
+        revoke_access_token(payload)
+        with self.assertRaises(AuthenticationFailed):
+            self.__authenticate(self.tokens["access"])
+
+    def test_inactive_account(self):
+        self.account.update(is_active=False)
+        with self.assertRaises(AuthenticationFailed):
+            self.__authenticate(issue_tokens(self.account)["access"])
+
+    def test_rotate_refresh_token(self):
+        tokens = rotate_refresh_token(self.tokens["refresh"])
+        account, _ = self.__authenticate(tokens["access"])
+        self.assertEqual(account, self.account)
+        self.assertIsNone(
+            rotate_refresh_token(self.tokens["refresh"])
+        )  ## Refresh tokens are single use
+        self.assertIsNotNone(rotate_refresh_token(tokens["refresh"]))
+
+    def test_rotate_refresh_token_inactive_account(self):
+        self.account.update(is_active=False)
+        self.assertIsNone(rotate_refresh_token(self.tokens["refresh"]))
+
+    @override_settings(REFRESH_TOKEN_LIFETIME=-1)
+    def test_rotate_expired_refresh_token(self):
+        self.assertIsNone(rotate_refresh_token(issue_tokens(self.account)["refresh"]))
+
+    def test_revoke_refresh_token(self):
+        revoke_refresh_token(self.tokens["refresh"])
+        self.assertIsNone(rotate_refresh_token(self.tokens["refresh"]))
+
+
+class RevokedAccessTokensTestCase(TestCase):
+    @override_settings(TOKEN_REVOCATION_CACHE_SIZE=2)
+    def test_bounded_size(self):
+        revoked = RevokedAccessTokens()
+        expires_at = time.time() + 60
+        for jti in ["a", "b", "c"]:
+            revoked.add(jti, expires_at)
+        self.assertEqual(len(revoked), 2)
+        self.assertNotIn("a", revoked)  ## The oldest revocation is discarded
+        self.assertIn("b", revoked)
+        self.assertIn("c", revoked)
+
+    def test_expired_revocations_discarded(self):
+        revoked = RevokedAccessTokens()
+        revoked.add("a", time.time() - 1)
+        self.assertNotIn("a", revoked)
+        revoked.add("b", time.time() + 60)
+        self.assertEqual(len(revoked), 1)
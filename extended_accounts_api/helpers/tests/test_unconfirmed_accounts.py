@@ -0,0 +1,82 @@
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from extended_accounts_api.helpers import (
+    schedule_unconfirmed_account_deletion,
+    flush_unconfirmed_account_deletions,
+    start_request_buffer,
+    end_request_buffer,
+)
+from unittest.mock import patch
+import datetime
+
+
+@patch(
+    "extended_accounts_api.helpers.tasks.delete_unconfirmed_accounts_batch.apply_async"
+)
+class UnconfirmedAccountsTestCase(TestCase):
+    def in_request(self):
+        start_request_buffer()
+        self.addCleanup(end_request_buffer)
+
+    def assertDeletedAfter(self, call, scheduled_at):
+        ## Deleted 15 minutes after the latest account of the message was created, not after it was published
+        self.assertGreaterEqual(
+            call.kwargs["eta"], scheduled_at + datetime.timedelta(minutes=15)
+        )
+        self.assertLess(
+            call.kwargs["eta"], timezone.now() + datetime.timedelta(minutes=15)
+        )
+
+    def test_published_after_commit(self, mock_apply_async):
+        self.in_request()
+        scheduled_at = timezone.now()
+        with self.captureOnCommitCallbacks() as callbacks:
+            schedule_unconfirmed_account_deletion("user_1")
+        flush_unconfirmed_account_deletions()
+        mock_apply_async.assert_not_called()  ## The transaction isn't committed yet
+        for callback in callbacks:
+            callback()
+        mock_apply_async.assert_not_called()  ## Buffered until the request finishes
+        flush_unconfirmed_account_deletions()
+        mock_apply_async.assert_called_once()
+        self.assertEqual(mock_apply_async.call_args.kwargs["args"], [["user_1"]])
+        self.assertDeletedAfter(mock_apply_async.call_args, scheduled_at)
+
+    def test_published_right_away_outside_requests(self, mock_apply_async):
+        ## Celery tasks, shell, management commands... don't wait for a flush that may never come
+        scheduled_at = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            schedule_unconfirmed_account_deletion("user_1")
+        mock_apply_async.assert_called_once()
+        self.assertEqual(mock_apply_async.call_args.kwargs["args"], [["user_1"]])
+        self.assertDeletedAfter(mock_apply_async.call_args, scheduled_at)
+
+    @override_settings(UNCONFIRMED_ACCOUNTS_BATCH_SIZE=2)
+    def test_published_in_batches(self, mock_apply_async):
+        self.in_request()
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(5):
+                schedule_unconfirmed_account_deletion(f"user_{index}")
+        self.assertEqual(
+            [call.kwargs["args"] for call in mock_apply_async.call_args_list],
+            [[["user_0", "user_1"]], [["user_2", "user_3"]]],
+        )
+        flush_unconfirmed_account_deletions()
+        self.assertEqual(mock_apply_async.call_args.kwargs["args"], [["user_4"]])
+
+    def test_kept_if_publishing_fails(self, mock_apply_async):
+        mock_apply_async.side_effect = ConnectionError
+        scheduled_at = timezone.now()
+        with self.assertLogs(
+            "extended_accounts_api.helpers.unconfirmed_accounts", "ERROR"
+        ):
+            with self.captureOnCommitCallbacks(
+                execute=True
+            ):  ## The broker error doesn't reach the code creating the account
+                schedule_unconfirmed_account_deletion("user_1")
+        with self.assertRaises(ConnectionError):
+            flush_unconfirmed_account_deletions()
+        mock_apply_async.side_effect = None
+        flush_unconfirmed_account_deletions()
+        self.assertEqual(mock_apply_async.call_args.kwargs["args"], [["user_1"]])
+        self.assertDeletedAfter(mock_apply_async.call_args, scheduled_at)
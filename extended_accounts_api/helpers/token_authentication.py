@@ -0,0 +1,179 @@
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_protect
+from rest_framework import authentication, exceptions
+from extended_accounts_api.models import RefreshTokenModel as RefreshToken
+from .account_cache import compact_account
+from collections import OrderedDict
+from datetime import timedelta
+from functools import wraps
+from uuid import uuid4
+import hashlib, secrets, threading, time
+
+ACCESS_TOKEN_SALT = "extended_accounts_api.access_token"
+## Fields of the account carried by the access tokens, so they can be authenticated without querying the ddbb
+ACCESS_TOKEN_ACCOUNT_FIELDS = [
+    "id",
+    "username",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+]
+
+
+class RevokedAccessTokens:
+    """
+    Bounded in-process list of revoked access tokens. Access tokens are short-lived, so a revoked token is forgotten once it has expired. If the list is full, the oldest revocations are discarded first.
+    As the list lives in each process, a revocation is only seen by the process that received it, keep ACCESS_TOKEN_LIFETIME short accordingly.
+    """
+
+    def __init__(self):
+        self.__tokens = OrderedDict()  ## jti -> expiration timestamp
+        self.__lock = threading.Lock()
+
+    def add(self, jti, expires_at):
+        with self.__lock:
+            self.__discard_expired()
+            self.__tokens[jti] = expires_at
+            self.__tokens.move_to_end(jti)
+            while len(self.__tokens) > settings.TOKEN_REVOCATION_CACHE_SIZE:
+                self.__tokens.popitem(last=False)
+
+    def clear(self):
+        with self.__lock:
+            self.__tokens.clear()
+
+    def __contains__(self, jti):
+        expires_at = self.__tokens.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def __len__(self):
+        return len(self.__tokens)
+
+    def __discard_expired(self):
+        now = time.time()
+        for jti, expires_at in list(self.__tokens.items()):
+            if expires_at <= now:
+                del self.__tokens[jti]
+
+
+revoked_access_tokens = RevokedAccessTokens()
+
+
+def hash_refresh_token(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_tokens(account):
+    access_payload = {
+        field: getattr(account, field) for field in ACCESS_TOKEN_ACCOUNT_FIELDS
+    }
+    access_payload["jti"] = uuid4().hex
+    access_payload["exp"] = int(time.time()) + settings.ACCESS_TOKEN_LIFETIME
+    refresh_token = secrets.token_urlsafe(32)
+    access_payload["refresh_token_hash"] = hash_refresh_token(
+        refresh_token
+    )  ## So the refresh token of the client can be told apart when revoking the rest of them. The hash can't be exchanged for tokens
+    RefreshToken.objects.create(
+        token_hash=access_payload["refresh_token_hash"],
+        account=account,
+        expires_at=timezone.now() + timedelta(seconds=settings.REFRESH_TOKEN_LIFETIME),
+    )
+    return {
+        "access": signing.dumps(access_payload, salt=ACCESS_TOKEN_SALT),
+        "refresh": refresh_token,
+        "expires_in": settings.ACCESS_TOKEN_LIFETIME,
+    }
+
+
+def rotate_refresh_token(token):
+    """
+    Exchange a refresh token for a new pair of tokens. Refresh tokens are single use, so the exchanged one is revoked. Return None if the token isn't valid or its account is no longer active.
+    """
+    try:
+        refresh_token = RefreshToken.objects.select_related("account").get(
+            token_hash=hash_refresh_token(token), expires_at__gt=timezone.now()
+        )
+    except RefreshToken.DoesNotExist:
+        return None
+    refresh_token.delete()
+    if not refresh_token.account.is_active:
+        return None
+    return issue_tokens(refresh_token.account)
+
+
+def revoke_refresh_token(token):
+    RefreshToken.objects.filter(token_hash=hash_refresh_token(token)).delete()
+
+
+def revoke_account_refresh_tokens(account_id, keep_token_hash=None):
+    """
+    Revoke the refresh tokens of the account, except the one with keep_token_hash if given, so the token clients are logged out along with the sessions. Return the number of revoked tokens.
+    """
+    deleted, _ = (
+        RefreshToken.objects.filter(account_id=account_id)
+        .exclude(token_hash=keep_token_hash)
+        .delete()
+    )
+    return deleted
+
+
+def request_refresh_token_hash(request):
+    """
+    Hash of the refresh token issued along with the access token authenticating the request, if any.
+    """
+    if isinstance(request.auth, dict):
+        return request.auth.get("refresh_token_hash")
+    return None
+
+
+def revoke_access_token(payload):
+    revoked_access_tokens.add(payload["jti"], payload["exp"])
+
+
+def get_authorization_token(request):
+    authorization = authentication.get_authorization_header(request).split()
+    if len(authorization) != 2 or authorization[0].lower() != b"bearer":
+        return None
+    return authorization[1].decode("latin-1")
+
+
+class AccessTokenAuthentication(authentication.BaseAuthentication):
+    """
+    Authenticate the requests sending an access token in the header "Authorization: Bearer <token>". Access tokens are signed, so they're verified without querying the ddbb.
+    """
+
+    def authenticate(self, request):
+        token = get_authorization_token(request)
+        if token is None:
+            return None
+        try:
+            payload = signing.loads(
+                token, salt=ACCESS_TOKEN_SALT, max_age=settings.ACCESS_TOKEN_LIFETIME
+            )
+        except signing.BadSignature:  ## SignatureExpired is a subclass of BadSignature
+            raise exceptions.AuthenticationFailed("Invalid or expired access token")
+        if payload["jti"] in revoked_access_tokens:
+            raise exceptions.AuthenticationFailed("The access token has been revoked")
+        if not payload["is_active"]:
+            raise exceptions.AuthenticationFailed("The account isn't active")
+        return (compact_account(payload), payload)
+
+    def authenticate_header(self, request):
+        return "Bearer"
+
+
+def csrf_protect_unless_token(view_func):
+    """
+    Apply csrf_protect unless the request is sent with an access token. CSRF attacks rely on the browser automatically sending the session cookie, which never happens with the Authorization header, so requests from token clients don't need the CSRF token.
+    """
+    protected_view_func = csrf_protect(view_func)
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if get_authorization_token(request) is not None:
+            return view_func(request, *args, **kwargs)
+        return protected_view_func(request, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .tasks import delete_unconfirmed_accounts_batch
+import atexit, datetime, logging, threading
+
+logger = logging.getLogger(__name__)
+
+UNCONFIRMED_ACCOUNT_LIFETIME = datetime.timedelta(minutes=15)
+
+_lock = threading.Lock()
+_pending_usernames = []
+_latest_buffered_at = (
+    None  ## The message is delayed from the latest username, so none is deleted early
+)
+_active_requests = 0
+
+
+def schedule_unconfirmed_account_deletion(username):
+    """
+    Schedule the deletion of the account if it isn't confirmed in 15 minutes. Nothing is published while the transaction creating the account is open. Once it's committed, the username is published right away if no request is being handled by the process (Celery tasks, shell, management commands...). Otherwise it's buffered, and the buffered usernames of the process are published in a single message at the end of the request, or as soon as UNCONFIRMED_ACCOUNTS_BATCH_SIZE of them are buffered. Buffering may delay the deletion of the account by the duration of the request, never advance it.
+    """
+    transaction.on_commit(lambda: _buffer_username(username))
+
+
+def start_request_buffer():
+    global _active_requests
+    with _lock:
+        _active_requests += 1
+
+
+def end_request_buffer():
+    global _active_requests
+    with _lock:
+        _active_requests = max(_active_requests - 1, 0)
+
+
+def _buffer_username(username):
+    global _latest_buffered_at
+    with _lock:
+        _pending_usernames.append(username)
+        _latest_buffered_at = timezone.now()
+        publish = (
+            not _active_requests
+            or len(_pending_usernames) >= settings.UNCONFIRMED_ACCOUNTS_BATCH_SIZE
+        )
+    if publish:
+        try:
+            flush_unconfirmed_account_deletions()
+        except (
+            Exception
+        ):  ## The account is already created, the usernames are published by the next flush
+            logger.exception("Couldn't publish the unconfirmed account deletions")
+
+
+def flush_unconfirmed_account_deletions():
+    global _latest_buffered_at
+    with _lock:
+        usernames = _pending_usernames[:]
+        latest_buffered_at = _latest_buffered_at
+        _pending_usernames.clear()
+        _latest_buffered_at = None
+    if not usernames:
+        return
+    try:
+        delete_unconfirmed_accounts_batch.apply_async(
+            args=[usernames],
+            eta=latest_buffered_at + UNCONFIRMED_ACCOUNT_LIFETIME,
+        )
+    except (
+        Exception
+    ):  ## The broker is down, the usernames are published by the next flush
+        with _lock:
+            _pending_usernames[:0] = usernames
+            if _latest_buffered_at is None or _latest_buffered_at < latest_buffered_at:
+                _latest_buffered_at = latest_buffered_at
+        raise
+
+
+atexit.register(
+    flush_unconfirmed_account_deletions
+)  ## What's still buffered, if the broker was down on the last flush
@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from extended_accounts_api.helpers import AccountSerializer, AccountRowSerializer
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    ProfileModel as Profile,
+)
+import time
+
+
+def sample_accounts(count):
+    """
+    Unsaved accounts with their profiles, and the rows AccountRowSerializer would read for them, so the serializers are compared without querying the ddbb.
+    """
+    accounts, rows = [], []
+    date_joined = timezone.now()
+    for number in range(count):
+        account = Account(username=f"user_{number}", email=f"user_{number}@mail.com")
+        account.profile = Profile(
+            first_name="John",
+            last_name="Doe",
+            phone_number=100000000 + number,
+            profile_image=f"{number:064x}",
+            date_joined=date_joined,
+        )
+        accounts.append(account)
+        rows.append(
+            (
+                account.username,
+                "John",
+                "Doe",
+                account.email,
+                100000000 + number,
+                f"{number:064x}",
+                date_joined,
+            )
+        )
+    return accounts, rows
+
+
+def best_time(function, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+class Command(BaseCommand):
+    help = "Compare the time AccountSerializer and AccountRowSerializer take to represent a list of accounts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        accounts, rows = sample_accounts(options["count"])
+        model_serializer = lambda: AccountSerializer(accounts, many=True).data
+        row_serializer = lambda: AccountRowSerializer().to_representation_many(rows)
+        if model_serializer() != row_serializer():
+            self.stderr.write("The serializers produce different representations")
+            return
+        model_time = best_time(model_serializer, options["repeat"])
+        row_time = best_time(row_serializer, options["repeat"])
+        for name, elapsed in [
+            ("AccountSerializer", model_time),
+            ("AccountRowSerializer", row_time),
+        ]:
+            self.stdout.write(
+                f"{name}: {elapsed * 1000:.1f} ms ({elapsed / options['count'] * 1e6:.1f} us per account)"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Speedup: {model_time / row_time:.1f}x"))
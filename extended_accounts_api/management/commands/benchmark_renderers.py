@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from extended_accounts_api.helpers import (
+    AccountRowSerializer,
+    ORJSONRenderer,
+    MessagePackRenderer,
+)
+from extended_accounts_api.helpers.renderers import orjson, msgpack
+from .benchmark_account_serializer import sample_accounts, best_time
+
+
+class Command(BaseCommand):
+    help = "Compare the time the available renderers take to render large account lists and batch retrieve responses, and the size of the rendered payloads"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        _, rows = sample_accounts(options["count"])
+        account_list = AccountRowSerializer().to_representation_many(rows)
+        payloads = {
+            "list": account_list,
+            "batch": {account["username"]: account for account in account_list},
+        }
+        renderers = {"JSONRenderer": JSONRenderer()}
+        if orjson is not None:
+            renderers["ORJSONRenderer"] = ORJSONRenderer()
+        else:
+            self.stderr.write("orjson isn't installed, skipping ORJSONRenderer")
+        if msgpack is not None:
+            renderers["MessagePackRenderer"] = MessagePackRenderer()
+        else:
+            self.stderr.write("msgpack isn't installed, skipping MessagePackRenderer")
+        for payload_name, payload in payloads.items():
+            baseline = None
+            for renderer_name, renderer in renderers.items():
+                elapsed = best_time(lambda: renderer.render(payload), options["repeat"])
+                size = len(renderer.render(payload))
+                baseline = baseline or (elapsed, size)
+                self.stdout.write(
+                    f"{payload_name} {renderer_name}: {elapsed * 1000:.1f} ms ({baseline[0] / elapsed:.1f}x), {size} bytes ({size / baseline[1]:.0%})"
+                )
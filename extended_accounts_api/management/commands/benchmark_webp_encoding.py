@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from extended_accounts_api.helpers.image_processing import encode_webp
+from PIL import Image, ImageChops
+import tempfile, math, time, os
+
+
+def synthetic_image(size=1024):
+    """
+    Photo-like image (smooth gradient with noise) used when no sample images are given.
+    """
+    gradient = Image.linear_gradient("L").resize((size, size))
+    noise = Image.effect_noise((size, size), 8)
+    return Image.merge(
+        "RGB", [gradient, ImageChops.add(gradient, noise, scale=2), noise]
+    )
+
+
+def similarity(original_path, encoded_path):
+    """
+    PSNR of the encoded image against the original, in dB. Higher is better; 100 means identical images.
+    """
+    with Image.open(original_path) as original, Image.open(encoded_path) as encoded:
+        original = original.convert("RGB").resize(encoded.size)
+        histogram = ImageChops.difference(original, encoded.convert("RGB")).histogram()
+    squared_error = sum(
+        count * (value % 256) ** 2 for value, count in enumerate(histogram)
+    )
+    mean_squared_error = squared_error / (encoded.width * encoded.height * 3)
+    if mean_squared_error == 0:
+        return 100.0
+    return 10 * math.log10(255**2 / mean_squared_error)
+
+
+class Command(BaseCommand):
+    help = "Encode sample images with several WebP quality/method settings and suggest the PROFILE_IMAGE_WEBP_OPTIONS producing the smallest files within the quality and time budgets"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "images",
+            nargs="*",
+            help="Sample images. A synthetic image is used if none is given",
+        )
+        parser.add_argument(
+            "--qualities", type=int, nargs="+", default=[60, 70, 75, 80, 85, 90]
+        )
+        parser.add_argument("--methods", type=int, nargs="+", default=[0, 2, 4, 6])
+        parser.add_argument(
+            "--min-psnr",
+            type=float,
+            default=32.0,
+            help="Minimum average PSNR (dB) of the suggested settings",
+        )
+        parser.add_argument(
+            "--max-encode-time",
+            type=float,
+            default=0.5,
+            help="Maximum average encode time (s) of the suggested settings",
+        )
+        parser.add_argument("--repeat", type=int, default=1)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            images = options["images"]
+            if not images:
+                images = [os.path.join(directory, "synthetic.png")]
+                synthetic_image().save(images[0])
+            destination_path = os.path.join(directory, "encoded.webp")
+            results = []
+            for quality in options["qualities"]:
+                for method in options["methods"]:
+                    webp_options = {"quality": quality, "method": method}
+                    size = encode_time = psnr = 0
+                    for image in images:
+                        for _ in range(options["repeat"]):
+                            started = time.perf_counter()
+                            encode_webp(
+                                image,
+                                destination_path,
+                                settings.PROFILE_IMAGE_MAX_PIXELS,
+                                settings.PROFILE_IMAGE_MAX_DIMENSION,
+                                webp_options,
+                            )
+                            encode_time += time.perf_counter() - started
+                        size += os.path.getsize(destination_path)
+                        psnr += similarity(image, destination_path)
+                    results.append(
+                        (
+                            webp_options,
+                            size / len(images),
+                            encode_time / (len(images) * options["repeat"]),
+                            psnr / len(images),
+                        )
+                    )
+        self.stdout.write(
+            f"{'quality':>8} {'method':>7} {'avg size (B)':>13} {'avg time (s)':>13} {'PSNR (dB)':>10}"
+        )
+        for webp_options, size, encode_time, psnr in results:
+            self.stdout.write(
+                f"{webp_options['quality']:>8} {webp_options['method']:>7} {size:>13.0f} {encode_time:>13.4f} {psnr:>10.2f}"
+            )
+        candidates = [
+            result
+            for result in results
+            if result[3] >= options["min_psnr"]
+            and result[2] <= options["max_encode_time"]
+        ]
+        if not candidates:
+            self.stdout.write(
+                self.style.WARNING(
+                    "No settings meet the quality and time budgets, consider relaxing them"
+                )
+            )
+            return
+        suggested = min(candidates, key=lambda result: (result[1], result[2]))
+        self.stdout.write(
+            self.style.SUCCESS(f"PROFILE_IMAGE_WEBP_OPTIONS = {suggested[0]}")
+        )
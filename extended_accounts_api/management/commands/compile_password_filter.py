@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.contrib.auth.password_validation import CommonPasswordValidator
+from django.core.management.base import BaseCommand
+from extended_accounts_api.helpers.bloom_filter import BloomFilter
+from extended_accounts_api.helpers.password_validation import password_key
+import gzip, time
+
+
+def read_lines(path):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", errors="replace") as file:
+        for line in file:
+            line = line.rstrip("\r\n")
+            if line:
+                yield line
+
+
+def password_keys(paths, source_format):
+    for path in paths:
+        for line in read_lines(path):
+            if source_format == "sha1":
+                yield line.split(":")[0].upper()  ## SHA1:count lines
+            else:
+                yield password_key(line.lower().strip())
+
+
+class Command(BaseCommand):
+    help = "Compile password lists into the memory-mapped bloom filter read by BreachedPasswordValidator. Lists may be plain (a password per line) or in the Have I Been Pwned SHA-1 format (HASH:count per line), optionally gzipped. Without lists, Django's common passwords list is compiled."
+
+    def add_arguments(self, parser):
+        parser.add_argument("lists", nargs="*")
+        parser.add_argument(
+            "--format", choices=["plain", "sha1"], default="plain", dest="source_format"
+        )
+        parser.add_argument("--error-rate", type=float, default=0.001)
+        parser.add_argument(
+            "--capacity",
+            type=int,
+            default=None,
+            help="Number of passwords, counted with an extra pass over the lists if not given",
+        )
+        parser.add_argument("--output", default=None)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        paths = options["lists"] or [
+            CommonPasswordValidator().DEFAULT_PASSWORD_LIST_PATH
+        ]
+        capacity = options["capacity"] or sum(
+            1 for path in paths for _ in read_lines(path)
+        )
+        bloom_filter = BloomFilter(capacity, options["error_rate"])
+        count = 0
+        for key in password_keys(paths, options["source_format"]):
+            bloom_filter.add(key)
+            count += 1
+        output = str(options["output"] or settings.PASSWORD_FILTER_PATH)
+        bloom_filter.save(output)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Compiled {count} passwords into {output} ({len(bloom_filter.bits) / 1024 / 1024:.1f} MiB) in {time.perf_counter() - started:.1f}s"
+            )
+        )
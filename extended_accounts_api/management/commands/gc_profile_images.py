@@ -0,0 +1,149 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from extended_accounts_api.models import (
+    ProfileModel as Profile,
+    ProfileImageBlobModel as ProfileImageBlob,
+)
+from extended_accounts_api.helpers import (
+    profile_image_storage,
+    unreferenced_profile_images,
+    delete_profile_image_files,
+    discard_expired_uploads,
+)
+from extended_accounts_api.helpers.bloom_filter import BloomFilter
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from itertools import islice
+import datetime, os, re, time
+
+PROFILE_IMAGE_FILE = re.compile(r"^([0-9a-f]+)\.[a-z0-9]+$")
+
+
+def stored_profile_images(storage):
+    """
+    Yield the names of the files in the profile images storage along with their modification time, or None if it isn't known yet. Local directories are streamed with os.scandir, so they aren't loaded in memory.
+    """
+    try:
+        location = storage.path("")
+    except NotImplementedError:  ## Remote storage
+        for file_name in storage.listdir("")[1]:
+            yield file_name, None
+        return
+    try:
+        with os.scandir(location) as scan:
+            for entry in scan:
+                if entry.is_file():
+                    yield entry.name, entry.stat().st_mtime
+    except FileNotFoundError:
+        return
+
+
+def referenced_profile_images(chunk_size, bloom_filter_threshold):
+    """
+    Digests of the referenced profile images, loaded in chunks: those with a reference count and those stored before images were reference counted. If there are more than bloom_filter_threshold of them, they're loaded in a bloom filter, so some orphans may be kept but no referenced image is ever taken as orphan.
+    """
+    querysets = [
+        ProfileImageBlob.objects.values_list("digest", flat=True),
+        Profile.objects.exclude(profile_image__isnull=True)
+        .exclude(profile_image="")
+        .values_list("profile_image", flat=True),
+    ]
+    count = sum(queryset.count() for queryset in querysets)
+    references = BloomFilter(count) if count > bloom_filter_threshold else set()
+    for queryset in querysets:
+        for digest in queryset.iterator(chunk_size=chunk_size):
+            references.add(digest)
+    return references
+
+
+class Command(BaseCommand):
+    help = "Delete the files of the profile images storage not referenced by any profile, such as those left behind by failed deletions or interrupted conversions, and the abandoned chunked uploads"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the orphan files without deleting them",
+        )
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=3600,
+            help="Only files older than this many seconds are deleted, so images being uploaded are kept",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--bloom-filter-threshold",
+            type=int,
+            default=1000000,
+            help="Load the references in a bloom filter if there are more than this many",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument(
+            "--upload-max-age",
+            type=int,
+            default=None,
+            help="Discard the chunked uploads started more than this many seconds ago (PROFILE_IMAGE_UPLOAD_MAX_AGE by default)",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        storage = profile_image_storage()
+        references = referenced_profile_images(
+            options["chunk_size"], options["bloom_filter_threshold"]
+        )
+        max_modified_time = (
+            timezone.now() - datetime.timedelta(seconds=options["min_age"])
+        ).timestamp()
+        scanned = orphans = 0
+
+        def orphan_files():
+            nonlocal scanned, orphans
+            for file_name, modified_time in stored_profile_images(storage):
+                scanned += 1
+                match = PROFILE_IMAGE_FILE.match(file_name)
+                if match is None or match.group(1) in references:
+                    continue
+                if modified_time is None:  ## Only asked for orphans
+                    modified_time = storage.get_modified_time(file_name).timestamp()
+                if modified_time > max_modified_time:
+                    continue
+                orphans += 1
+                if options["dry_run"] or options["verbosity"] > 1:
+                    self.stdout.write(file_name)
+                yield file_name
+
+        files = orphan_files()
+        if options["dry_run"]:
+            for _ in files:
+                pass
+        else:
+            with ThreadPoolExecutor(options["workers"]) as executor:
+                pending = deque()
+                for batch in iter(
+                    lambda: list(islice(files, options["batch_size"])), []
+                ):
+                    if len(pending) >= 2 * options["workers"]:
+                        pending.popleft().result()  ## Bounds the listed files kept in memory
+                    batch = unreferenced_profile_images(
+                        batch
+                    )  ## Checked again, as images may be referenced again while listing
+                    pending.append(executor.submit(delete_profile_image_files, batch))
+                for future in pending:
+                    future.result()
+        if not options["dry_run"]:
+            uploads = discard_expired_uploads(
+                settings.PROFILE_IMAGE_UPLOAD_MAX_AGE
+                if options["upload_max_age"] is None
+                else options["upload_max_age"]
+            )
+            if uploads:
+                self.stdout.write(f"Discarded {uploads} abandoned uploads")
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{'Found' if options['dry_run'] else 'Deleted'} {orphans} orphan files out of {scanned} in {elapsed:.2f}s ({scanned / elapsed if elapsed else 0:.0f} files/s)"
+            )
+        )
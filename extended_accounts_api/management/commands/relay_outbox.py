@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from extended_accounts_api.helpers import relay_outbox_events
+import time
+
+
+class Command(BaseCommand):
+    help = "Publish the account lifecycle events written to the outbox, polling it every OUTBOX_RELAY_INTERVAL seconds while it's empty"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Publish the pending events and exit",
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                published = relay_outbox_events(options["batch_size"])
+            except (
+                Exception
+            ) as error:  ## The sink is down, events are kept until it's back
+                if options["once"]:
+                    raise
+                self.stderr.write(f"Publishing failed: {error}")
+                published = 0
+            if published:
+                self.stdout.write(f"Published {published} events")
+            if options["once"]:
+                return
+            if not published:
+                time.sleep(settings.OUTBOX_RELAY_INTERVAL)
@@ -0,0 +1,19 @@
+from django.test import SimpleTestCase
+from django.core.management import call_command
+from io import StringIO
+
+
+class BenchmarkAccountSerializerTestCase(SimpleTestCase):
+    def test_benchmark_account_serializer(self):
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            "benchmark_account_serializer",
+            "--count",
+            "20",
+            "--repeat",
+            "1",
+            stdout=stdout,
+            stderr=stderr,
+        )
+        self.assertEqual(stderr.getvalue(), "")
+        self.assertIn("Speedup", stdout.getvalue())
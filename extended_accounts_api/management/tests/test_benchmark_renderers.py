@@ -0,0 +1,19 @@
+from django.test import SimpleTestCase
+from django.core.management import call_command
+from io import StringIO
+
+
+class BenchmarkRenderersTestCase(SimpleTestCase):
+    def test_benchmark_renderers(self):
+        stdout = StringIO()
+        call_command(
+            "benchmark_renderers",
+            "--count",
+            "20",
+            "--repeat",
+            "1",
+            stdout=stdout,
+            stderr=StringIO(),
+        )
+        self.assertIn("list JSONRenderer", stdout.getvalue())
+        self.assertIn("batch JSONRenderer", stdout.getvalue())
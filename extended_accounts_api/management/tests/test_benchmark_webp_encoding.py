@@ -0,0 +1,55 @@
+from django.test import SimpleTestCase
+from django.core.management import call_command
+from extended_accounts_api.management.commands.benchmark_webp_encoding import (
+    similarity,
+)
+from PIL import Image
+from io import StringIO
+import tempfile, shutil, os
+
+
+class BenchmarkWebpEncodingTestCase(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.image_path = os.path.join(self.directory, "image.png")
+        Image.new("RGB", (64, 64), "red").save(self.image_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_suggests_settings(self):
+        output = StringIO()
+        call_command(
+            "benchmark_webp_encoding",
+            self.image_path,
+            "--qualities",
+            "50",
+            "90",
+            "--methods",
+            "0",
+            "--min-psnr",
+            "0",
+            stdout=output,
+        )
+        output = output.getvalue()
+        self.assertEqual(
+            len(output.splitlines()), 4
+        )  ## Header, 2 results and suggestion
+        self.assertIn("PROFILE_IMAGE_WEBP_OPTIONS = {'quality'", output)
+
+    def test_no_settings_within_budget(self):
+        output = StringIO()
+        call_command(
+            "benchmark_webp_encoding",
+            "--qualities",
+            "50",
+            "--methods",
+            "0",
+            "--max-encode-time",
+            "0",
+            stdout=output,
+        )
+        self.assertIn("No settings meet", output.getvalue())
+
+    def test_similarity(self):
+        self.assertEqual(similarity(self.image_path, self.image_path), 100.0)
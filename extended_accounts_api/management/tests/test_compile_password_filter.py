@@ -0,0 +1,44 @@
+from django.test import SimpleTestCase, override_settings
+from django.core.management import call_command
+from extended_accounts_api.helpers.bloom_filter import BloomFilter
+from extended_accounts_api.helpers.password_validation import password_key
+from io import StringIO
+import gzip, os, tempfile
+
+
+class CompilePasswordFilterTestCase(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.directory.name, "passwords.bloom")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def compile(self, *args):
+        stdout = StringIO()
+        call_command("compile_password_filter", *args, stdout=stdout)
+        return BloomFilter.load(self.output), stdout.getvalue()
+
+    def test_compile_plain_gzipped_list(self):
+        path = os.path.join(self.directory.name, "passwords.txt.gz")
+        with gzip.open(path, "wt") as file:
+            file.write("hunter2\nCorrectHorse\n")
+        bloom_filter, output = self.compile(path, "--output", self.output)
+        self.assertIn(password_key("hunter2"), bloom_filter)
+        self.assertIn(password_key("correcthorse"), bloom_filter)
+        self.assertNotIn(password_key("g7#kQ!v9zPw2"), bloom_filter)
+        self.assertIn("Compiled 2 passwords", output)
+
+    def test_compile_sha1_list(self):
+        path = os.path.join(self.directory.name, "pwned.txt")
+        with open(path, "w") as file:
+            file.write(f"{password_key('hunter2').lower()}:12\n")
+        bloom_filter, _ = self.compile(
+            path, "--format", "sha1", "--capacity", "10", "--output", self.output
+        )
+        self.assertIn(password_key("hunter2"), bloom_filter)
+
+    def test_compile_default_list(self):
+        with override_settings(PASSWORD_FILTER_PATH=self.output):
+            bloom_filter, _ = self.compile()
+        self.assertIn(password_key("password"), bloom_filter)
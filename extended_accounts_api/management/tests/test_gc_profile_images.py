@@ -0,0 +1,120 @@
+from django.test import TestCase, override_settings
+from django.core.management import call_command
+from django.utils import timezone
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    ProfileModel as Profile,
+    ProfileImageBlobModel as ProfileImageBlob,
+    ProfileImageUploadModel as ProfileImageUpload,
+)
+from extended_accounts_api.helpers import S3Storage
+from extended_accounts_api.helpers.tests.fake_s3_server import FakeS3Server
+from unittest.mock import patch
+from io import StringIO
+import tempfile, shutil, time, os, datetime
+
+MEDIA_ROOT = tempfile.mkdtemp()
+UPLOAD_DIR = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, PROFILE_IMAGE_UPLOAD_DIR=UPLOAD_DIR)
+class GcProfileImagesTestCase(TestCase):
+    def setUp(self):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        os.makedirs(MEDIA_ROOT)
+        two_hours_ago = time.time() - 7200
+        for file_name in [
+            "aa.png",
+            "aa.webp",
+            "bb.webp",
+            "cc.png",
+            "cc.webp",
+            "notes.txt",
+        ]:
+            path = os.path.join(MEDIA_ROOT, file_name)
+            open(path, "w").close()
+            os.utime(path, (two_hours_ago, two_hours_ago))
+        open(os.path.join(MEDIA_ROOT, "dd.png"), "w").close()  ## Being uploaded
+        ProfileImageBlob.objects.create(digest="aa", extension="png", references=1)
+        account = Account.objects.create_user(
+            username="johndoe", email="johndoe@mail.com", phone_number=123456789
+        )
+        Profile.objects.filter(account=account).update(
+            profile_image="bb"
+        )  ## Stored before images were reference counted
+        self.account = account
+
+    @classmethod
+    def tearDownClass(cls, *args, **kwargs):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        shutil.rmtree(UPLOAD_DIR, ignore_errors=True)
+        super().tearDownClass(*args, **kwargs)
+
+    def test_gc_profile_images(self):
+        output = StringIO()
+        call_command("gc_profile_images", stdout=output)
+        self.assertEqual(
+            sorted(os.listdir(MEDIA_ROOT)),
+            ["aa.png", "aa.webp", "bb.webp", "dd.png", "notes.txt"],
+        )
+        self.assertIn("Deleted 2 orphan files out of 7", output.getvalue())
+
+    def test_dry_run(self):
+        output = StringIO()
+        call_command("gc_profile_images", "--dry-run", stdout=output)
+        self.assertEqual(len(os.listdir(MEDIA_ROOT)), 7)
+        output = output.getvalue()
+        self.assertIn("cc.png\n", output)
+        self.assertIn("Found 2 orphan files out of 7", output)
+
+    def test_bloom_filter(self):
+        call_command(
+            "gc_profile_images",
+            "--bloom-filter-threshold",
+            "0",
+            "--batch-size",
+            "1",
+            stdout=StringIO(),
+        )
+        self.assertEqual(
+            sorted(os.listdir(MEDIA_ROOT)),
+            ["aa.png", "aa.webp", "bb.webp", "dd.png", "notes.txt"],
+        )
+
+    def test_image_referenced_while_listing(self):
+        with patch(
+            "extended_accounts_api.management.commands.gc_profile_images.referenced_profile_images",
+            return_value=set(),
+        ):
+            call_command("gc_profile_images", stdout=StringIO())
+        self.assertIn(
+            "aa.png", os.listdir(MEDIA_ROOT)
+        )  ## Its reference count is checked before deleting it
+
+    def test_remote_storage(self):
+        server = FakeS3Server().start()
+        self.addCleanup(server.stop)
+        storage = S3Storage(**server.storage_options())
+        for file_name in ["aa.png", "cc.png"]:
+            storage.save(file_name, StringIO(""))
+        with patch.object(Profile._meta.get_field("profile_image"), "storage", storage):
+            call_command("gc_profile_images", "--min-age", "0", stdout=StringIO())
+        self.assertEqual(list(server.objects), ["aa.png"])
+
+    def test_abandoned_uploads(self):
+        upload = ProfileImageUpload.objects.create(
+            account=self.account, file_name="avatar.png", size=1000
+        )
+        ProfileImageUpload.objects.filter(pk=upload.pk).update(
+            created_at=timezone.now() - datetime.timedelta(days=2)
+        )
+        open(upload.path, "w").close()
+        call_command("gc_profile_images", "--dry-run", stdout=StringIO())
+        self.assertTrue(
+            ProfileImageUpload.objects.filter(pk=upload.pk).exists()
+        )  ## Only reported files are listed
+        output = StringIO()
+        call_command("gc_profile_images", stdout=output)
+        self.assertFalse(ProfileImageUpload.objects.filter(pk=upload.pk).exists())
+        self.assertFalse(os.path.exists(upload.path))
+        self.assertIn("Discarded 1 abandoned uploads", output.getvalue())
@@ -0,0 +1,24 @@
+from django.test import TestCase, override_settings
+from django.core.management import call_command
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    OutboxEventModel as OutboxEvent,
+)
+from extended_accounts_api.helpers.tests.test_outbox import published
+from io import StringIO
+
+
+@override_settings(
+    OUTBOX_SINK="extended_accounts_api.helpers.tests.test_outbox.list_sink"
+)
+class RelayOutboxTestCase(TestCase):
+    def test_relay_outbox(self):
+        published.clear()
+        Account.objects.create_user(
+            username="johndoe", email="johndoe@mail.com", phone_number=123456789
+        )
+        output = StringIO()
+        call_command("relay_outbox", "--once", stdout=output)
+        self.assertIn("Published 1 events", output.getvalue())
+        self.assertEqual(len(published), 1)
+        self.assertFalse(OutboxEvent.objects.exists())
@@ -9,6 +9,7 @@ from django.contrib.auth.models import (
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.contrib.auth.hashers import make_password
 from django.utils.translation import gettext_lazy as _
+from .indexes import PrefixSearchIndex
 
 
 class AccountManager(BaseUserManager):
@@ -43,9 +44,20 @@ class AccountManager(BaseUserManager):
             is_active=is_active,
         )
         account.password = make_password(password)
-        with transaction.atomic():  ## Atomic transaction, if anything goes wrong, everything must be rolled back
+        profile = Profile(account=account, **extra_fields)
+        with transaction.atomic(
+            using=self._db
+        ):  ## Atomic transaction, if anything goes wrong, everything must be rolled back
+            from extended_accounts_api.helpers import (
+                store_uploaded_profile_image,
+            )  ## Imported here because the helpers import the models
+
+            store_uploaded_profile_image(
+                profile
+            )  ## Before inserting the profile, so it's written only once
             account.save(using=self._db)
-            Profile.objects.create(account=account, **extra_fields)
+            profile.account = account
+            profile.save(using=self._db, force_insert=True)
         return account
 
     def create_user(self, username, password=None, **extra_fields):
@@ -137,6 +149,26 @@ class AccountModel(AbstractBaseUser, PermissionsMixin):
         verbose_name = _("user")
         verbose_name_plural = _("users")
         swappable = "AUTH_USER_MODEL"
+        indexes = [
+            PrefixSearchIndex(fields=["username"], name="account_username_prefix"),
+            PrefixSearchIndex(fields=["email"], name="account_email_prefix"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "username" in field_names:
+            instance._loaded_username = values[
+                field_names.index("username")
+            ]  ## So the cached representation of the former username is dropped if the account is renamed
+        return instance
+
+    def get_session_auth_hash(self):
+        ## Accounts restored from the accounts cache (see extended_accounts_api.helpers.account_cache) carry their session hash, so the password doesn't have to be loaded from the ddbb just to verify the session
+        try:
+            return self._cached_session_auth_hash
+        except AttributeError:
+            return super().get_session_auth_hash()
 
     def update(self, **kwargs):
         from .Profile import ProfileModel as Profile
@@ -0,0 +1,18 @@
+from django.db import models
+from django.conf import settings
+from django.utils import timezone
+
+
+class AccountSessionModel(models.Model):
+    """
+    Index of the sessions of each account, maintained by extended_accounts_api.helpers.session_store, so the sessions of an account are listed or revoked with an indexed query instead of decoding every session.
+    """
+
+    session_key = models.CharField(max_length=40, unique=True)
+    account = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="sessions",
+        on_delete=models.CASCADE,
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+    expire_date = models.DateTimeField(db_index=True)
@@ -0,0 +1,27 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxEventModel(models.Model):
+    """
+    Account lifecycle events waiting to be published. Events are written in the same transaction as the change they describe, so they're published only if it's committed, and a relay (see extended_accounts_api.helpers.outbox) publishes them afterwards in the order they were written, keeping the broker out of the request path.
+    """
+
+    CREATED = "created"
+    CONFIRMED = "confirmed"
+    PASSWORD_CHANGED = "password_changed"
+    DELETED = "deleted"
+    EVENT_CHOICES = [
+        (CREATED, "Created"),
+        (CONFIRMED, "Confirmed"),
+        (PASSWORD_CHANGED, "Password changed"),
+        (DELETED, "Deleted"),
+    ]
+
+    id = models.BigAutoField(primary_key=True)  ## Publication order
+    event = models.CharField(max_length=20, choices=EVENT_CHOICES)
+    account_id = (
+        models.BigIntegerField()
+    )  ## Not a foreign key, as the events of deleted accounts are kept until published
+    username = models.CharField(max_length=150)
+    created_at = models.DateTimeField(default=timezone.now)
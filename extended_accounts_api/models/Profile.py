@@ -1,27 +1,81 @@
 from django.db import models
 from django.utils import timezone
+from django.db.models.fields.files import ImageFieldFile
 from django.conf import settings
+from .ProfileImageBlob import ProfileImageBlobModel as ProfileImageBlob
+from .indexes import NamesSearchIndex
 from uuid import uuid4
+import hashlib, warnings
 
 
 def unique_image_name(instance, filename):
     """
-    This function is used by ImageField's upload_to in order to get a unique name for an updated image, obtained via uuid4.
-    WARNING: You might be tempted to use a lambda function instead of this one. That works perfectly when the application is running, but it fails when we make Django migrations. This is due to lambda functions cannot be serialized, which is a requirement for Django's migration framework. Therefore, to achieve a more consistent app, it is better to use this one.
+    Deprecated: profile images are named after the digest of their content (see ContentAddressedImageFieldFile). It's kept because the migrations generated before serialize it as upload_to of profile_image, and they must still import it.
     """
+    warnings.warn(
+        "unique_image_name is deprecated, profile images are content addressed",
+        DeprecationWarning,
+        stacklevel=2,
+    )
     return uuid4().hex + "." + filename.split(".")[-1]
 
 
+class ContentAddressedImageFieldFile(ImageFieldFile):
+    def save(self, name, content, save=True):
+        """
+        Store the image under the SHA-256 digest of the uploaded content. The digest is computed streaming the content by chunks, and if an identical image is already stored, nothing is written. Otherwise, the normalized image (oriented, downscaled and without metadata) is stored.
+        """
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        digest = digest.hexdigest()
+        extension = (
+            ProfileImageBlob.objects.filter(digest=digest)
+            .values_list("extension", flat=True)
+            .first()
+        )  ## The same image may have been stored with another extension (.jpg and .jpeg...)
+        name = self.field.generate_filename(
+            self.instance, f'{digest}.{extension or name.split(".")[-1].lower()}'
+        )
+        if self.storage.exists(name):
+            self.name = name
+        else:
+            from extended_accounts_api.helpers import (
+                normalize_profile_image,
+            )  ## Imported here because the helpers import the models
+
+            content = normalize_profile_image(content)
+            self.name = self.storage.save(
+                name, content, max_length=self.field.max_length
+            )
+            self.file = content  ## The renditions are encoded from the normalized image
+        setattr(self.instance, self.field.attname, self.name)
+        self._committed = True
+        if save:
+            self.instance.save()
+
+    save.alters_data = True
+
+
+class ContentAddressedImageField(models.ImageField):
+    attr_class = ContentAddressedImageFieldFile
+
+
 class ProfileModel(models.Model):
     first_name = models.CharField(max_length=150)
     last_name = models.CharField(max_length=150)
     phone_number = models.IntegerField(
         unique=True, null=True
     )  ## We have to allow null here, otherwise it'll throw an error when creating users from the CLI. Otherwise we must pass this field to the Account Model but it's not worthy of that. It's OK with theoretically allowing null but we won't allow it in forms or serializers.
-    profile_image = models.ImageField(
-        upload_to=unique_image_name, default=None, null=True
-    )
+    profile_image = ContentAddressedImageField(default=None, null=True)
     date_joined = models.DateTimeField(default=timezone.now)
     account = models.OneToOneField(
         settings.AUTH_USER_MODEL, related_name="profile", on_delete=models.CASCADE
     )
+
+    class Meta:
+        indexes = [
+            NamesSearchIndex(
+                fields=["first_name", "last_name"], name="profile_names_search"
+            )
+        ]
@@ -0,0 +1,13 @@
+from django.db import models
+
+
+class ProfileImageBlobModel(models.Model):
+    """
+    Reference count of each stored profile image. Profile images are stored under the SHA-256 digest of their content, so identical uploads share the same files, which are only deleted once no profile references them.
+    """
+
+    digest = models.CharField(max_length=64, primary_key=True)
+    extension = models.CharField(
+        max_length=10
+    )  ## Extension of the original image, so its files can be deleted without listing the storage
+    references = models.PositiveIntegerField(default=0)
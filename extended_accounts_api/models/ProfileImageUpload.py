@@ -0,0 +1,35 @@
+from django.db import models
+from django.conf import settings
+from django.utils import timezone
+from uuid import uuid4
+import os
+
+
+class ProfileImageUploadModel(models.Model):
+    """
+    A profile image being uploaded in chunks. The received chunks are appended to a partial file in PROFILE_IMAGE_UPLOAD_DIR, whose size is the offset where the upload has to be resumed, so receiving a chunk doesn't write to the ddbb.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    account = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="profile_image_uploads",
+        on_delete=models.CASCADE,
+    )
+    file_name = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    validated = models.BooleanField(
+        default=False
+    )  ## Whether the image header has been received and validated
+    created_at = models.DateTimeField(default=timezone.now)
+
+    @property
+    def path(self):
+        return os.path.join(settings.PROFILE_IMAGE_UPLOAD_DIR, f"{self.id.hex}.part")
+
+    @property
+    def offset(self):
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
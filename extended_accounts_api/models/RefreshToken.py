@@ -0,0 +1,16 @@
+from django.db import models
+from django.conf import settings
+
+
+class RefreshTokenModel(models.Model):
+    """
+    Refresh tokens issued to the token authenticated clients. Only a SHA-256 digest of the token is stored, so a leaked table doesn't leak usable tokens.
+    """
+
+    token_hash = models.CharField(max_length=64, primary_key=True)
+    account = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="refresh_tokens",
+        on_delete=models.CASCADE,
+    )
+    expires_at = models.DateTimeField()
@@ -1,2 +1,7 @@
 from .Account import AccountModel
 from .Profile import ProfileModel
+from .RefreshToken import RefreshTokenModel
+from .ProfileImageUpload import ProfileImageUploadModel
+from .ProfileImageBlob import ProfileImageBlobModel
+from .OutboxEvent import OutboxEventModel
+from .AccountSession import AccountSessionModel
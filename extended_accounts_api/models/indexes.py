@@ -0,0 +1,66 @@
+from django.db import models
+from django.db.backends.ddl_references import Columns, Statement, Table
+
+SEARCH_TABLE = "extended_accounts_api_accountsearch"  ## SQLite FTS5 table of the profile names, its rowid is the account id
+PG_NAMES_VECTOR = "to_tsvector('simple', \"first_name\" || ' ' || \"last_name\")"  ## The search must use the same expression as the index
+
+## Indexes backing the account search (see extended_accounts_api.helpers.account_search). They're declared in the models' Meta, so the vendor specific statements below go into the migrations generated by makemigrations
+
+
+class PrefixSearchIndex(models.Index):
+    """
+    Index of the field for case insensitive prefix lookups, as Django's istartswith does them: UPPER(...) LIKE on PostgreSQL, LIKE (case insensitive) on SQLite.
+    """
+
+    templates = {
+        "postgresql": "CREATE INDEX %(name)s ON %(table)s (UPPER(%(column)s::text) text_pattern_ops)",
+        "sqlite": "CREATE INDEX %(name)s ON %(table)s (%(column)s COLLATE NOCASE)",
+    }
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        template = self.templates.get(schema_editor.connection.vendor)
+        if template is None:
+            return super().create_sql(model, schema_editor, using, **kwargs)
+        table = model._meta.db_table
+        return Statement(
+            template,
+            name=schema_editor.quote_name(self.name),
+            table=Table(table, schema_editor.quote_name),
+            column=Columns(
+                table,
+                [model._meta.get_field(self.fields[0]).column],
+                schema_editor.quote_name,
+            ),
+        )
+
+
+class NamesSearchIndex(models.Index):
+    """
+    Full-text index of the first and last names: a GIN index of their tsvector on PostgreSQL, an FTS5 table on SQLite (kept up to date by the profile signals).
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        vendor = schema_editor.connection.vendor
+        table = Table(model._meta.db_table, schema_editor.quote_name)
+        if vendor == "postgresql":
+            return Statement(
+                "CREATE INDEX %(name)s ON %(table)s USING gin (%(vector)s)",
+                name=schema_editor.quote_name(self.name),
+                table=table,
+                vector=PG_NAMES_VECTOR,
+            )
+        if vendor == "sqlite":
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS \"{SEARCH_TABLE}\" USING fts5(first_name, last_name, prefix='2 3')"
+            )
+            return Statement(
+                'INSERT OR REPLACE INTO "%(search_table)s" (rowid, first_name, last_name) SELECT "account_id", "first_name", "last_name" FROM %(table)s',
+                search_table=SEARCH_TABLE,
+                table=table,
+            )  ## Fills the table with the existing profiles, when the index is added to a populated ddbb
+        return super().create_sql(model, schema_editor, using, **kwargs)
+
+    def remove_sql(self, model, schema_editor, **kwargs):
+        if schema_editor.connection.vendor == "sqlite":
+            return f'DROP TABLE IF EXISTS "{SEARCH_TABLE}"'
+        return super().remove_sql(model, schema_editor, **kwargs)
@@ -3,6 +3,7 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.auth.models import Permission
 from django.contrib.auth.backends import BaseBackend
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
 from django.db.utils import IntegrityError
 from extended_accounts_api.models import AccountModel as Account
 from PIL import Image
@@ -92,6 +93,29 @@ class AccountModelTestCase(TestCase):
         with self.assertRaises(Account.DoesNotExist):
             Account.objects.get(username="jdoe")
 
+    def test_create_user_number_of_queries(self):
+        ## Savepoint, account, outbox event, profile, search index (the FTS5 table on SQLite, PostgreSQL indexes the names itself) and savepoint release. The profile is inserted once, without looking for a previous image.
+        search_index_writes = 1 if connection.vendor == "sqlite" else 0
+        with self.assertNumQueries(5 + search_index_writes):
+            Account.objects.create_user(
+                username="jdoe", email="jdoe@mail.com", phone_number=987654321
+            )
+        ## An identical image is stored: extension lookup and reference count update
+        with self.assertNumQueries(7 + search_index_writes):
+            account = Account.objects.create_user(
+                username="janedoe",
+                email="janedoe@mail.com",
+                phone_number=123,
+                profile_image=create_test_image(),
+            )
+        self.assertEqual(
+            account.profile.profile_image.name, self.account.profile.profile_image.name
+        )
+        self.assertEqual(
+            Account.objects.get(pk=account.pk).profile.profile_image.name,
+            self.account.profile.profile_image.name,
+        )
+
     def test_create_user_KO_if_username_empty(self):
         data = self.__modify_data(
             {"username": "", "phone_number": 987654321, "email": "jdoe@mail.com"}
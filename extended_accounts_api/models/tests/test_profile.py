@@ -39,3 +39,12 @@ class ProfileModelTestCase(TestCase):
             r"^[0-9a-f]+$"
         )  ##post_save signal removes the extension, so the image name should simply be a chunk of hexadecimal characters
         self.assertTrue(hex_name.match(account.profile.profile_image.name))
+
+    def test_unique_image_name_kept_for_migrations(self):
+        ## Migrations generated before images were content addressed reference it as upload_to
+        from extended_accounts_api.models.Profile import unique_image_name
+
+        with self.assertWarns(DeprecationWarning):
+            self.assertRegex(
+                unique_image_name(None, "image.png"), r"^[0-9a-f]{32}\.png$"
+            )
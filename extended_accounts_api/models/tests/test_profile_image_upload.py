@@ -0,0 +1,29 @@
+from django.test import TestCase, override_settings
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    ProfileImageUploadModel as ProfileImageUpload,
+)
+import tempfile, shutil, os
+
+UPLOAD_DIR = tempfile.mkdtemp()
+
+
+@override_settings(PROFILE_IMAGE_UPLOAD_DIR=UPLOAD_DIR)
+class ProfileImageUploadModelTestCase(TestCase):
+    @classmethod
+    def tearDownClass(cls, *args, **kwargs):
+        shutil.rmtree(UPLOAD_DIR, ignore_errors=True)
+        super().tearDownClass(*args, **kwargs)
+
+    def test_offset_is_partial_file_size(self):
+        account = Account.objects.create_user(
+            username="johndoe", email="johndoe@mail.com", phone_number=123456789
+        )
+        upload = ProfileImageUpload.objects.create(
+            account=account, file_name="avatar.png", size=100
+        )
+        self.assertEqual(os.path.dirname(upload.path), UPLOAD_DIR)
+        self.assertEqual(upload.offset, 0)  ## Nothing received yet
+        with open(upload.path, "wb") as partial_file:
+            partial_file.write(b"a" * 10)
+        self.assertEqual(upload.offset, 10)
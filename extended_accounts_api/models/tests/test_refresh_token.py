@@ -0,0 +1,18 @@
+from django.test import TestCase
+from extended_accounts_api.helpers import issue_tokens
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    RefreshTokenModel as RefreshToken,
+)
+
+
+class RefreshTokenModelTestCase(TestCase):
+    def test_refresh_tokens_deleted_with_account(self):
+        account = Account.objects.create_user(
+            username="johndoe", email="johndoe@mail.com", phone_number=123456789
+        )
+        issue_tokens(account)
+        issue_tokens(account)
+        self.assertEqual(account.refresh_tokens.count(), 2)
+        account.delete()
+        self.assertFalse(RefreshToken.objects.exists())
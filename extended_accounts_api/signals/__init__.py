@@ -1,11 +1,19 @@
 from .post_save_account_model import post_save_account_model
+from .post_delete_account_model import post_delete_account_model
 from .pre_save_profile_model import pre_save_profile_model
 from .post_save_profile_model import post_save_profile_model
 from .post_delete_profile_model import post_delete_profile_model
+from .request_started import buffer_deferred_tasks
+from .request_finished import flush_deferred_tasks
+from .user_logged_in import record_last_login
 
 __all__ = [
     "post_save_account_model",
+    "post_delete_account_model",
     "pre_save_profile_model",
     "post_save_profile_model",
     "post_delete_profile_model",
+    "buffer_deferred_tasks",
+    "flush_deferred_tasks",
+    "record_last_login",
 ]
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    OutboxEventModel as OutboxEvent,
+)
+from extended_accounts_api.helpers import (
+    invalidate_cached_accounts,
+    invalidate_account_representations,
+    record_event,
+)
+
+
+@receiver(post_delete, sender=Account)
+def post_delete_account_model(sender, **kwargs):
+    instance = kwargs["instance"]
+    invalidate_cached_accounts([instance.pk])
+    invalidate_account_representations([instance.username])
+    record_event(
+        OutboxEvent.DELETED, instance
+    )  ## Deletions run in a transaction, so the event is written in the same one
@@ -1,8 +1,17 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.conf import settings
-from extended_accounts_api.models import AccountModel as Account
-from extended_accounts_api.helpers import delete_unconfirmed_accounts
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    OutboxEventModel as OutboxEvent,
+)
+from extended_accounts_api.helpers import (
+    schedule_unconfirmed_account_deletion,
+    invalidate_cached_accounts,
+    record_event,
+    availability_index,
+    invalidate_account_representations,
+)
 
 
 def trigger_delete_unconfirmed_accounts(instance):
@@ -10,14 +19,20 @@ def trigger_delete_unconfirmed_accounts(instance):
         settings.TESTING ^ settings.INTEGRATION_TEST_CELERY
     ):  ## If we are running tests, we don't launch the Celery task every time a user is created. We don't want to test Celery (external dependency) but our functionality. We only launch it in case we are testing the Celery integration
         return
-    delete_unconfirmed_accounts.apply_async(
-        args=[instance.username],
-        countdown=900,  ## 900 seconds = 15 minutes
-    )
+    schedule_unconfirmed_account_deletion(instance.username)
 
 
 @receiver(post_save, sender=Account)
 def post_save_account_model(sender, **kwargs):
     instance = kwargs["instance"]
+    invalidate_cached_accounts(
+        [instance.pk]
+    )  ## Any change may affect the authentication of the account, so its cached copy is dropped
+    invalidate_account_representations(
+        {instance.username, getattr(instance, "_loaded_username", instance.username)}
+    )
+    availability_index.add("username", instance.username)
+    availability_index.add("email", instance.email)
     if kwargs["created"]:
+        record_event(OutboxEvent.CREATED, instance)
         trigger_delete_unconfirmed_accounts(instance)
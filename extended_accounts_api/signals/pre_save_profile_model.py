@@ -1,11 +1,12 @@
 from django.db.models.signals import pre_save
 from django.dispatch import receiver
-from django.conf import settings
 from extended_accounts_api.models import ProfileModel as Profile
-import os
+from extended_accounts_api.helpers import release_profile_image
 
 
 def delete_previous_image_if_needed(instance):
+    if instance.pk is None:  ## New profile, there's no previous image
+        return
     profile_image = instance.profile_image
     try:
         original_instance = Profile.objects.get(pk=instance.pk)
@@ -20,15 +21,7 @@ def delete_previous_image_if_needed(instance):
             and original_instance.profile_image.name,  ## User's image deletion condition (the original instance has content but not the new one)
         ]
         if any(conditions):
-            list_of_images = filter(
-                lambda image: original_instance.profile_image.name in image,
-                os.listdir(settings.MEDIA_ROOT),
-            )
-            for image in list_of_images:
-                try:
-                    os.remove(os.path.join(settings.MEDIA_ROOT, image))
-                except:
-                    pass
+            release_profile_image(original_instance.profile_image.name)
 
 
 @receiver(pre_save, sender=Profile)
@@ -0,0 +1,26 @@
+from django.core.signals import request_finished
+from django.dispatch import receiver
+from extended_accounts_api.helpers import (
+    flush_unconfirmed_account_deletions,
+    flush_last_logins,
+    end_request_buffer,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(request_finished)
+def flush_deferred_tasks(sender, **kwargs):
+    end_request_buffer()
+    ## Each flush keeps what it couldn't write for the next one, so a failure is logged and doesn't skip the rest
+    try:
+        flush_unconfirmed_account_deletions()  ## A single message for the accounts created during the request
+    except Exception:
+        logger.exception("Couldn't publish the unconfirmed account deletions")
+    try:
+        flush_last_logins(
+            stale_only=True
+        )  ## Pending logins are written in batches, at most once every LAST_LOGIN_MAX_STALENESS seconds
+    except Exception:
+        logger.exception("Couldn't write the pending logins")
@@ -0,0 +1,8 @@
+from django.core.signals import request_started
+from django.dispatch import receiver
+from extended_accounts_api.helpers import start_request_buffer
+
+
+@receiver(request_started)
+def buffer_deferred_tasks(sender, **kwargs):
+    start_request_buffer()  ## The accounts created during the request are scheduled for deletion in a single message when it finishes
@@ -1,6 +1,9 @@
 from django.test import TestCase, override_settings
 from django.core.files.uploadedfile import SimpleUploadedFile
-from extended_accounts_api.models import AccountModel as Account
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    ProfileImageBlobModel as ProfileImageBlob,
+)
 from PIL import Image
 from io import BytesIO
 from unittest.mock import patch
@@ -46,6 +49,25 @@ class PostDeleteProfileModelTestCase(
         self.assertNotIn(previous_image_name + ".png", os.listdir(MEDIA_ROOT))
         self.assertNotIn(previous_image_name + ".webp", os.listdir(MEDIA_ROOT))
 
+    def test_shared_image_kept_until_last_reference(self):
+        other_account = Account.objects.create_user(
+            username="jdoe",
+            email="jdoe@mail.com",
+            phone_number=987654321,
+            profile_image=create_test_image(),
+        )  ## Same content, so both profiles share the stored image
+        image_name = self.account.profile.profile_image.name
+        self.assertEqual(other_account.profile.profile_image.name, image_name)
+        self.assertEqual(ProfileImageBlob.objects.get(digest=image_name).references, 2)
+        self.account.delete()
+        self.assertEqual(ProfileImageBlob.objects.get(digest=image_name).references, 1)
+        self.assertIn(image_name + ".png", os.listdir(MEDIA_ROOT))
+        self.assertIn(image_name + ".webp", os.listdir(MEDIA_ROOT))
+        other_account.delete()
+        self.assertFalse(ProfileImageBlob.objects.filter(digest=image_name).exists())
+        self.assertNotIn(image_name + ".png", os.listdir(MEDIA_ROOT))
+        self.assertNotIn(image_name + ".webp", os.listdir(MEDIA_ROOT))
+
     @patch("os.remove")
     def test_non_blocking_execution_if_remove_nonexistent_image(self, mock_os_remove):
         mock_os_remove.side_effect = Exception("Simulated exception")
@@ -1,8 +1,10 @@
 from django.test import TestCase, override_settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 from extended_accounts_api.models import AccountModel as Account
+from rest_framework import serializers
 from PIL import Image
 from io import BytesIO
+from unittest.mock import patch
 import tempfile, shutil, re, os
 
 MEDIA_ROOT = (
@@ -10,9 +12,9 @@ MEDIA_ROOT = (
 )  ## During the tests, we will use this directory for image uploads
 
 
-def create_test_image():
+def create_test_image(color=(0, 0, 0)):
     image_buffer = BytesIO()
-    image_object = Image.new("RGB", (1, 1))
+    image_object = Image.new("RGB", (1, 1), color)
     image_object.save(image_buffer, "png")
     image_buffer.seek(0)
     image = SimpleUploadedFile(
@@ -53,3 +55,81 @@ class PostSaveProfileModelTesCase(TestCase):
         self.assertIn(
             account.profile.profile_image.name + ".webp", os.listdir(MEDIA_ROOT)
         )
+
+    def test_identical_image_not_encoded_again(self):
+        account = Account.objects.create_user(
+            username="johndoe",
+            email="johndoe@mail.com",
+            phone_number=123456789,
+            profile_image=create_test_image(),
+        )
+        with patch(
+            "extended_accounts_api.helpers.image_processing.Image.open"
+        ) as mock_image_open:
+            other_account = Account.objects.create_user(
+                username="jdoe",
+                email="jdoe@mail.com",
+                phone_number=987654321,
+                profile_image=create_test_image(),
+            )
+        mock_image_open.assert_not_called()
+        self.assertEqual(
+            other_account.profile.profile_image.name,
+            account.profile.profile_image.name,
+        )
+        self.assertEqual(
+            len(
+                [
+                    image
+                    for image in os.listdir(MEDIA_ROOT)
+                    if image.startswith(account.profile.profile_image.name)
+                ]
+            ),
+            2,
+        )  ## The image is stored only once
+
+    @override_settings(PROFILE_IMAGE_MAX_DIMENSION=10)
+    def test_stored_image_normalized(self):
+        image_buffer = BytesIO()
+        exif = Image.Exif()
+        exif[0x0112] = 6  ## Orientation: rotated 90 degrees clockwise
+        Image.new("RGB", (40, 20), (0, 0, 3)).save(image_buffer, "jpeg", exif=exif)
+        account = Account.objects.create_user(
+            username="johndoe",
+            email="johndoe@mail.com",
+            phone_number=123456789,
+            profile_image=SimpleUploadedFile("test_image.jpg", image_buffer.getvalue()),
+        )
+        image_name = account.profile.profile_image.name
+        with Image.open(os.path.join(MEDIA_ROOT, image_name + ".jpg")) as image:
+            self.assertEqual(image.size, (5, 10))
+            self.assertFalse(image.getexif())
+        with Image.open(os.path.join(MEDIA_ROOT, image_name + ".webp")) as image:
+            self.assertEqual(image.size, (5, 10))
+
+    @override_settings(PROFILE_IMAGE_MAX_PIXELS=0)
+    def test_image_exceeding_pixel_budget(self):
+        with self.assertRaises(serializers.ValidationError):
+            Account.objects.create_user(
+                username="johndoe",
+                email="johndoe@mail.com",
+                phone_number=123456789,
+                profile_image=create_test_image(color=(0, 0, 2)),
+            )
+        self.assertFalse(Account.objects.exists())
+
+    @override_settings(PROFILE_IMAGE_ASYNC_ENCODING=True)
+    def test_async_encoding(self):
+        with patch(
+            "extended_accounts_api.helpers.tasks.encode_profile_image.delay"
+        ) as mock_delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                account = Account.objects.create_user(
+                    username="johndoe",
+                    email="johndoe@mail.com",
+                    phone_number=123456789,
+                    profile_image=create_test_image(color=(0, 0, 1)),
+                )
+        image_name = account.profile.profile_image.name
+        mock_delay.assert_called_once_with(image_name)
+        self.assertNotIn(image_name + ".webp", os.listdir(MEDIA_ROOT))
@@ -4,14 +4,17 @@ from extended_accounts_api.models import AccountModel as Account
 from PIL import Image
 from io import BytesIO
 from unittest.mock import patch
-import tempfile, shutil, os
+import tempfile, shutil, os, itertools
 
 MEDIA_ROOT = tempfile.mkdtemp()
+image_colors = itertools.count()
 
 
 def create_test_image():
+    ## Images are stored under the digest of their content, so each test image gets a different color to be a different image
     image_buffer = BytesIO()
-    image_object = Image.new("RGB", (1, 1))
+    color = next(image_colors)
+    image_object = Image.new("RGB", (1, 1), (color % 256, color // 256, 0))
     image_object.save(image_buffer, "png")
     image_buffer.seek(0)
     image = SimpleUploadedFile(
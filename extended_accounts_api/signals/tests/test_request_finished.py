@@ -0,0 +1,38 @@
+from django.contrib.auth import user_logged_in
+from django.test import TestCase, override_settings
+from extended_accounts_api.helpers import (
+    schedule_unconfirmed_account_deletion,
+    flush_unconfirmed_account_deletions,
+    start_request_buffer,
+)
+from extended_accounts_api.models import AccountModel as Account
+from extended_accounts_api.signals import flush_deferred_tasks
+from unittest.mock import patch
+
+
+@patch(
+    "extended_accounts_api.helpers.tasks.delete_unconfirmed_accounts_batch.apply_async"
+)
+class RequestFinishedTestCase(TestCase):
+    @override_settings(LAST_LOGIN_WRITE_BEHIND=True, LAST_LOGIN_MAX_STALENESS=0)
+    def test_broker_failure_doesnt_skip_last_logins(self, mock_apply_async):
+        account = Account.objects.create_user(
+            username="johndoe",
+            email="johndoe@mail.com",
+            phone_number=123456789,
+            is_active=True,
+        )
+        mock_apply_async.side_effect = ConnectionError
+        start_request_buffer()  ## Ended by flush_deferred_tasks
+        with self.captureOnCommitCallbacks(execute=True):
+            schedule_unconfirmed_account_deletion("user_1")
+        user_logged_in.send(sender=Account, request=None, user=account)
+        with self.assertLogs("extended_accounts_api.signals.request_finished", "ERROR"):
+            flush_deferred_tasks(
+                sender=self.__class__
+            )  ## Sending request_finished would also close the ddbb connection of the test
+        account.refresh_from_db()
+        self.assertIsNotNone(account.last_login)
+        mock_apply_async.side_effect = None
+        flush_unconfirmed_account_deletions()  ## Kept for the next flush
+        self.assertEqual(mock_apply_async.call_args.kwargs["args"], [["user_1"]])
@@ -0,0 +1,7 @@
+from django.contrib.auth.signals import user_logged_in
+from extended_accounts_api.helpers import record_last_login
+
+user_logged_in.disconnect(
+    dispatch_uid="update_last_login"
+)  ## Django's receiver, record_last_login calls it unless the logins are written behind
+user_logged_in.connect(record_last_login, dispatch_uid="record_last_login")
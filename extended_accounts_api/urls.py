@@ -1,4 +1,4 @@
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
 from extended_accounts_api.views import (
     AccountsViewSet,
@@ -8,6 +8,12 @@ from extended_accounts_api.views import (
     ResetPasswordView,
     ChangePasswordView,
     AccountConfirmationView,
+    TokenObtainView,
+    TokenRefreshView,
+    TokenRevokeView,
+    ProfileImageView,
+    SessionsView,
+    AvailabilityView,
 )
 
 
@@ -39,6 +45,21 @@ urlpatterns = [
         ChangePasswordView.as_view(),
         name="change_password",
     ),
+    path("sessions/", SessionsView.as_view(), name="sessions"),
+    path("availability/", AvailabilityView.as_view(), name="availability"),
+    path("token/", TokenObtainView.as_view(), name="token"),
+    path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("token/revoke/", TokenRevokeView.as_view(), name="token_revoke"),
+    re_path(
+        r"^profile_images/(?P<image_name>[0-9a-f]+)\.webp$",
+        ProfileImageView.as_view(),
+        name="profile_image",
+    ),
+    re_path(
+        r"^profile_images/(?P<image_name>[0-9a-f]+)/(?P<size>[0-9]+)\.(?P<image_format>[a-z]+)$",
+        ProfileImageView.as_view(),
+        name="profile_image_rendition",
+    ),
 ]
 
 urlpatterns += [path("", include(router.urls))]
@@ -1,9 +1,14 @@
 from django.contrib.auth import login
 from django.contrib.auth.tokens import default_token_generator
+from django.db import transaction
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from extended_accounts_api.models import AccountModel as Account
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    OutboxEventModel as OutboxEvent,
+)
+from extended_accounts_api.helpers import record_event, invalidate_cached_accounts
 
 
 class AccountConfirmationView(APIView):
@@ -15,10 +20,20 @@ class AccountConfirmationView(APIView):
             account = Account.objects.get(username=kwargs["username"])
         except Account.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
-        if account.is_active:
+        if account.is_active or not default_token_generator.check_token(
+            account, kwargs["token"]
+        ):
             return Response(status=status.HTTP_400_BAD_REQUEST)
-        if default_token_generator.check_token(account, kwargs["token"]):
-            account.update(is_active=True)
-            login(request, account)
-            return Response(status=status.HTTP_200_OK)
-        return Response(status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            ## Conditional update, so if the link is visited concurrently (double clicks, email scanners...) only one of the requests activates the account. The profile isn't touched.
+            if not Account.objects.filter(pk=account.pk, is_active=False).update(
+                is_active=True
+            ):
+                return Response(status=status.HTTP_400_BAD_REQUEST)
+            record_event(OutboxEvent.CONFIRMED, account)
+        invalidate_cached_accounts(
+            [account.pk]
+        )  ## QuerySet.update doesn't send signals
+        account.is_active = True
+        login(request, account)
+        return Response(status=status.HTTP_200_OK)
@@ -3,38 +3,98 @@ from django.core.mail import send_mail
 from django.urls import reverse_lazy
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_protect
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.shortcuts import get_object_or_404
 from django.conf import settings
-from rest_framework import viewsets, status
+from rest_framework import viewsets, status, serializers
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.parsers import MultiPartParser, JSONParser
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.parsers import MultiPartParser
+from rest_framework.settings import api_settings
 from rest_framework.decorators import action
-from extended_accounts_api.helpers import AccountSerializer, IsSelf
-from extended_accounts_api.models import AccountModel as Account
+from extended_accounts_api.helpers import (
+    AccountSerializer,
+    AccountRowSerializer,
+    requested_fields,
+    search_page,
+    BulkAccountsSerializer,
+    IsSelf,
+    csrf_protect_unless_token,
+    bulk_set_active,
+    bulk_delete_accounts,
+    ProfileImageUploadSerializer,
+    append_chunk,
+    validate_upload_header,
+    complete_upload,
+    discard_upload,
+    AccountsBatchSerializer,
+    get_account_representations,
+)
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    ProfileImageUploadModel as ProfileImageUpload,
+)
+from io import BytesIO
 
 
 class AccountsViewSet(viewsets.ModelViewSet):
     queryset = Account.objects.all()
     serializer_class = AccountSerializer
     lookup_field = "username"
-    parser_classes = [MultiPartParser, JSONParser]
+    parser_classes = [MultiPartParser, *api_settings.DEFAULT_PARSER_CLASSES]
 
     def get_permissions(self):
-        IsAuthenticated_methods = ["list", "retrieve", "get_authenticated_account"]
+        IsAuthenticated_methods = [
+            "list",
+            "retrieve",
+            "get_authenticated_account",
+            "batch",
+        ]
         IsSelf_methods = [
             "update",
             "partial_update",
             "destroy",
             "delete_profile_image",
+            "create_profile_image_upload",
+            "profile_image_upload",
         ]
+        IsAdminUser_methods = ["bulk_activate", "bulk_deactivate", "bulk_delete"]
         if self.action in IsAuthenticated_methods:
             permission_classes = [IsAuthenticated]
         elif self.action in IsSelf_methods:
             permission_classes = [IsSelf]
+        elif self.action in IsAdminUser_methods:
+            permission_classes = [IsAdminUser]
         else:
             permission_classes = []
         return [permission() for permission in permission_classes]
 
+    ## Reads are represented from rows of values by AccountRowSerializer instead of AccountSerializer. Clients may request only some fields with ?fields=username,email
+    def list(self, request, *args, **kwargs):
+        serializer = AccountRowSerializer(request, requested_fields(request))
+        if "q" in request.query_params:  ## Search, paginated by keyset with ?cursor=
+            return Response(
+                search_page(
+                    serializer,
+                    self.filter_queryset(self.get_queryset()),
+                    request.query_params["q"],
+                    request.query_params.get("cursor"),
+                )
+            )
+        rows = serializer.rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.to_representation_many(page))
+        return Response(serializer.to_representation_many(rows))
+
+    def retrieve(self, request, *args, **kwargs):
+        serializer = AccountRowSerializer(request, requested_fields(request))
+        row = get_object_or_404(
+            serializer.rows(self.filter_queryset(self.get_queryset())),
+            username=kwargs["username"],
+        )
+        return Response(serializer.to_representation(row))
+
     @method_decorator(csrf_protect)
     def create(self, request, *args, **kwargs):
         serializer = AccountSerializer(data=request.data)
@@ -44,20 +104,20 @@ class AccountsViewSet(viewsets.ModelViewSet):
             return Response(status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    ## Unsafe methods [POST, PUT, PATCH, DELETE] require CSRF with SessionAuthentication.
-    @method_decorator(csrf_protect)
+    ## Unsafe methods [POST, PUT, PATCH, DELETE] require CSRF with SessionAuthentication. Requests authenticated with an access token don't need it.
+    @method_decorator(csrf_protect_unless_token)
     def update(self, request, *args, **kwargs):
         return super().update(request, *args, **kwargs)
 
-    @method_decorator(csrf_protect)
+    @method_decorator(csrf_protect_unless_token)
     def partial_update(self, request, *args, **kwargs):
         return super().partial_update(request, *args, **kwargs)
 
-    @method_decorator(csrf_protect)
+    @method_decorator(csrf_protect_unless_token)
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
-    @method_decorator(csrf_protect)
+    @method_decorator(csrf_protect_unless_token)
     @action(detail=True, methods=["delete"], url_path="delete_profile_image")
     def delete_profile_image(self, request, username):
         account = self.get_object()
@@ -67,15 +127,128 @@ class AccountsViewSet(viewsets.ModelViewSet):
         else:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
+    ## Chunked uploads of the profile image: POST {"file_name", "size"} to create the upload, then PATCH the chunks as raw bytes with the header Upload-Offset. GET the upload to know where to resume it after a dropped connection.
+    @method_decorator(csrf_protect_unless_token)
+    @action(detail=True, methods=["post"], url_path="profile_image_upload")
+    def create_profile_image_upload(self, request, username):
+        account = self.get_object()
+        serializer = ProfileImageUploadSerializer(data=request.data)
+        if serializer.is_valid():
+            upload = ProfileImageUpload.objects.create(
+                account=account, **serializer.validated_data
+            )
+            return Response(
+                {"id": upload.id, "offset": 0}, status=status.HTTP_201_CREATED
+            )
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @method_decorator(csrf_protect_unless_token)
+    @action(
+        detail=True,
+        methods=["get", "patch"],
+        url_path=r"profile_image_upload/(?P<upload_id>[0-9a-f-]+)",
+    )
+    def profile_image_upload(self, request, username, upload_id):
+        account = self.get_object()
+        try:
+            upload = ProfileImageUpload.objects.get(pk=upload_id, account=account)
+        except (ProfileImageUpload.DoesNotExist, DjangoValidationError):
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        if request.method == "GET":
+            return Response(
+                {"offset": upload.offset, "size": upload.size},
+                headers={"Upload-Offset": upload.offset},
+                status=status.HTTP_200_OK,
+            )
+        try:
+            offset = int(request.headers["Upload-Offset"])
+        except (KeyError, ValueError):
+            return Response(
+                {"Upload-Offset": "This header is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        ## The chunk is read straight from the request stream, so it's never buffered as a whole
+        try:
+            offset = append_chunk(upload, offset, request.stream or BytesIO())
+            if not upload.validated and validate_upload_header(upload):
+                upload.validated = True
+                upload.save(update_fields=["validated"])
+            if offset == upload.size:
+                complete_upload(upload, account)
+        except serializers.ValidationError:
+            discard_upload(upload)
+            raise
+        return Response(
+            {"offset": offset, "completed": offset == upload.size},
+            headers={"Upload-Offset": offset},
+            status=status.HTTP_200_OK,
+        )
+
     @action(detail=False, url_path="get_authenticated_account")
     def get_authenticated_account(self, request):
+        serializer = AccountRowSerializer(request, requested_fields(request))
         return Response(
-            AccountSerializer().to_representation(
-                instance=Account.objects.get(username=request.user.username)
+            serializer.to_representation(
+                serializer.rows(Account.objects.filter(pk=request.user.pk)).get()
             ),
             status=status.HTTP_200_OK,
         )
 
+    ## Retrieve many accounts at once, given as ?usernames=a,b,c or as {"usernames": [...]}. The result is keyed by username, with null for the unknown ones.
+    @method_decorator(csrf_protect_unless_token)
+    @action(detail=False, methods=["get", "post"], url_path="batch")
+    def batch(self, request):
+        if request.method == "GET":
+            data = {
+                "usernames": [
+                    username
+                    for username in request.query_params.get("usernames", "").split(",")
+                    if username
+                ]
+            }
+        else:
+            data = request.data
+        serializer = AccountsBatchSerializer(data=data)
+        if serializer.is_valid():
+            return Response(
+                get_account_representations(
+                    serializer.validated_data["usernames"],
+                    request,
+                    requested_fields(request),
+                ),
+                status=status.HTTP_200_OK,
+            )
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    ## Bulk administration endpoints. They take either {"usernames": [...]} or {"ids": [...]} and answer with the result for each of them.
+    @method_decorator(csrf_protect_unless_token)
+    @action(detail=False, methods=["post"], url_path="bulk_activate")
+    def bulk_activate(self, request):
+        return self.__bulk_operation(request, bulk_set_active, is_active=True)
+
+    @method_decorator(csrf_protect_unless_token)
+    @action(detail=False, methods=["post"], url_path="bulk_deactivate")
+    def bulk_deactivate(self, request):
+        return self.__bulk_operation(request, bulk_set_active, is_active=False)
+
+    @method_decorator(csrf_protect_unless_token)
+    @action(detail=False, methods=["post"], url_path="bulk_delete")
+    def bulk_delete(self, request):
+        return self.__bulk_operation(request, bulk_delete_accounts)
+
+    def __bulk_operation(self, request, operation, **kwargs):
+        serializer = BulkAccountsSerializer(data=request.data)
+        if serializer.is_valid():
+            return Response(
+                operation(
+                    serializer.validated_data["lookup"],
+                    serializer.validated_data["identifiers"],
+                    **kwargs,
+                ),
+                status=status.HTTP_200_OK,
+            )
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
     def __send_confirmation_email(self, account):
         subject = "Account Confirmation"
         message = f'Hello!\nWe have received your request to create an account, follow the link {self.request.build_absolute_uri(reverse_lazy("extended_accounts_api:account_confirmation", kwargs={"username": account.username, "token": default_token_generator.make_token(account)}))} to confirm your account. The link will be valid for 15 minutes, if you do not confirm the account within that time frame you will have to start the process again. If you did not request this account, you can ignore this message.'
@@ -0,0 +1,46 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
+from rest_framework.views import APIView
+from extended_accounts_api.helpers import availability_index, AVAILABILITY_FIELDS
+
+
+class AvailabilityView(APIView):
+    """
+    Tell whether the username, email and/or phone number given in the query string are available, for signup forms checking them as the user types. Answers come from an in-memory index, so most checks don't query the ddbb.
+    Anyone can ask, so the checks are throttled per client IP (the "availability" rate of DEFAULT_THROTTLE_RATES) to make enumerating the accounts slow.
+    """
+
+    http_method_names = ["get"]
+    authentication_classes = []
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "availability"
+
+    def get(self, request):
+        values = {
+            field: request.query_params[field]
+            for field in AVAILABILITY_FIELDS
+            if field in request.query_params
+        }
+        if not values:
+            return Response(
+                {
+                    "detail": f"Provide any of the query parameters: {', '.join(AVAILABILITY_FIELDS)}"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if "phone_number" in values:
+            try:
+                values["phone_number"] = int(values["phone_number"])
+            except ValueError:
+                return Response(
+                    {"phone_number": ["A valid integer is required."]},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        return Response(
+            {
+                field: availability_index.is_available(field, value)
+                for field, value in values.items()
+            },
+            status=status.HTTP_200_OK,
+        )
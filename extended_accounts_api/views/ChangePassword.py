@@ -1,11 +1,17 @@
 from django.contrib.auth import update_session_auth_hash
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import never_cache
-from django.views.decorators.csrf import csrf_protect
 from rest_framework import status
 from rest_framework.generics import UpdateAPIView
 from rest_framework.response import Response
-from extended_accounts_api.helpers import NewPasswordSerializer, IsSelf
+from extended_accounts_api.helpers import (
+    NewPasswordSerializer,
+    IsSelf,
+    csrf_protect_unless_token,
+    revoke_account_sessions,
+    revoke_account_refresh_tokens,
+    request_refresh_token_hash,
+)
 from extended_accounts_api.models import AccountModel as Account
 
 
@@ -18,7 +24,7 @@ class ChangePasswordView(UpdateAPIView):
     def get_queryset(self):
         return Account.objects.filter(username=self.kwargs["username"])
 
-    @method_decorator(csrf_protect)
+    @method_decorator(csrf_protect_unless_token)
     @method_decorator(never_cache)
     def update(self, request, *args, **kwargs):
         account = self.get_object()
@@ -26,5 +32,11 @@ class ChangePasswordView(UpdateAPIView):
         if serializer.is_valid():
             serializer.save()
             update_session_auth_hash(request, account)
+            revoke_account_sessions(
+                account.pk, keep_session_key=request.session.session_key
+            )  ## Log out everywhere else
+            revoke_account_refresh_tokens(
+                account.pk, keep_token_hash=request_refresh_token_hash(request)
+            )
             return Response(status=status.HTTP_202_ACCEPTED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, Http404
+from django.utils.cache import patch_cache_control
+from django.views import View
+from extended_accounts_api.helpers import (
+    profile_image_storage,
+    render_profile_image,
+    check_profile_image_signature,
+    ImageProcessingUnavailable,
+)
+import os
+
+
+class ProfileImageView(View):
+    """
+    Serve the WebP rendition of a profile image, or a rendition scaled to the requested size and format. Responses may be cached forever by browsers and proxies, as the URL changes whenever the image does. If PROFILE_IMAGE_SENDFILE_HEADER is set, the file is sent by the reverse proxy instead of Django.
+    """
+
+    http_method_names = ["get", "head"]
+
+    def get(self, request, image_name, size=None, image_format="webp"):
+        if not check_profile_image_signature(image_name, request.GET.get("signature")):
+            raise Http404
+        if size is not None and (
+            int(size) not in settings.PROFILE_IMAGE_RENDITION_SIZES
+            or image_format not in settings.PROFILE_IMAGE_RENDITION_FORMATS
+        ):
+            raise Http404
+        etag = (
+            f'"{image_name}"'  ## The name is the digest of the image
+            if size is None
+            else f'"{image_name}-{size}-{image_format}"'
+        )
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+        elif size is None:
+            response = self.file_response(f"{image_name}.webp")
+        else:
+            response = self.rendition_response(image_name, int(size), image_format)
+        if response.status_code in [200, 304]:
+            response["ETag"] = etag
+            patch_cache_control(response, public=True, max_age=31536000, immutable=True)
+        return response
+
+    def file_response(self, file_name):
+        storage = profile_image_storage()
+        sendfile_header = settings.PROFILE_IMAGE_SENDFILE_HEADER
+        if sendfile_header:
+            if not storage.exists(file_name):
+                raise Http404
+            response = HttpResponse(content_type="image/webp")
+            response[sendfile_header] = (
+                settings.PROFILE_IMAGE_SENDFILE_PREFIX + file_name
+                if sendfile_header == "X-Accel-Redirect"
+                else storage.path(file_name)  ## X-Sendfile takes the path of the file
+            )
+            return response
+        try:
+            return FileResponse(storage.open(file_name), content_type="image/webp")
+        except FileNotFoundError:
+            raise Http404
+
+    def rendition_response(self, image_name, size, image_format):
+        content_type = f"image/{image_format}"
+        sendfile_header = settings.PROFILE_IMAGE_SENDFILE_HEADER
+        try:
+            path = render_profile_image(image_name, size, image_format)
+            if not sendfile_header:
+                return FileResponse(open(path, "rb"), content_type=content_type)
+        except FileNotFoundError:  ## Unknown image
+            raise Http404
+        except ImageProcessingUnavailable:
+            return HttpResponse(
+                status=503,
+                headers={"Retry-After": settings.PROFILE_IMAGE_QUEUE_TIMEOUT},
+            )
+        response = HttpResponse(content_type=content_type)
+        response[sendfile_header] = (
+            settings.PROFILE_IMAGE_RENDITION_SENDFILE_PREFIX + os.path.basename(path)
+            if sendfile_header == "X-Accel-Redirect"
+            else path
+        )
+        return response
@@ -12,7 +12,10 @@ from rest_framework.generics import UpdateAPIView
 from rest_framework.response import Response
 from extended_accounts_api.helpers import (
     ResetPasswordRequestSerializer,
+    flush_account_last_login,
     NewPasswordSerializer,
+    revoke_account_sessions,
+    revoke_account_refresh_tokens,
 )
 from extended_accounts_api.models import AccountModel as Account
 
@@ -26,6 +29,9 @@ class ResetPasswordRequestView(APIView):
             account = list(serializer.validated_data.values())[
                 0
             ]  ## If the serializer is valid, it returns the account.
+            flush_account_last_login(
+                account
+            )  ## The token hashes last_login, which must not change once it's sent
             self.__send_reset_email(account)
             return Response(status=status.HTTP_202_ACCEPTED)
         return Response(serializer.errors, status=status.HTTP_404_NOT_FOUND)
@@ -57,6 +63,10 @@ class ResetPasswordView(UpdateAPIView):
             serializer = NewPasswordSerializer(account, data=request.data)
             if serializer.is_valid():
                 serializer.save()
+                revoke_account_sessions(
+                    account.pk
+                )  ## Whoever knew the former password is logged out
+                revoke_account_refresh_tokens(account.pk)
                 login(request, account)
                 return Response(status=status.HTTP_202_ACCEPTED)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
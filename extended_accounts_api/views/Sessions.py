@@ -0,0 +1,52 @@
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import never_cache
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from extended_accounts_api.helpers import (
+    csrf_protect_unless_token,
+    revoke_account_sessions,
+    revoke_account_refresh_tokens,
+    request_refresh_token_hash,
+)
+from extended_accounts_api.models import AccountSessionModel as AccountSession
+
+
+class SessionsView(APIView):
+    """
+    List the active sessions of the authenticated account, or log it out of all of them but the current one, along with the token clients but the current one. Sessions are identified by the id of their index entry, never by their key.
+    """
+
+    http_method_names = ["get", "delete"]
+    permission_classes = [IsAuthenticated]
+
+    @method_decorator(never_cache)
+    def get(self, request):
+        sessions = AccountSession.objects.filter(account_id=request.user.pk).order_by(
+            "-created_at"
+        )
+        return Response(
+            [
+                {
+                    "id": account_session.id,
+                    "created_at": account_session.created_at,
+                    "expire_date": account_session.expire_date,
+                    "current": account_session.session_key
+                    == request.session.session_key,
+                }
+                for account_session in sessions
+            ],
+            status=status.HTTP_200_OK,
+        )
+
+    @method_decorator(csrf_protect_unless_token)
+    def delete(self, request):
+        revoked = revoke_account_sessions(
+            request.user.pk,
+            keep_session_key=request.session.session_key,
+        )
+        revoke_account_refresh_tokens(
+            request.user.pk, keep_token_hash=request_refresh_token_hash(request)
+        )  ## Token clients are logged out as well
+        return Response({"revoked": revoked}, status=status.HTTP_200_OK)
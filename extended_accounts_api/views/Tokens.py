@@ -0,0 +1,64 @@
+from django.contrib.auth import authenticate, user_logged_in
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from extended_accounts_api.helpers import (
+    LoginSerializer,
+    RefreshTokenSerializer,
+    AccessTokenAuthentication,
+    issue_tokens,
+    rotate_refresh_token,
+    revoke_refresh_token,
+    revoke_access_token,
+)
+
+## Views for clients authenticating with tokens instead of sessions (mobile apps...). These clients don't need the CSRF token, as they never rely on cookies.
+
+
+class TokenObtainView(APIView):
+    http_method_names = ["post"]
+    authentication_classes = []
+
+    def post(self, request):
+        serializer = LoginSerializer(data=request.data)
+        if serializer.is_valid():
+            account = authenticate(
+                request,
+                username=serializer.validated_data["username"],
+                password=serializer.validated_data["password"],
+            )
+            if account:
+                user_logged_in.send(
+                    sender=account.__class__, request=request, user=account
+                )  ## As the session login does, so last_login is kept up to date
+                return Response(issue_tokens(account), status=status.HTTP_200_OK)
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class TokenRefreshView(APIView):
+    http_method_names = ["post"]
+    authentication_classes = []
+
+    def post(self, request):
+        serializer = RefreshTokenSerializer(data=request.data)
+        if serializer.is_valid():
+            tokens = rotate_refresh_token(serializer.validated_data["refresh"])
+            if tokens:
+                return Response(tokens, status=status.HTTP_200_OK)
+            return Response(status=status.HTTP_401_UNAUTHORIZED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class TokenRevokeView(APIView):
+    http_method_names = ["post"]
+    authentication_classes = [AccessTokenAuthentication]
+
+    def post(self, request):
+        serializer = RefreshTokenSerializer(data=request.data)
+        if serializer.is_valid():
+            revoke_refresh_token(serializer.validated_data["refresh"])
+            if request.auth:  ## The access token used in the request is revoked as well
+                revoke_access_token(request.auth)
+            return Response(status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
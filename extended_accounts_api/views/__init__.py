@@ -4,3 +4,7 @@ from .Login import LoginView
 from .Logout import LogoutView
 from .ResetPassword import ResetPasswordRequestView, ResetPasswordView
 from .ChangePassword import ChangePasswordView
+from .Tokens import TokenObtainView, TokenRefreshView, TokenRevokeView
+from .ProfileImage import ProfileImageView
+from .Sessions import SessionsView
+from .Availability import AvailabilityView
@@ -1,9 +1,16 @@
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.sessions.middleware import SessionMiddleware
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse_lazy
 from rest_framework.test import APITestCase, APIRequestFactory
 from extended_accounts_api.views import AccountConfirmationView
-from extended_accounts_api.models import AccountModel as Account
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    OutboxEventModel as OutboxEvent,
+    ProfileModel as Profile,
+)
+from unittest.mock import patch
 
 
 class AccountConfirmationViewTestCase(APITestCase):
@@ -39,6 +46,11 @@ class AccountConfirmationViewTestCase(APITestCase):
         self.assertEqual(200, response.status_code)
         self.account.refresh_from_db()
         self.assertTrue(self.account.is_active)
+        self.assertTrue(
+            OutboxEvent.objects.filter(
+                event=OutboxEvent.CONFIRMED, account_id=self.account.pk
+            ).exists()
+        )
 
     def test_user_not_found_404(self):
         request = self.factory.get(
@@ -79,3 +91,40 @@ class AccountConfirmationViewTestCase(APITestCase):
             request, username=self.account.username, token="wrong_token"
         )
         self.assertEqual(400, response.status_code)
+
+    def confirm(self):
+        request = self.factory.get(
+            reverse_lazy(
+                "extended_accounts_api:account_confirmation",
+                kwargs={"username": self.account.username, "token": self.token},
+            )
+        )
+        middleware = SessionMiddleware(lambda get_response: None)
+        middleware.process_request(request)
+        request.session.save()
+        return AccountConfirmationView.as_view()(
+            request, username=self.account.username, token=self.token
+        )
+
+    def test_concurrent_confirmation_400(self):
+        stale_account = Account.objects.get(pk=self.account.pk)
+        Account.objects.filter(pk=self.account.pk).update(
+            is_active=True
+        )  ## Confirmed by a concurrent request after this one read the account
+        with patch.object(Account.objects, "get", return_value=stale_account):
+            response = self.confirm()
+        self.assertEqual(400, response.status_code)
+        self.assertFalse(
+            OutboxEvent.objects.filter(event=OutboxEvent.CONFIRMED).exists()
+        )
+
+    def test_profile_not_written(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.confirm()
+        self.assertEqual(200, response.status_code)
+        self.assertFalse(
+            any(
+                Profile._meta.db_table in query["sql"]
+                for query in queries.captured_queries
+            )
+        )
@@ -1,4 +1,9 @@
 from django.core import mail
+from django.core.cache import cache
+from django.core.cache.backends.base import CacheKeyWarning
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.conf import settings
 from rest_framework.test import (
@@ -7,21 +12,29 @@ from rest_framework.test import (
     override_settings,
     force_authenticate,
 )
-from rest_framework.parsers import JSONParser, MultiPartParser
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.parsers import MultiPartParser
+from rest_framework.settings import api_settings
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from extended_accounts_api.helpers import AccountSerializer, IsSelf
-from extended_accounts_api.models import AccountModel as Account
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    ProfileImageUploadModel as ProfileImageUpload,
+)
 from extended_accounts_api.views import AccountsViewSet
 from PIL import Image
 from io import BytesIO
-import tempfile, shutil, os
+import tempfile, shutil, os, itertools, warnings
 
 MEDIA_ROOT = tempfile.mkdtemp()
+image_colors = itertools.count()
+UPLOAD_DIR = tempfile.mkdtemp()
 
 
 def create_test_image():
+    ## Images are stored under the digest of their content, so each test image gets a different color to be a different image
     image_buffer = BytesIO()
-    image_object = Image.new("RGB", (1, 1))
+    color = next(image_colors)
+    image_object = Image.new("RGB", (1, 1), (color % 256, color // 256, 0))
     image_object.save(image_buffer, "png")
     image_buffer.seek(0)
     image = SimpleUploadedFile(
@@ -70,7 +83,9 @@ class AccountsViewSetTestCase(APITestCase):
         view = AccountsViewSet()
         self.assertEqual(view.serializer_class, AccountSerializer)
         self.assertEqual(view.lookup_field, "username")
-        self.assertEqual(view.parser_classes, [MultiPartParser, JSONParser])
+        self.assertEqual(
+            view.parser_classes, [MultiPartParser, *api_settings.DEFAULT_PARSER_CLASSES]
+        )
         view.kwargs = {"username": self.account.username}
         self.assertIn(self.account, view.get_queryset())
         self.assertEqual(len(view.get_queryset()), 1)
@@ -87,6 +102,16 @@ class AccountsViewSetTestCase(APITestCase):
         self.assertIsInstance(view.get_permissions()[0], IsSelf)
         view.action = "delete_profile_image"
         self.assertIsInstance(view.get_permissions()[0], IsSelf)
+        view.action = "create_profile_image_upload"
+        self.assertIsInstance(view.get_permissions()[0], IsSelf)
+        view.action = "profile_image_upload"
+        self.assertIsInstance(view.get_permissions()[0], IsSelf)
+        view.action = "bulk_activate"
+        self.assertIsInstance(view.get_permissions()[0], IsAdminUser)
+        view.action = "bulk_deactivate"
+        self.assertIsInstance(view.get_permissions()[0], IsAdminUser)
+        view.action = "bulk_delete"
+        self.assertIsInstance(view.get_permissions()[0], IsAdminUser)
         view.action = "create"
         self.assertEqual(view.get_permissions(), [])
 
@@ -194,6 +219,66 @@ class AccountsViewSetTestCase(APITestCase):
         self.assertEqual(response.data["username"], self.account.username)
         self.assertEqual(response.status_code, 200)
 
+    def test_retrieve_account_OK(self):
+        request = self.factory.get(self.url)
+        force_authenticate(request, self.account)
+        response = AccountsViewSet.as_view({"get": "retrieve"})(
+            request, username=self.account.username
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data,
+            AccountSerializer(context={"request": request}).to_representation(
+                Account.objects.get(pk=self.account.pk)
+            ),
+        )
+
+    def test_retrieve_account_KO_404(self):
+        request = self.factory.get(self.url)
+        force_authenticate(request, self.account)
+        response = AccountsViewSet.as_view({"get": "retrieve"})(
+            request, username="ghost"
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_retrieve_account_sparse_fields_OK(self):
+        request = self.factory.get(self.url, {"fields": "email,username"})
+        force_authenticate(request, self.account)
+        response = AccountsViewSet.as_view({"get": "retrieve"})(
+            request, username=self.account.username
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data,
+            {"username": self.account.username, "email": self.account.email},
+        )
+
+    def test_retrieve_account_unknown_fields_KO_400(self):
+        request = self.factory.get(self.url, {"fields": "username,password"})
+        force_authenticate(request, self.account)
+        response = AccountsViewSet.as_view({"get": "retrieve"})(
+            request, username=self.account.username
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_list_accounts_OK(self):
+        request = self.factory.get(self.url)
+        force_authenticate(request, self.account)
+        response = AccountsViewSet.as_view({"get": "list"})(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            self.account.username, [account["username"] for account in response.data]
+        )
+
+    def test_search_accounts_OK(self):
+        request = self.factory.get(self.url, {"q": "john", "fields": "username"})
+        force_authenticate(request, self.account)
+        response = AccountsViewSet.as_view({"get": "list"})(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data, {"results": [{"username": "johndoe"}], "next": None}
+        )
+
     def test_get_authenticated_account_KO(self):
         request = self.factory.get(self.url)
         response = AccountsViewSet.as_view({"get": "get_authenticated_account"})(
@@ -266,3 +351,252 @@ class AccountsViewSetDeleteProfileImageTestCase(APITestCase):
         self.account.update(profile_image=None)
         response = self.__make_request()
         self.assertEqual(response.status_code, 400)
+
+
+class AccountsViewSetBulkOperationsTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls, *args, **kwargs):
+        super().setUpClass(*args, **kwargs)
+        cls.factory = APIRequestFactory()
+        cls.admin = Account.objects.create_superuser(
+            username="admin", email="admin@mail.com", phone_number=111111111
+        )
+        cls.account = Account.objects.create_user(
+            username="johndoe", email="johndoe@mail.com", phone_number=123456789
+        )
+        cls.url = "extended_accounts_api/"
+
+    def __make_request(self, action, data, user):
+        request = self.factory.post(self.url + action, data, format="json")
+        force_authenticate(request, user)
+        return AccountsViewSet.as_view({"post": action})(request)
+
+    def test_bulk_activate_OK_200(self):
+        response = self.__make_request(
+            "bulk_activate", {"usernames": ["johndoe", "ghost"]}, self.admin
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"johndoe": "activated", "ghost": "not_found"})
+        self.assertTrue(Account.objects.get(pk=self.account.pk).is_active)
+
+    def test_bulk_deactivate_OK_200(self):
+        response = self.__make_request(
+            "bulk_deactivate", {"ids": [self.account.pk]}, self.admin
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {str(self.account.pk): "deactivated"})
+        self.assertFalse(Account.objects.get(pk=self.account.pk).is_active)
+
+    def test_bulk_delete_OK_200(self):
+        response = self.__make_request(
+            "bulk_delete", {"usernames": ["johndoe"]}, self.admin
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"johndoe": "deleted"})
+        self.assertFalse(Account.objects.filter(pk=self.account.pk).exists())
+
+    def test_bulk_invalid_data_KO_400(self):
+        response = self.__make_request("bulk_activate", {}, self.admin)
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_not_admin_KO_403(self):
+        response = self.__make_request(
+            "bulk_delete", {"usernames": ["johndoe"]}, self.account
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(Account.objects.filter(pk=self.account.pk).exists())
+
+
+class AccountsViewSetBatchTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.accounts = [
+            Account.objects.create_user(
+                username=f"user_{number}",
+                email=f"user_{number}@mail.com",
+                phone_number=123456780 + number,
+            )
+            for number in range(3)
+        ]
+        self.client.force_authenticate(self.accounts[0])
+        self.url = reverse("extended_accounts_api:extended_accounts_api-batch")
+
+    def test_batch_get_OK_200(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {"usernames": "user_0,user_2,ghost"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data), ["user_0", "user_2", "ghost"])
+        self.assertEqual(response.data["user_2"]["phone_number"], 123456782)
+        self.assertIsNone(response.data["ghost"])
+        self.assertEqual(len(queries), 1)  ## Accounts joined with their profiles
+
+    def test_batch_post_OK_200(self):
+        response = self.client.post(
+            self.url, {"usernames": ["user_1", "user_1"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data), ["user_1"])
+
+    def test_batch_served_from_cache(self):
+        self.client.get(self.url, {"usernames": "user_0,user_1"})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {"usernames": "user_0,user_1"})
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(response.data["user_1"]["username"], "user_1")
+
+    def test_batch_cache_invalidated(self):
+        self.client.get(self.url, {"usernames": "user_1"})
+        account = Account.objects.get(username="user_1")
+        account.update(username="renamed", first_name="Jane")
+        response = self.client.get(self.url, {"usernames": "user_1,renamed"})
+        self.assertIsNone(response.data["user_1"])
+        self.assertEqual(response.data["renamed"]["first_name"], "Jane")
+
+    def test_batch_sparse_fields(self):
+        self.client.get(self.url, {"usernames": "user_0"})  ## Cached whole
+        response = self.client.get(
+            self.url, {"usernames": "user_0,user_1", "fields": "phone_number"}
+        )
+        self.assertEqual(
+            response.data,
+            {
+                "user_0": {"phone_number": 123456780},
+                "user_1": {"phone_number": 123456781},
+            },
+        )
+
+    @override_settings(ACCOUNTS_BATCH_MAX=2)
+    def test_batch_too_many_KO_400(self):
+        response = self.client.get(self.url, {"usernames": "user_0,user_1,user_2"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_invalid_usernames_KO_400(self):
+        for username in ["a b", "a%20b", "a" * 151]:
+            with self.subTest(username=username), warnings.catch_warnings():
+                warnings.simplefilter("error", CacheKeyWarning)
+                response = self.client.post(
+                    self.url, {"usernames": ["user_0", username]}, format="json"
+                )
+                self.assertEqual(response.status_code, 400)
+
+    def test_batch_unicode_usernames_OK_200(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", CacheKeyWarning)
+            response = self.client.post(
+                self.url, {"usernames": ["ü" * 150]}, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data["ü" * 150])
+
+    def test_batch_empty_KO_400(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_not_authenticated_KO_403(self):
+        self.client.force_authenticate(None)
+        response = self.client.get(self.url, {"usernames": "user_0"})
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, PROFILE_IMAGE_UPLOAD_DIR=UPLOAD_DIR)
+class AccountsViewSetProfileImageUploadTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls, *args, **kwargs):
+        super().setUpClass(*args, **kwargs)
+        cls.factory = APIRequestFactory()
+        cls.account = Account.objects.create_user(
+            username="johndoe", email="johndoe@mail.com", phone_number=123456789
+        )
+        cls.url = f"extended_accounts_api/{cls.account.username}/profile_image_upload"
+        cls.image = create_test_image().read()
+
+    @classmethod
+    def tearDownClass(cls, *args, **kwargs):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        shutil.rmtree(UPLOAD_DIR, ignore_errors=True)
+        super().tearDownClass(*args, **kwargs)
+
+    def __create_upload(self, data):
+        request = self.factory.post(self.url, data, format="json")
+        force_authenticate(request, self.account)
+        return AccountsViewSet.as_view({"post": "create_profile_image_upload"})(
+            request, username=self.account.username
+        )
+
+    def __send_chunk(self, upload_id, offset, chunk):
+        request = self.factory.patch(
+            f"{self.url}/{upload_id}",
+            chunk,
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+        )
+        force_authenticate(request, self.account)
+        return AccountsViewSet.as_view({"patch": "profile_image_upload"})(
+            request, username=self.account.username, upload_id=str(upload_id)
+        )
+
+    def __get_upload(self, upload_id):
+        request = self.factory.get(f"{self.url}/{upload_id}")
+        force_authenticate(request, self.account)
+        return AccountsViewSet.as_view({"get": "profile_image_upload"})(
+            request, username=self.account.username, upload_id=str(upload_id)
+        )
+
+    def test_chunked_upload_OK(self):
+        response = self.__create_upload(
+            {"file_name": "avatar.png", "size": len(self.image)}
+        )
+        self.assertEqual(response.status_code, 201)
+        upload_id = response.data["id"]
+        response = self.__send_chunk(upload_id, 0, self.image[:40])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"offset": 40, "completed": False})
+        ## The upload is resumed from where the server says
+        response = self.__get_upload(upload_id)
+        self.assertEqual(response.data, {"offset": 40, "size": len(self.image)})
+        self.assertEqual(response["Upload-Offset"], "40")
+        response = self.__send_chunk(upload_id, 40, self.image[40:])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"offset": len(self.image), "completed": True})
+        account = Account.objects.get(pk=self.account.pk)
+        self.assertIn(
+            account.profile.profile_image.name + ".webp", os.listdir(MEDIA_ROOT)
+        )
+        self.assertFalse(ProfileImageUpload.objects.exists())
+
+    def test_create_upload_invalid_data_KO_400(self):
+        response = self.__create_upload({"file_name": "avatar.exe", "size": 10})
+        self.assertEqual(response.status_code, 400)
+
+    def test_send_chunk_wrong_offset_KO_409(self):
+        upload_id = self.__create_upload(
+            {"file_name": "avatar.png", "size": len(self.image)}
+        ).data["id"]
+        response = self.__send_chunk(upload_id, 10, self.image[10:])
+        self.assertEqual(response.status_code, 409)
+
+    def test_send_chunk_without_offset_KO_400(self):
+        upload_id = self.__create_upload(
+            {"file_name": "avatar.png", "size": len(self.image)}
+        ).data["id"]
+        request = self.factory.patch(
+            f"{self.url}/{upload_id}",
+            self.image,
+            content_type="application/offset+octet-stream",
+        )
+        force_authenticate(request, self.account)
+        response = AccountsViewSet.as_view({"patch": "profile_image_upload"})(
+            request, username=self.account.username, upload_id=str(upload_id)
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_image_rejected_KO_400(self):
+        upload_id = self.__create_upload({"file_name": "avatar.png", "size": 10})
+        upload_id = upload_id.data["id"]
+        response = self.__send_chunk(upload_id, 0, b"a" * 10)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ProfileImageUpload.objects.filter(pk=upload_id).exists())
+
+    def test_upload_not_found_KO_404(self):
+        response = self.__get_upload("0" * 32)
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,122 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+from rest_framework.test import APITestCase
+from rest_framework.throttling import ScopedRateThrottle
+from extended_accounts_api.models import AccountModel as Account
+from extended_accounts_api.helpers import availability_index
+from unittest.mock import patch
+
+
+class AvailabilityViewTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()  ## Throttling history
+        availability_index.clear()
+        patcher = patch.object(
+            availability_index, "_start_rebuild", availability_index._rebuild
+        )  ## Rebuilds in the request thread, which sees the test's transaction
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        Account.objects.create_user(
+            username="johndoe", email="johndoe@mail.com", phone_number=123456789
+        )
+        self.url = reverse_lazy("extended_accounts_api:availability")
+
+    def test_taken_values(self):
+        response = self.client.get(
+            self.url,
+            {
+                "username": "johndoe",
+                "email": "johndoe@mail.com",
+                "phone_number": "123456789",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data,
+            {"username": False, "email": False, "phone_number": False},
+        )
+
+    def test_available_values_dont_query_ddbb(self):
+        self.client.get(self.url, {"username": "warmup"})  ## Builds the index
+        with CaptureQueriesContext(connection) as queries:
+            for number in range(20):
+                response = self.client.get(self.url, {"username": f"janedoe{number}"})
+                self.assertTrue(response.data["username"])
+        self.assertLess(len(queries), 3)  ## Only false positives query the ddbb
+
+    def test_new_accounts_are_indexed(self):
+        self.client.get(self.url, {"username": "janedoe"})
+        Account.objects.create_user(
+            username="janedoe", email="janedoe@mail.com", phone_number=987654321
+        )
+        response = self.client.get(
+            self.url, {"username": "janedoe", "phone_number": "987654321"}
+        )
+        self.assertEqual(response.data, {"username": False, "phone_number": False})
+
+    @override_settings(AVAILABILITY_INDEX_REFRESH_INTERVAL=0)
+    def test_accounts_created_by_other_processes_are_indexed(self):
+        self.client.get(self.url, {"username": "janedoe"})
+        Account.objects.bulk_create(
+            [Account(username="janedoe", email="janedoe@mail.com")]
+        )  ## No signals, as if it was created by another process
+        response = self.client.get(self.url, {"username": "janedoe"})
+        self.assertFalse(response.data["username"])
+
+    def test_deleted_accounts_are_available(self):
+        self.client.get(self.url, {"username": "johndoe"})
+        Account.objects.filter(username="johndoe").delete()
+        response = self.client.get(self.url, {"username": "johndoe"})
+        self.assertTrue(response.data["username"])
+
+    def test_rebuild_in_background(self):
+        self.client.get(self.url, {"username": "warmup"})
+        with override_settings(AVAILABILITY_INDEX_REBUILD_INTERVAL=0), patch.object(
+            availability_index, "_start_rebuild"
+        ) as mock_start_rebuild:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.url, {"username": "janedoe"})
+                self.assertTrue(response.data["username"])
+            self.assertEqual(
+                len(queries), 0
+            )  ## Answered by the current filter while the new one is built
+            Account.objects.create_user(
+                username="janedoe", email="janedoe@mail.com", phone_number=987654321
+            )
+            self.client.get(self.url, {"username": "janedoe"})
+            mock_start_rebuild.assert_called_once()
+            availability_index._rebuild(*mock_start_rebuild.call_args.args)
+        self.assertIn(
+            "username:janedoe", availability_index._filter
+        )  ## Added while the new filter was being built
+
+    def test_saving_accounts_again_isnt_counted(self):
+        self.client.get(self.url, {"username": "warmup"})
+        count = availability_index._count
+        account = Account.objects.get(username="johndoe")
+        for _ in range(3):
+            account.save()  ## As on every login
+        self.assertEqual(availability_index._count, count)
+
+    def test_no_values_KO(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_phone_number_KO(self):
+        response = self.client.get(self.url, {"phone_number": "abc"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_throttled(self):
+        with patch.object(
+            ScopedRateThrottle, "THROTTLE_RATES", {"availability": "2/minute"}
+        ):  ## Read by DRF when the module is imported, override_settings doesn't change it
+            responses = [
+                self.client.get(self.url, {"username": f"user_{number}"})
+                for number in range(3)
+            ]
+        self.assertEqual(
+            [response.status_code for response in responses], [200, 200, 429]
+        )
@@ -1,9 +1,12 @@
 from django.contrib.sessions.middleware import SessionMiddleware
 from django.urls import reverse_lazy
 from rest_framework.test import APITestCase, APIRequestFactory, force_authenticate
-from extended_accounts_api.helpers import NewPasswordSerializer, IsSelf
+from extended_accounts_api.helpers import NewPasswordSerializer, IsSelf, issue_tokens
 from extended_accounts_api.views import ChangePasswordView
-from extended_accounts_api.models import AccountModel as Account
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    RefreshTokenModel as RefreshToken,
+)
 
 
 class ChangePasswordViewTestCase(APITestCase):
@@ -44,6 +47,29 @@ class ChangePasswordViewTestCase(APITestCase):
         self.account.refresh_from_db()
         self.assertTrue(self.account.check_password("testpassword2"))
 
+    def test_change_password_revokes_other_refresh_tokens(self):
+        Account.objects.filter(pk=self.account.pk).update(is_active=True)
+        account = Account.objects.get(pk=self.account.pk)
+        tokens = issue_tokens(account)
+        other_tokens = issue_tokens(account)
+        response = self.client.put(
+            self.url,
+            self.data,
+            format="json",
+            HTTP_AUTHORIZATION=f"Bearer {tokens['access']}",
+        )
+        self.assertEqual(response.status_code, 202)
+        refresh_url = reverse_lazy("extended_accounts_api:token_refresh")
+        response = self.client.post(
+            refresh_url, {"refresh": other_tokens["refresh"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 401)
+        response = self.client.post(
+            refresh_url, {"refresh": tokens["refresh"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)  ## The caller keeps its token
+        self.assertEqual(RefreshToken.objects.count(), 1)
+
     def test_invalid_serializer_400(self):
         request = self.factory.put(self.url, {}, format="json")
         force_authenticate(request, user=self.account)
@@ -0,0 +1,180 @@
+from django.test import TestCase, RequestFactory, override_settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import Http404
+from extended_accounts_api.views import ProfileImageView
+from extended_accounts_api.helpers import (
+    profile_image_url,
+    ImageProcessingUnavailable,
+)
+from extended_accounts_api.models import AccountModel as Account
+from PIL import Image
+from io import BytesIO
+from unittest.mock import patch
+import tempfile, shutil, os
+
+MEDIA_ROOT = tempfile.mkdtemp()
+RENDITION_CACHE_DIR = tempfile.mkdtemp()
+
+
+def create_test_image():
+    image_buffer = BytesIO()
+    Image.new("RGB", (300, 200)).save(image_buffer, "png")
+    return SimpleUploadedFile("test_image.png", image_buffer.getvalue())
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT, PROFILE_IMAGE_RENDITION_CACHE_DIR=RENDITION_CACHE_DIR
+)
+class ProfileImageViewTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls, *args, **kwargs):
+        super().setUpClass(*args, **kwargs)
+        cls.factory = RequestFactory()
+
+    @classmethod
+    def tearDownClass(cls, *args, **kwargs):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        shutil.rmtree(RENDITION_CACHE_DIR, ignore_errors=True)
+        super().tearDownClass(*args, **kwargs)
+
+    def setUp(self):
+        self.account = Account.objects.create_user(
+            username="johndoe",
+            email="johndoe@mail.com",
+            phone_number=123456789,
+            profile_image=create_test_image(),
+        )
+        self.image_name = self.account.profile.profile_image.name
+        self.url = profile_image_url(self.image_name)
+
+    def get(self, url, headers=None, **kwargs):
+        request = self.factory.get(url, headers=headers)
+        return ProfileImageView.as_view()(request, image_name=self.image_name, **kwargs)
+
+    def get_rendition(self, size, image_format):
+        return self.get(
+            profile_image_url(self.image_name, size=size, image_format=image_format),
+            size=str(size),
+            image_format=image_format,
+        )
+
+    def test_view_setup(self):
+        self.assertEqual(ProfileImageView().http_method_names, ["get", "head"])
+
+    def test_profile_image_url(self):
+        self.assertEqual(
+            self.url.split("?")[0],
+            f"/extended_accounts_api/profile_images/{self.image_name}.webp",
+        )
+        request = self.factory.get("/")
+        self.assertTrue(
+            profile_image_url(self.image_name, request).startswith(
+                "http://testserver/extended_accounts_api/profile_images/"
+            )
+        )
+        self.assertIsNone(profile_image_url(None))
+
+    def test_get_OK_200(self):
+        response = self.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/webp")
+        self.assertEqual(response["ETag"], f'"{self.image_name}"')
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertIn("max-age=31536000", response["Cache-Control"])
+        with open(os.path.join(MEDIA_ROOT, self.image_name + ".webp"), "rb") as image:
+            self.assertEqual(b"".join(response.streaming_content), image.read())
+
+    def test_get_not_modified_304(self):
+        response = self.get(self.url, {"If-None-Match": f'"{self.image_name}"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], f'"{self.image_name}"')
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_get_invalid_signature_KO_404(self):
+        with self.assertRaises(Http404):
+            self.get(self.url[:-1])
+        with self.assertRaises(Http404):
+            self.get(self.url.split("?")[0])
+
+    def test_get_missing_image_KO_404(self):
+        os.remove(os.path.join(MEDIA_ROOT, self.image_name + ".webp"))
+        with self.assertRaises(Http404):
+            self.get(self.url)
+
+    @override_settings(PROFILE_IMAGE_SENDFILE_HEADER="X-Accel-Redirect")
+    def test_get_x_accel_redirect(self):
+        response = self.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected_media/{self.image_name}.webp"
+        )
+        self.assertIn("immutable", response["Cache-Control"])
+
+    @override_settings(PROFILE_IMAGE_SENDFILE_HEADER="X-Sendfile")
+    def test_get_x_sendfile(self):
+        response = self.get(self.url)
+        self.assertEqual(
+            response["X-Sendfile"],
+            os.path.join(MEDIA_ROOT, self.image_name + ".webp"),
+        )
+
+    def test_rendition_url(self):
+        self.assertEqual(
+            profile_image_url(self.image_name, size=128, image_format="png").split("?"),
+            [
+                f"/extended_accounts_api/profile_images/{self.image_name}/128.png",
+                self.url.split("?")[1],
+            ],
+        )
+
+    def test_get_rendition_OK_200(self):
+        response = self.get_rendition(128, "png")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertEqual(response["ETag"], f'"{self.image_name}-128-png"')
+        self.assertIn("immutable", response["Cache-Control"])
+        with Image.open(BytesIO(b"".join(response.streaming_content))) as image:
+            self.assertEqual(image.size, (128, 85))
+        with patch(
+            "extended_accounts_api.helpers.image_processing.Image.open"
+        ) as mock_image_open:
+            response = self.get_rendition(128, "png")
+            b"".join(response.streaming_content)
+        mock_image_open.assert_not_called()  ## Served from the cache
+        response = self.get_rendition(64, "jpeg")
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+
+    def test_get_rendition_not_allowed_KO_404(self):
+        with self.assertRaises(Http404):
+            self.get_rendition(100, "png")
+        with self.assertRaises(Http404):
+            self.get_rendition(128, "gif")
+
+    def test_get_rendition_unknown_image_KO_404(self):
+        self.image_name = "0" * 64
+        with self.assertRaises(Http404):
+            self.get_rendition(128, "png")
+
+    def test_renditions_deleted_with_image(self):
+        self.get_rendition(128, "png")
+        self.assertIn(f"{self.image_name}_128.png", os.listdir(RENDITION_CACHE_DIR))
+        self.account.delete()
+        self.assertNotIn(f"{self.image_name}_128.png", os.listdir(RENDITION_CACHE_DIR))
+
+    @override_settings(PROFILE_IMAGE_SENDFILE_HEADER="X-Accel-Redirect")
+    def test_get_rendition_x_accel_redirect(self):
+        response = self.get_rendition(128, "webp")
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            f"/protected_renditions/{self.image_name}_128.webp",
+        )
+
+    def test_get_rendition_busy_503(self):
+        with patch(
+            "extended_accounts_api.helpers.profile_images.image_processing_pool.run",
+            side_effect=ImageProcessingUnavailable,
+        ):
+            response = self.get_rendition(256, "png")
+        self.assertEqual(response.status_code, 503)
+        self.assertNotIn("Cache-Control", response)
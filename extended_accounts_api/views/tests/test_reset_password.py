@@ -1,10 +1,16 @@
+from django.contrib.auth import user_logged_in
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.sessions.middleware import SessionMiddleware
 from django.core import mail
 from django.urls import reverse_lazy
 from django.conf import settings
+from django.test import override_settings
 from rest_framework.test import APITestCase, APIRequestFactory
-from extended_accounts_api.helpers import NewPasswordSerializer
+from extended_accounts_api.helpers import (
+    NewPasswordSerializer,
+    flush_last_logins,
+    issue_tokens,
+)
 from extended_accounts_api.views import ResetPasswordRequestView, ResetPasswordView
 from extended_accounts_api.models import AccountModel as Account
 
@@ -47,6 +53,19 @@ class ResetPasswordRequestViewTestCase(APITestCase):
         response = ResetPasswordRequestView.as_view()(request)
         self.assertEqual(response.status_code, 404)
 
+    @override_settings(LAST_LOGIN_WRITE_BEHIND=True)
+    def test_reset_password_request_flushes_pending_login(self):
+        user_logged_in.send(sender=Account, request=None, user=self.account)
+        request = self.factory.post(self.url, self.data, format="json")
+        ResetPasswordRequestView.as_view()(request)
+        token = mail.outbox[0].body.split(f"/{self.account.username}/")[1].split("/")[0]
+        flush_last_logins()
+        self.assertTrue(
+            default_token_generator.check_token(
+                Account.objects.get(pk=self.account.pk), token
+            )
+        )
+
 
 class ResetPasswordViewTestCase(APITestCase):
     @classmethod
@@ -84,6 +103,17 @@ class ResetPasswordViewTestCase(APITestCase):
         self.account.refresh_from_db()
         self.assertTrue(self.account.check_password(self.data["password"]))
 
+    def test_reset_password_revokes_refresh_tokens(self):
+        tokens = issue_tokens(self.account)
+        response = self.client.put(self.url, self.data, format="json")
+        self.assertEqual(response.status_code, 202)
+        response = self.client.post(
+            reverse_lazy("extended_accounts_api:token_refresh"),
+            {"refresh": tokens["refresh"]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 401)
+
     def test_reset_password_user_not_found_KO_404(self):
         request = self.factory.put(
             reverse_lazy(
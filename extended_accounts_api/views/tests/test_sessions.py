@@ -0,0 +1,64 @@
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.urls import reverse_lazy
+from rest_framework.test import APITestCase, APIClient
+from extended_accounts_api.models import (
+    AccountModel as Account,
+    AccountSessionModel as AccountSession,
+    RefreshTokenModel as RefreshToken,
+)
+from extended_accounts_api.helpers import issue_tokens
+
+
+class SessionsViewTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.account = Account.objects.create_user(
+            username="johndoe",
+            password="testpassword",
+            email="johndoe@mail.com",
+            phone_number=123456789,
+            is_active=True,
+        )
+        self.other_client = APIClient()
+        self.other_client.login(username="johndoe", password="testpassword")
+        self.client.login(username="johndoe", password="testpassword")
+        self.url = reverse_lazy("extended_accounts_api:sessions")
+
+    def test_list_sessions(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(
+            [session["current"] for session in response.data].count(True), 1
+        )
+        self.assertNotIn("session_key", response.data[0])
+
+    def test_revoke_other_sessions(self):
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"revoked": 1})
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertEqual(self.other_client.get(self.url).status_code, 403)
+
+    def test_revoke_refresh_tokens(self):
+        issue_tokens(self.account)
+        self.client.delete(self.url)
+        self.assertFalse(RefreshToken.objects.exists())
+
+    def test_password_change_revokes_other_sessions(self):
+        response = self.client.put(
+            reverse_lazy(
+                "extended_accounts_api:change_password",
+                kwargs={"username": "johndoe"},
+            ),
+            {"password": "testpassword2", "password_confirm": "testpassword2"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(self.other_client.get(self.url).status_code, 403)
+        self.assertEqual(AccountSession.objects.count(), 1)
+        self.assertEqual(Session.objects.count(), 1)
+
+    def test_unauthenticated_403(self):
+        self.assertEqual(APIClient().get(self.url).status_code, 403)
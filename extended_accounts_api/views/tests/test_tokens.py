@@ -0,0 +1,138 @@
+from django.urls import reverse_lazy
+from rest_framework.test import APITestCase, APIRequestFactory
+from extended_accounts_api.views import (
+    AccountsViewSet,
+    TokenObtainView,
+    TokenRefreshView,
+    TokenRevokeView,
+)
+from extended_accounts_api.helpers import issue_tokens
+from extended_accounts_api.helpers.token_authentication import revoked_access_tokens
+from extended_accounts_api.models import AccountModel as Account
+
+
+class TokenViewsTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls, *args, **kwargs):
+        super().setUpClass(*args, **kwargs)
+        cls.password = "testpassword"
+        cls.factory = APIRequestFactory(
+            enforce_csrf_checks=True
+        )  ## Token clients never send the CSRF token
+        cls.account = Account.objects.create_user(
+            username="johndoe",
+            password=cls.password,
+            email="johndoe@mail.com",
+            phone_number=123456789,
+            is_active=True,
+        )
+
+    def setUp(self):
+        revoked_access_tokens.clear()
+
+    def test_view_setup(self):
+        self.assertEqual(TokenObtainView().http_method_names, ["post"])
+        self.assertEqual(TokenRefreshView().http_method_names, ["post"])
+        self.assertEqual(TokenRevokeView().http_method_names, ["post"])
+
+    def test_obtain_OK_200(self):
+        request = self.factory.post(
+            reverse_lazy("extended_accounts_api:token"),
+            {"username": self.account.username, "password": self.password},
+            format="json",
+        )
+        response = TokenObtainView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.data)
+        self.assertIn("refresh", response.data)
+        self.account.refresh_from_db()
+        self.assertIsNotNone(self.account.last_login)
+
+    def test_obtain_wrong_password_KO_400(self):
+        request = self.factory.post(
+            reverse_lazy("extended_accounts_api:token"),
+            {"username": self.account.username, "password": "wrong_password"},
+            format="json",
+        )
+        response = TokenObtainView.as_view()(request)
+        self.assertEqual(response.status_code, 400)
+
+    def test_obtain_invalid_serializer_KO_400(self):
+        request = self.factory.post(
+            reverse_lazy("extended_accounts_api:token"), {}, format="json"
+        )
+        response = TokenObtainView.as_view()(request)
+        self.assertEqual(response.status_code, 400)
+
+    def test_refresh_OK_200(self):
+        tokens = issue_tokens(self.account)
+        request = self.factory.post(
+            reverse_lazy("extended_accounts_api:token_refresh"),
+            {"refresh": tokens["refresh"]},
+            format="json",
+        )
+        response = TokenRefreshView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.data["refresh"], tokens["refresh"])
+
+    def test_refresh_invalid_token_KO_401(self):
+        request = self.factory.post(
+            reverse_lazy("extended_accounts_api:token_refresh"),
+            {"refresh": "wrong_token"},
+            format="json",
+        )
+        response = TokenRefreshView.as_view()(request)
+        self.assertEqual(response.status_code, 401)
+
+    def test_revoke_OK_200(self):
+        tokens = issue_tokens(self.account)
+        request = self.factory.post(
+            reverse_lazy("extended_accounts_api:token_revoke"),
+            {"refresh": tokens["refresh"]},
+            format="json",
+            HTTP_AUTHORIZATION=f"Bearer {tokens['access']}",
+        )
+        response = TokenRevokeView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        ## Neither the access token nor the refresh token can be used anymore
+        request = self.factory.get(
+            "extended_accounts_api/", HTTP_AUTHORIZATION=f"Bearer {tokens['access']}"
+        )
+        response = AccountsViewSet.as_view({"get": "get_authenticated_account"})(
+            request
+        )
+        self.assertEqual(
+            response.status_code, 403
+        )  ## SessionAuthentication is the first authentication class, so DRF answers 403 instead of 401
+        request = self.factory.post(
+            reverse_lazy("extended_accounts_api:token_refresh"),
+            {"refresh": tokens["refresh"]},
+            format="json",
+        )
+        response = TokenRefreshView.as_view()(request)
+        self.assertEqual(response.status_code, 401)
+
+    def test_token_authenticated_requests(self):
+        tokens = issue_tokens(self.account)
+        request = self.factory.get(
+            "extended_accounts_api/", HTTP_AUTHORIZATION=f"Bearer {tokens['access']}"
+        )
+        response = AccountsViewSet.as_view({"get": "get_authenticated_account"})(
+            request
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["username"], self.account.username)
+        ## Unsafe methods don't require the CSRF token
+        request = self.factory.patch(
+            f"extended_accounts_api/{self.account.username}",
+            {"first_name": "John"},
+            format="json",
+            HTTP_AUTHORIZATION=f"Bearer {tokens['access']}",
+        )
+        response = AccountsViewSet.as_view({"patch": "partial_update"})(
+            request, username=self.account.username
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            Account.objects.get(pk=self.account.pk).profile.first_name, "John"
+        )